@@ -37,22 +37,29 @@
 
 import pandas as pd
 import numpy as np
-import statistics as st
-
-# Import essential library for splitting datetime
-import datetime as dt
 
 # Importing essential library for downloading the dataset from Kaggle
 # import opendatasets as od
 
 # Import essential libraries for Exploratory Data Analysis and Visualization
-import matplotlib as ploty
 import matplotlib.pyplot as plt
 import seaborn as sns
-from statistics import mode
-from scipy.stats import iqr
 import plotly.express as px
 
+# Import the reusable analysis building blocks
+from nigeria_real_estate import (
+    Histograms,
+    canonicalise,
+    correlations,
+    distribution_profile,
+    iqr_filter,
+    load_listings,
+    partition_by_state,
+    plots,
+    stats,
+    validate,
+)
+
 # Ignore Warnings
 
 import warnings
@@ -67,7 +74,9 @@ warnings.filterwarnings("ignore")
 
 
 # This loads the dataset and prints the first five rows in the dataframe
-df = pd.read_csv("/Users/temi/Datasets/nigeria_houses_data.csv")
+# The counts are stored as int8, the text columns as categories and the
+# price as int64; later runs on the same file read a cached snapshot.
+df = load_listings("nigeria_houses_data.csv")
 df.head(5)
 
 
@@ -103,9 +112,7 @@ df.describe()
 
 # Plotting histogram
 
-df.hist(figsize=(16, 16), xrot=90)
-
-plt.show()
+fig = plots.histograms(df)
 
 
 # ### Checking Columns
@@ -123,7 +130,7 @@ df.columns
 
 # Summarize the categorical features
 
-df.describe(include=["object"])
+df.describe(include=["category"])
 
 
 # ### Federal States in Nigeria
@@ -192,6 +199,23 @@ df.isnull().sum()
 
 # #### There are no missing values in the dataframe.
 
+# ### Data-quality rules
+
+# In[ ]:
+
+
+# Check every listing against the data-quality rules at once: towns filed
+# under the wrong state, blocks of flats with too few bedrooms, fewer toilets
+# than bathrooms, implausibly low prices and states with too few listings
+quality = validate(df)
+quality.counts()
+
+
+# In[ ]:
+
+
+quality.violations()[["town", "state", "title", "bedrooms", "rule", "reason"]]
+
 # ## Outliers
 
 # ### Identifying Outliers
@@ -210,20 +234,7 @@ df[["price"]].describe()
 
 
 # Plotting a boxplot to visualise the outliers in price column
-
-# Styling the plot
-sns.set_theme(style="whitegrid")
-
-# Scaling the plot
-fig_dims = (20, 20)
-fig, ax = plt.subplots(figsize=fig_dims)
-
-# Plotting
-sns.boxplot(x=df["price"], y=df["state"],  palette="Set2",)
-sns.stripplot(x=df["price"], y=df["state"], color=".25",
-              jitter=True,
-              marker='o',
-              alpha=0.8)
+fig = plots.price_boxplot(df, by="state")
 
 
 # #### The box plot above show majority of the dataoiints on the left side, however, there some datapoints on the that appear distant from the other datapoints as you begin to scan towards the right part of the chart. These point indicate the presence of Outliers. These outliers are properties with significantly higher prices when compared to the property prices of other federal states within Nigeria. It shows that "Lagos" and "Abuja" appear to have these outliers. 
@@ -307,22 +318,7 @@ plt.show()
 
 
 # Plotting a boxplot to validate changes
-
-# Styling the plot
-sns.set_theme(style="whitegrid")
-
-# Scaling the plot
-fig_dims = (20, 20)
-fig, ax = plt.subplots(figsize=fig_dims)
-
-# Plotting
-sns.boxplot(x=df_outlier_free["price"],
-            y=df_outlier_free["state"],  palette="Set2",)
-sns.stripplot(x=df_outlier_free["price"],
-              y=df_outlier_free["state"], color=".25",
-              jitter=True,
-              marker='o',
-              alpha=0.8)
+fig = plots.price_boxplot(df_outlier_free, by="state")
 
 
 # #### There appear to be no outliers left.
@@ -338,9 +334,7 @@ sns.stripplot(x=df_outlier_free["price"],
 
 # Plotting histogram
 
-df_outlier_free.hist(figsize=(16, 16), xrot=90)
-
-plt.show()
+fig = plots.histograms(df_outlier_free)
 
 
 # ### Skewness
@@ -348,17 +342,25 @@ plt.show()
 # In[28]:
 
 
-df_outlier_free.skew(axis=1, skipna=True)
+# Skewness and kurtosis of each column, nationally and per state
+profiles = distribution_profile(df_outlier_free)
+profiles["all"]
+
+
+# In[ ]:
+
 
+profiles["state"].xs("price", level="column")
 
-# #### The price chart shows that the dataset is positively skewed i.e, there are more properties with extreme prices in the dataset. This raises the average property price.
+
+# #### The price skewness of about 1.3 shows that the dataset is positively skewed i.e, there are more properties with extreme prices in the dataset. This raises the average property price.
 
 # ### Average property price in Nigeria
 
 # In[29]:
 
 
-average_price = st.mean(df_outlier_free["price"])
+average_price = stats.mean(df_outlier_free["price"])
 
 print("The average property price in Nigeria is " +
       str(round(average_price, 2)) + " Naira")
@@ -423,7 +425,7 @@ fig.show()
 # In[32]:
 
 
-most_common = st.mode(df_outlier_free["title"])
+most_common = stats.mode(df_outlier_free["title"])
 
 print("The most common property type in Nigeria is " +
       str(most_common))
@@ -442,7 +444,10 @@ print("The most common property type in Nigeria is " +
 # In[33]:
 
 
-df_outlier_free.corr()
+# Pearson and Spearman for the numeric columns, eta and Cramer's V for the
+# categorical ones, all computed together
+correlation = correlations(df_outlier_free)
+correlation.pearson
 
 
 # In[34]:
@@ -454,16 +459,39 @@ df_outlier_free.corr()
 plt.figure(figsize=(15, 15))
 
 # Plotting a heatmap
-sns.heatmap(df_outlier_free.corr()*100, annot=True, fmt='.0f')
+sns.heatmap(correlation.pearson*100, annot=True, fmt='.0f')
 
 
 # #### Usually in real estate, the price is dependent on certian factors such as location, size, furnishing and features of the property. The heat map shows that the "number of bedrooms", "number of toilets", "parking space", and "number of bathrooms" correlates with the property price. 
 
+# #### The categorical columns can be compared through the correlation ratio (eta), which measures how much of the spread of a numeric column lies between the categories, and through Cramér's V between two categorical columns. Both range from 0 (no association) to 1.
+
+# In[ ]:
+
+
+# How strongly title, town and state associate with each numeric column
+correlation.eta
+
+
+# In[ ]:
+
+
+correlation.cramers_v
+
 # ## EXPLORING EACH FEDERAL STATE
 # 
 # 
 # #### Although the original dataframe has been cleaned and analysed, a deeper look into the dataframe is necessary. This is because the property prices vary vastly between certain federal states such as Lagos and Ogun. For more accurate analysis, it will be beneficial to explore each state individually.
 
+# #### Every state is split out of the dataframe in a single pass; each entry is a view of the rows for that state.
+
+# In[ ]:
+
+
+states = partition_by_state(df)
+states.sizes()
+
+
 # ### ABIA STATE
 
 # In[35]:
@@ -471,7 +499,7 @@ sns.heatmap(df_outlier_free.corr()*100, annot=True, fmt='.0f')
 
 # Selecting data on only Abia
 
-df_abi = df[df["state"] == "Abia"].reset_index(drop=True)
+df_abi = states["Abia"]
 df_abi.head(3)
 
 
@@ -490,7 +518,7 @@ print(f"The new dataframe has", df_abi.shape[0],
 
 # Selecting data on only Abuja
 
-df_abj = df[df["state"] == "Abuja"].reset_index(drop=True)
+df_abj = states["Abuja"]
 df_abj.head(3)
 
 
@@ -509,7 +537,7 @@ print(f"The new dataframe has", df_abj.shape[0],
 
 # Selecting data on only Akwa Ibom
 
-df_akw = df[df["state"] == "Akwa Ibom"].reset_index(drop=True)
+df_akw = states["Akwa Ibom"]
 df_akw.head(3)
 
 
@@ -529,7 +557,7 @@ print(f"The new dataframe has", df_akw.shape[0],
 
 # Selecting data on only Anambara
 
-df_ana = df[df["state"] == "Anambara"].reset_index(drop=True)
+df_ana = states["Anambara"]
 df_ana.head(3)
 
 
@@ -548,7 +576,7 @@ print(f"The new dataframe has", df_ana.shape[0],
 
 # Selecting data on only Bayelsa
 
-df_bay = df[df["state"] == "Bayelsa"].reset_index(drop=True)
+df_bay = states["Bayelsa"]
 df_bay.head(3)
 
 
@@ -567,7 +595,7 @@ print(f"The new dataframe has", df_bay.shape[0],
 
 # Selecting data on only Borno
 
-df_bor = df[df["state"] == "Borno"].reset_index(drop=True)
+df_bor = states["Borno"]
 df_bor.head(3)
 
 
@@ -586,7 +614,7 @@ print(f"The new dataframe has", df_bor.shape[0],
 
 # Selecting data on only Cross River
 
-df_cro = df[df["state"] == "Cross River"].reset_index(drop=True)
+df_cro = states["Cross River"]
 df_cro.head(3)
 
 
@@ -605,7 +633,7 @@ print(f"The new dataframe has", df_cro.shape[0],
 
 # Selecting data on only Delta
 
-df_del = df[df["state"] == "Delta"].reset_index(drop=True)
+df_del = states["Delta"]
 df_del.head(3)
 
 
@@ -624,7 +652,7 @@ print(f"The new dataframe has", df_del.shape[0],
 
 # Selecting data on only Edo
 
-df_edo = df[df["state"] == "Edo"].reset_index(drop=True)
+df_edo = states["Edo"]
 df_edo.head(3)
 
 
@@ -643,7 +671,7 @@ print(f"The new dataframe has", df_edo.shape[0],
 
 # Selecting data on only Ekiti
 
-df_eki = df[df["state"] == "Ekiti"].reset_index(drop=True)
+df_eki = states["Ekiti"]
 df_eki.head(3)
 
 
@@ -662,7 +690,7 @@ print(f"The new dataframe has", df_eki.shape[0],
 
 # Selecting data on only Enugu
 
-df_enu = df[df["state"] == "Enugu"].reset_index(drop=True)
+df_enu = states["Enugu"]
 df_enu.head(3)
 
 
@@ -681,7 +709,7 @@ print(f"The new dataframe has", df_enu.shape[0],
 
 # Selecting data on only Imo
 
-df_imo = df[df["state"] == "Imo"].reset_index(drop=True)
+df_imo = states["Imo"]
 df_imo.head(3)
 
 
@@ -700,7 +728,7 @@ print(f"The new dataframe has", df_imo.shape[0],
 
 # Selecting data on only Kaduna
 
-df_kad = df[df["state"] == "Kaduna"].reset_index(drop=True)
+df_kad = states["Kaduna"]
 df_kad.head(3)
 
 
@@ -719,7 +747,7 @@ print(f"The new dataframe has", df_kad.shape[0],
 
 # Selecting data on only Kano
 
-df_kan = df[df["state"] == "Kaduna"].reset_index(drop=True)
+df_kan = states["Kano"]
 df_kan.head(3)
 
 
@@ -738,7 +766,7 @@ print(f"The new dataframe has", df_kan.shape[0],
 
 # Selecting data on only Kastina
 
-df_kas = df[df["state"] == "Kastina"].reset_index(drop=True)
+df_kas = states["Katsina"]
 df_kas.head(3)
 
 
@@ -757,7 +785,7 @@ print(f"The new dataframe has", df_kas.shape[0],
 
 # Selecting data on only Kogi
 
-df_kog = df[df["state"] == "Kogi"].reset_index(drop=True)
+df_kog = states["Kogi"]
 df_kog.head(3)
 
 
@@ -776,7 +804,7 @@ print(f"The new dataframe has", df_kog.shape[0],
 
 # Selecting data on only Kwara
 
-df_kwa = df[df["state"] == "kwara"].reset_index(drop=True)
+df_kwa = states["Kwara"]
 df_kwa.head(3)
 
 
@@ -795,7 +823,7 @@ print(f"The new dataframe has", df_kwa.shape[0],
 
 # Selecting data on only Lagos
 
-df_lag = df[df["state"] == "Lagos"].reset_index(drop=True)
+df_lag = states["Lagos"]
 df_lag.head(3)
 
 
@@ -814,7 +842,7 @@ print(f"The new dataframe has", df_lag.shape[0],
 
 # Selecting data on only Nasarawa
 
-df_nas = df[df["state"] == "Nasarawa"].reset_index(drop=True)
+df_nas = states["Nasarawa"]
 df_nas.head(3)
 
 
@@ -833,7 +861,7 @@ print(f"The new dataframe has", df_nas.shape[0],
 
 # Selecting data on only Niger
 
-df_nig = df[df["state"] == "Niger"].reset_index(drop=True)
+df_nig = states["Niger"]
 df_nig.head(3)
 
 
@@ -852,7 +880,7 @@ print(f"The new dataframe has", df_nig.shape[0],
 
 # Selecting data on only Ogun
 
-df_ogu = df[df["state"] == "Ogun"].reset_index(drop=True)
+df_ogu = states["Ogun"]
 df_ogu.head(3)
 
 
@@ -871,7 +899,7 @@ print(f"The new dataframe has", df_ogu.shape[0],
 
 # Selecting data on only Osun
 
-df_osu = df[df["state"] == "Osun"].reset_index(drop=True)
+df_osu = states["Osun"]
 df_osu.head(3)
 
 
@@ -890,7 +918,7 @@ print(f"The new dataframe has", df_osu.shape[0],
 
 # Selecting data on only Oyo
 
-df_oyo = df[df["state"] == "Oyo"].reset_index(drop=True)
+df_oyo = states["Oyo"]
 df_oyo.head(3)
 
 
@@ -909,7 +937,7 @@ print(f"The new dataframe has", df_oyo.shape[0],
 
 # Selecting data on only Plateau
 
-df_pla = df[df["state"] == "Plateau"].reset_index(drop=True)
+df_pla = states["Plateau"]
 df_pla.head(3)
 
 
@@ -928,7 +956,7 @@ print(f"The new dataframe has", df_pla.shape[0],
 
 # Selecting data on only Rivers
 
-df_riv = df[df["state"] == "Rivers"].reset_index(drop=True)
+df_riv = states["Rivers"]
 df_riv.head(3)
 
 
@@ -944,6 +972,18 @@ print(f"The new dataframe has", df_riv.shape[0],
 # #### States with 50+ rows; Abuja, Anambara, Delta, Edo, Enugu, Imo, Lagos, Ogun, Oyo, and Rivers.
 # #### States with less than 50+ rows; Abia, Akwa Ibom, Bayelsa, Borno, Cross River, Ekiti, Kaduna, Kano, Kastina, Kogi, Kwara, Nasarawa, Niger, Ogun and Plateau
 
+# #### The outliers are removed per state. The quartiles and the lower and upper limits of every state are computed in one pass, and each state's deep-dive reads its limits from this table.
+
+# In[ ]:
+
+
+state_mask, state_limits = iqr_filter(df, by=["state"])
+outlier_free_states = partition_by_state(df[state_mask])
+# Bin every state's columns once; the state histograms below draw from these counts
+state_histograms = Histograms.from_frame(df[state_mask], by="state")
+state_limits
+
+
 # ## ABUJA STATE (Federal Capital Territory)
 
 # In[85]:
@@ -951,7 +991,7 @@ print(f"The new dataframe has", df_riv.shape[0],
 
 # Selecting data on only Abuja
 
-df_abj = df[df["state"] == "Abuja"].reset_index(drop=True)
+df_abj = states["Abuja"]
 df_abj.head(5)
 
 
@@ -976,7 +1016,7 @@ df_abj.describe()
 
 # Summarize the categorical features
 
-df_abj.describe(include=["object"])
+df_abj.describe(include=["category"])
 
 
 # #### There are 
@@ -1003,20 +1043,7 @@ df_abj["title"].unique()
 
 
 # Visualise
-
-# Styling the plot
-sns.set_theme(style="whitegrid")
-
-# Scaling the plot
-fig_dims = (20, 20)
-fig, ax = plt.subplots(figsize=fig_dims)
-
-# Plotting
-sns.boxplot(x=df_abj["price"], y=df_abj["town"],  palette="Set2",)
-sns.stripplot(x=df_abj["price"], y=df_abj["town"], color=".25",
-              jitter=True,
-              marker='o',
-              alpha=0.8)
+fig = plots.price_boxplot(df_abj, by="town")
 
 
 # ### InterQuantileRange (IQR)
@@ -1025,8 +1052,7 @@ sns.stripplot(x=df_abj["price"], y=df_abj["town"], color=".25",
 
 
 # Calculating q1 and q3 for price
-abj_Q1 = df_abj.price.quantile(0.25)
-abj_Q3 = df_abj.price.quantile(0.75)
+abj_Q1, abj_Q3 = state_limits.loc["Abuja", ["q1", "q3"]]
 abj_Q1, abj_Q3
 
 
@@ -1045,8 +1071,8 @@ print("The Interquartile Range for the price is", abj_IQR)
 
 
 # For price
-abj_lower_limit = Q1 - 1.5*abj_IQR
-abj_upper_limit = Q3 + 1.5*abj_IQR
+abj_lower_limit, abj_upper_limit = state_limits.loc[
+    "Abuja", ["lower_limit", "upper_limit"]]
 abj_lower_limit, abj_upper_limit
 
 
@@ -1077,8 +1103,7 @@ Abuja
 
 # Remove the outliers using the IQR
 
-df_abj_outlier_free = df_abj[(df_abj.price > abj_lower_limit)
-                             & (df_abj.price < abj_upper_limit)]
+df_abj_outlier_free = outlier_free_states["Abuja"]
 df_abj_outlier_free.shape
 
 
@@ -1086,22 +1111,7 @@ df_abj_outlier_free.shape
 
 
 # Visualise to validate changes
-
-# Styling the plot
-sns.set_theme(style="whitegrid")
-
-# Scaling the plot
-fig_dims = (20, 20)
-fig, ax = plt.subplots(figsize=fig_dims)
-
-# Plotting
-sns.boxplot(x=df_abj_outlier_free["price"],
-            y=df_abj_outlier_free["town"],  palette="Set2",)
-sns.stripplot(x=df_abj_outlier_free["price"],
-              y=df_abj_outlier_free["town"], color=".25",
-              jitter=True,
-              marker='o',
-              alpha=0.8)
+fig = plots.price_boxplot(df_abj_outlier_free, by="town")
 
 
 # ### ABUJA REAL ESTATE MARKET TREND (Data Analysis)
@@ -1113,9 +1123,7 @@ sns.stripplot(x=df_abj_outlier_free["price"],
 
 # Plotting histogram
 
-df_abj_outlier_free.hist(figsize=(16, 16), xrot=90)
-
-plt.show()
+fig = state_histograms.plot("Abuja", title="Abuja")
 
 
 # ### Average property price in Abuja
@@ -1123,7 +1131,7 @@ plt.show()
 # In[100]:
 
 
-average_price_abj = st.mean(df_abj_outlier_free["price"])
+average_price_abj = stats.mean(df_abj_outlier_free["price"])
 
 print("The average property price in Abuja is " +
       str(round(average_price_abj, 2)) + " Naira")
@@ -1156,7 +1164,7 @@ fig.show()
 # In[102]:
 
 
-abj_most_common = st.mode(df_abj_outlier_free["title"])
+abj_most_common = stats.mode(df_abj_outlier_free["title"])
 
 print("The most common property type in Abuja State is " +
       str(abj_most_common))
@@ -1169,7 +1177,7 @@ print("The most common property type in Abuja State is " +
 
 # Selecting data on only Anambara
 
-df_ana = df[df["state"] == "Anambara"].reset_index(drop=True)
+df_ana = states["Anambara"]
 df_ana.head(3)
 
 
@@ -1191,6 +1199,15 @@ df_ana["town"].unique()
 
 # #### A quick Google search shows that these towns do not exist in Anambara state. This indicative of wrongly collated data. The data on Anambara state cannot be used for analysis.
 
+# In[ ]:
+
+
+# The gazetteer maps each (state, town) label pair to its canonical names:
+# "Anambara" is Anambra, and its listings in Lagos, Abuja, Ogun or Ondo towns
+# move to those states
+canonical_df, labels = canonicalise(df)
+labels[labels["raw_state"] == "Anambara"]
+
 # ### DELTA
 
 # In[106]:
@@ -1198,7 +1215,7 @@ df_ana["town"].unique()
 
 # Selecting data on only Delta
 
-df_del = df[df["state"] == "Delta"].reset_index(drop=True)
+df_del = states["Delta"]
 df_del.head(5)
 
 
@@ -1223,7 +1240,7 @@ df_del.describe()
 
 # Summarize the categorical features
 
-df_del.describe(include=["object"])
+df_del.describe(include=["category"])
 
 
 # ### Towns in Delta
@@ -1248,20 +1265,7 @@ df_del["title"].unique()
 
 
 # Plotting a boxplot to visualise the outliers in price column
-
-# Styling the plot
-sns.set_theme(style="whitegrid")
-
-# Scaling the plot
-fig_dims = (20, 20)
-fig, ax = plt.subplots(figsize=fig_dims)
-
-# Plotting
-sns.boxplot(x=df_del["price"], y=df_del["town"],  palette="Set2",)
-sns.stripplot(x=df_del["price"], y=df_del["town"], color=".25",
-              jitter=True,
-              marker='o',
-              alpha=0.8)
+fig = plots.price_boxplot(df_del, by="town")
 
 
 # ### InterQuantileRange (IQR)
@@ -1270,8 +1274,7 @@ sns.stripplot(x=df_del["price"], y=df_del["town"], color=".25",
 
 
 # Calculating q1 and q3 for price
-del_Q1 = df_del.price.quantile(0.25)
-del_Q3 = df_del.price.quantile(0.75)
+del_Q1, del_Q3 = state_limits.loc["Delta", ["q1", "q3"]]
 del_Q1, del_Q3
 
 
@@ -1289,8 +1292,8 @@ print("The Interquartile Range for the price is", del_IQR)
 
 # Lower and Upper Limit
 
-del_lower_limit = Q1 - 1.5*del_IQR
-del_upper_limit = Q3 + 1.5*del_IQR
+del_lower_limit, del_upper_limit = state_limits.loc[
+    "Delta", ["lower_limit", "upper_limit"]]
 del_lower_limit, del_upper_limit
 
 
@@ -1321,8 +1324,7 @@ Delta
 
 # Remove the outliers using the IQR
 
-df_del_outlier_free = df_del[(df_del.price > del_lower_limit)
-                             & (df_del.price < del_upper_limit)]
+df_del_outlier_free = outlier_free_states["Delta"]
 df_del_outlier_free.shape
 
 
@@ -1330,22 +1332,7 @@ df_del_outlier_free.shape
 
 
 # Plotting a boxplot to validate the changes
-
-# Styling the plot
-sns.set_theme(style="whitegrid")
-
-# Scaling the plot
-fig_dims = (20, 20)
-fig, ax = plt.subplots(figsize=fig_dims)
-
-# Plotting
-sns.boxplot(x=df_del_outlier_free["price"],
-            y=df_del_outlier_free["town"],  palette="Set2",)
-sns.stripplot(x=df_del_outlier_free["price"],
-              y=df_del_outlier_free["town"], color=".25",
-              jitter=True,
-              marker='o',
-              alpha=0.8)
+fig = plots.price_boxplot(df_del_outlier_free, by="town")
 
 
 # ### DELTA REAL ESTATE MARKET TREND (Data Analysis)
@@ -1357,9 +1344,7 @@ sns.stripplot(x=df_del_outlier_free["price"],
 
 # Plotting histogram
 
-df_del_outlier_free.hist(figsize=(16, 16), xrot=90)
-
-plt.show()
+fig = state_histograms.plot("Delta", title="Delta")
 
 
 # ### Average property price in Delta
@@ -1367,7 +1352,7 @@ plt.show()
 # In[121]:
 
 
-del_average_price = st.mean(df_del_outlier_free["price"])
+del_average_price = stats.mean(df_del_outlier_free["price"])
 
 print("The average property price in Delta is " +
       str(round(del_average_price, 2)) + " Naira")
@@ -1400,7 +1385,7 @@ fig.show()
 # In[123]:
 
 
-del_most_common = st.mode(df_del_outlier_free["title"])
+del_most_common = stats.mode(df_del_outlier_free["title"])
 
 print("The most common property type in Delta State is " +
       str(del_most_common))
@@ -1413,7 +1398,7 @@ print("The most common property type in Delta State is " +
 
 # Selecting data on only Edo
 
-df_edo = df[df["state"] == "Edo"].reset_index(drop=True)
+df_edo = states["Edo"]
 df_edo.head(5)
 
 
@@ -1438,7 +1423,7 @@ df_edo.describe()
 
 # Summarize the categorical features
 
-df_edo.describe(include=["object"])
+df_edo.describe(include=["category"])
 
 
 # ### Towns in Edo
@@ -1463,20 +1448,7 @@ df_edo["title"].unique()
 
 
 # Plotting a boxplot to visualise the outliers in price column
-
-# Styling the plot
-sns.set_theme(style="whitegrid")
-
-# Scaling the plot
-fig_dims = (20, 20)
-fig, ax = plt.subplots(figsize=fig_dims)
-
-# Plotting
-sns.boxplot(x=df_edo["price"], y=df_edo["town"],  palette="Set2",)
-sns.stripplot(x=df_edo["price"], y=df_edo["town"], color=".25",
-              jitter=True,
-              marker='o',
-              alpha=0.8)
+fig = plots.price_boxplot(df_edo, by="town")
 
 
 # ### InterQuantileRange (IQR)
@@ -1486,8 +1458,7 @@ sns.stripplot(x=df_edo["price"], y=df_edo["town"], color=".25",
 
 # Calculating q1 and q3 for price
 
-edo_Q1 = df_edo.price.quantile(0.25)
-edo_Q3 = df_edo.price.quantile(0.75)
+edo_Q1, edo_Q3 = state_limits.loc["Edo", ["q1", "q3"]]
 edo_Q1, edo_Q3
 
 
@@ -1506,8 +1477,8 @@ print("The Interquartile Range for the price is", edo_IQR)
 
 # Lower and Upper Limit
 
-edo_lower_limit = Q1 - 1.5*edo_IQR
-edo_upper_limit = Q3 + 1.5*edo_IQR
+edo_lower_limit, edo_upper_limit = state_limits.loc[
+    "Edo", ["lower_limit", "upper_limit"]]
 edo_lower_limit, edo_upper_limit
 
 
@@ -1537,8 +1508,7 @@ Edo
 
 # Remove the outliers using the IQR
 
-df_edo_outlier_free = df_edo[(df_edo.price > edo_lower_limit)
-                             & (df_edo.price < edo_upper_limit)]
+df_edo_outlier_free = outlier_free_states["Edo"]
 df_edo_outlier_free.shape
 
 
@@ -1546,22 +1516,7 @@ df_edo_outlier_free.shape
 
 
 # Plotting a boxplot to validate changes
-
-# Styling the plot
-sns.set_theme(style="whitegrid")
-
-# Scaling the plot
-fig_dims = (20, 20)
-fig, ax = plt.subplots(figsize=fig_dims)
-
-# Plotting
-sns.boxplot(x=df_edo_outlier_free["price"],
-            y=df_edo_outlier_free["town"],  palette="Set2",)
-sns.stripplot(x=df_edo_outlier_free["price"],
-              y=df_edo_outlier_free["town"], color=".25",
-              jitter=True,
-              marker='o',
-              alpha=0.8)
+fig = plots.price_boxplot(df_edo_outlier_free, by="town")
 
 
 # ### EDO REAL ESTATE MARKET TREND (Data Analysis) 
@@ -1573,9 +1528,7 @@ sns.stripplot(x=df_edo_outlier_free["price"],
 
 # Plotting histogram
 
-df_edo_outlier_free.hist(figsize=(16, 16), xrot=90)
-
-plt.show()
+fig = state_histograms.plot("Edo", title="Edo")
 
 
 # ### Average property price in Edo
@@ -1583,7 +1536,7 @@ plt.show()
 # In[139]:
 
 
-edo_average_price = st.mean(df_edo_outlier_free["price"])
+edo_average_price = stats.mean(df_edo_outlier_free["price"])
 
 print("The average property price in Edo is " +
       str(round(edo_average_price, 2)) + " Naira")
@@ -1616,7 +1569,7 @@ fig.show()
 # In[141]:
 
 
-edo_most_common = st.mode(df_edo_outlier_free["title"])
+edo_most_common = stats.mode(df_edo_outlier_free["title"])
 
 print("The most common property type in Edo State is " +
       str(edo_most_common))
@@ -1629,7 +1582,7 @@ print("The most common property type in Edo State is " +
 
 # Selecting data on only Enugu
 
-df_enu = df[df["state"] == "Enugu"].reset_index(drop=True)
+df_enu = states["Enugu"]
 df_enu.head(3)
 
 
@@ -1652,7 +1605,7 @@ df_enu.describe()
 
 # Summarize the categorical features
 
-df_enu.describe(include=["object"])
+df_enu.describe(include=["category"])
 
 
 # ### Towns in Enugu
@@ -1679,20 +1632,7 @@ df_enu["title"].unique()
 
 
 # Plotting a boxplot to visualise the outliers in price column
-
-# Styling the plot
-sns.set_theme(style="whitegrid")
-
-# Scaling the plot
-fig_dims = (20, 20)
-fig, ax = plt.subplots(figsize=fig_dims)
-
-# Plotting
-sns.boxplot(x=df_enu["price"], y=df_enu["town"],  palette="Set2",)
-sns.stripplot(x=df_enu["price"], y=df_enu["town"], color=".25",
-              jitter=True,
-              marker='o',
-              alpha=0.8)
+fig = plots.price_boxplot(df_enu, by="town")
 
 
 # ### InterQuantileRange (IQR)
@@ -1701,8 +1641,7 @@ sns.stripplot(x=df_enu["price"], y=df_enu["town"], color=".25",
 
 
 # Calculating q1 and q3 for price
-enu_Q1 = df_enu.price.quantile(0.25)
-enu_Q3 = df_enu.price.quantile(0.75)
+enu_Q1, enu_Q3 = state_limits.loc["Enugu", ["q1", "q3"]]
 enu_Q1, enu_Q3
 
 
@@ -1720,8 +1659,8 @@ print("The Interquartile Range for the price is", enu_IQR)
 
 # Lower and Upper Limit
 
-enu_lower_limit = Q1 - 1.5*enu_IQR
-enu_upper_limit = Q3 + 1.5*enu_IQR
+enu_lower_limit, enu_upper_limit = state_limits.loc[
+    "Enugu", ["lower_limit", "upper_limit"]]
 enu_lower_limit, enu_upper_limit
 
 
@@ -1751,8 +1690,7 @@ Enugu
 
 # Remove the outliers using the IQR
 
-df_enu_outlier_free = df_enu[(df_enu.price > enu_lower_limit)
-                             & (df_enu.price < enu_upper_limit)]
+df_enu_outlier_free = outlier_free_states["Enugu"]
 df_enu_outlier_free.shape
 
 
@@ -1760,22 +1698,7 @@ df_enu_outlier_free.shape
 
 
 # Plotting a boxplot to validate the changes
-
-# Styling the plot
-sns.set_theme(style="whitegrid")
-
-# Scaling the plot
-fig_dims = (20, 20)
-fig, ax = plt.subplots(figsize=fig_dims)
-
-# Plotting
-sns.boxplot(x=df_enu_outlier_free["price"],
-            y=df_enu_outlier_free["town"],  palette="Set2",)
-sns.stripplot(x=df_enu_outlier_free["price"],
-              y=df_enu_outlier_free["town"], color=".25",
-              jitter=True,
-              marker='o',
-              alpha=0.8)
+fig = plots.price_boxplot(df_enu_outlier_free, by="town")
 
 
 # ### ENUGU REAL ESTATE MARKET TREND (Data Analysis)
@@ -1787,9 +1710,7 @@ sns.stripplot(x=df_enu_outlier_free["price"],
 
 # Plotting histogram
 
-df_enu_outlier_free.hist(figsize=(16, 16), xrot=90)
-
-plt.show()
+fig = state_histograms.plot("Enugu", title="Enugu")
 
 
 # ### Average property price in Enugu
@@ -1797,7 +1718,7 @@ plt.show()
 # In[157]:
 
 
-enu_average_price = st.mean(df_enu_outlier_free["price"])
+enu_average_price = stats.mean(df_enu_outlier_free["price"])
 
 print("The average property price in Enugu is " +
       str(round(enu_average_price, 2)) + " Naira")
@@ -1808,7 +1729,7 @@ print("The average property price in Enugu is " +
 # In[158]:
 
 
-enu_most_common = st.mode(df_enu_outlier_free["title"])
+enu_most_common = stats.mode(df_enu_outlier_free["title"])
 
 print("The most common property type in Enugu State is " +
       str(enu_most_common))
@@ -1821,7 +1742,7 @@ print("The most common property type in Enugu State is " +
 
 # Selecting data on only Imo
 
-df_imo = df[df["state"] == "Imo"].reset_index(drop=True)
+df_imo = states["Imo"]
 df_imo.head(5)
 
 
@@ -1844,7 +1765,7 @@ df_imo.describe()
 
 # Summarize the categorical features
 
-df_imo.describe(include=["object"])
+df_imo.describe(include=["category"])
 
 
 # In[ ]:
@@ -1875,20 +1796,7 @@ df_imo["title"].unique()
 
 
 # Plotting a boxplot to visualise the outliers in price column
-
-# Styling the plot
-sns.set_theme(style="whitegrid")
-
-# Scaling the plot
-fig_dims = (20, 20)
-fig, ax = plt.subplots(figsize=fig_dims)
-
-# Plotting
-sns.boxplot(x=df_imo["price"], y=df_imo["town"],  palette="Set2",)
-sns.stripplot(x=df_imo["price"], y=df_imo["town"], color=".25",
-              jitter=True,
-              marker='o',
-              alpha=0.8)
+fig = plots.price_boxplot(df_imo, by="town")
 
 
 # ### InterQuantileRange (IQR)
@@ -1898,8 +1806,7 @@ sns.stripplot(x=df_imo["price"], y=df_imo["town"], color=".25",
 
 # Calculating q1 and q3 for price
 
-imo_Q1 = df_imo.price.quantile(0.25)
-imo_Q3 = df_imo.price.quantile(0.75)
+imo_Q1, imo_Q3 = state_limits.loc["Imo", ["q1", "q3"]]
 imo_Q1, imo_Q3
 
 
@@ -1917,8 +1824,8 @@ print("The Interquartile Range for the price is", imo_IQR)
 
 # Lower and Upper Limit
 
-imo_lower_limit = Q1 - 1.5*imo_IQR
-imo_upper_limit = Q3 + 1.5*imo_IQR
+imo_lower_limit, imo_upper_limit = state_limits.loc[
+    "Imo", ["lower_limit", "upper_limit"]]
 imo_lower_limit, imo_upper_limit
 
 
@@ -1949,8 +1856,7 @@ Imo
 
 # Remove the outliers using the IQR
 
-df_imo_outlier_free = df_imo[(df_imo.price > imo_lower_limit)
-                             & (df_imo.price < imo_upper_limit)]
+df_imo_outlier_free = outlier_free_states["Imo"]
 df_imo_outlier_free.shape
 
 
@@ -1958,22 +1864,7 @@ df_imo_outlier_free.shape
 
 
 # Plotting a boxplot to validate the changes
-
-# Styling the plot
-sns.set_theme(style="whitegrid")
-
-# Scaling the plot
-fig_dims = (20, 20)
-fig, ax = plt.subplots(figsize=fig_dims)
-
-# Plotting
-sns.boxplot(x=df_imo_outlier_free["price"],
-            y=df_imo_outlier_free["town"],  palette="Set2",)
-sns.stripplot(x=df_imo_outlier_free["price"],
-              y=df_imo_outlier_free["town"], color=".25",
-              jitter=True,
-              marker='o',
-              alpha=0.8)
+fig = plots.price_boxplot(df_imo_outlier_free, by="town")
 
 
 # ### IMO REAL ESTATE MARKET TREND (Data Analysis)
@@ -1985,9 +1876,7 @@ sns.stripplot(x=df_imo_outlier_free["price"],
 
 # Plotting histogram
 
-df_imo_outlier_free.hist(figsize=(16, 16), xrot=90)
-
-plt.show()
+fig = state_histograms.plot("Imo", title="Imo")
 
 
 # ### Average property price in Imo
@@ -1995,7 +1884,7 @@ plt.show()
 # In[174]:
 
 
-imo_average_price = st.mean(df_imo_outlier_free["price"])
+imo_average_price = stats.mean(df_imo_outlier_free["price"])
 
 print("The average property price in Imo is " +
       str(round(imo_average_price, 2)) + " Naira")
@@ -2028,7 +1917,7 @@ fig.show()
 # In[176]:
 
 
-imo_most_common = st.mode(df_imo_outlier_free["title"])
+imo_most_common = stats.mode(df_imo_outlier_free["title"])
 
 print("The most common property type in Imo State is " +
       str(imo_most_common))
@@ -2041,7 +1930,7 @@ print("The most common property type in Imo State is " +
 
 # Selecting data on only Lagos
 
-df_lag = df[df["state"] == "Lagos"].reset_index(drop=True)
+df_lag = states["Lagos"]
 df_lag.head(3)
 
 
@@ -2066,7 +1955,7 @@ df_lag.describe()
 
 # Summarize the categorical features
 
-df_lag.describe(include=["object"])
+df_lag.describe(include=["category"])
 
 
 # ### Towns in Lagos
@@ -2091,20 +1980,7 @@ df_lag["title"].unique()
 
 
 # Plotting a boxplot to visualise the outliers in price column
-
-# Styling the plot
-sns.set_theme(style="whitegrid")
-
-# Scaling the plot
-fig_dims = (20, 20)
-fig, ax = plt.subplots(figsize=fig_dims)
-
-# Plotting
-sns.boxplot(x=df_lag["price"], y=df_lag["town"],  palette="Set2",)
-sns.stripplot(x=df_lag["price"], y=df_lag["town"], color=".25",
-              jitter=True,
-              marker='o',
-              alpha=0.8)
+fig = plots.price_boxplot(df_lag, by="town")
 
 
 # #### The box plot above show majority of the dataoiints on the left side, however, there some datapoints on the that appear separated from the other datapoints as you begin to scan towards the right part of the chart. These point indicate the presence of Outliers. These outliers are properties with significantly higher prices when compared to the property prices within Lagos State. The "lekki" and "Ikoyi" appear to have more of these outliers. 
@@ -2115,8 +1991,7 @@ sns.stripplot(x=df_lag["price"], y=df_lag["town"], color=".25",
 
 
 # Calculating q1 and q3 for price
-lag_Q1 = df_lag.price.quantile(0.25)
-lag_Q3 = df_lag.price.quantile(0.75)
+lag_Q1, lag_Q3 = state_limits.loc["Lagos", ["q1", "q3"]]
 lag_Q1, lag_Q3
 
 
@@ -2134,8 +2009,8 @@ print("The Interquartile Range for the price is", lag_IQR)
 
 # Lower and Upper Limit
 
-lag_lower_limit = Q1 - 1.5*lag_IQR
-lag_upper_limit = Q3 + 1.5*lag_IQR
+lag_lower_limit, lag_upper_limit = state_limits.loc[
+    "Lagos", ["lower_limit", "upper_limit"]]
 lag_lower_limit, lag_upper_limit
 
 
@@ -2166,8 +2041,7 @@ Lagos
 # In[189]:
 
 
-df_lag_outlier_free = df_lag[(df_lag.price > lag_lower_limit)
-                             & (df_lag.price < lag_upper_limit)]
+df_lag_outlier_free = outlier_free_states["Lagos"]
 df_lag_outlier_free.shape
 
 
@@ -2177,22 +2051,7 @@ df_lag_outlier_free.shape
 
 
 # Plotting a boxplot to validate changes
-
-# Styling the plot
-sns.set_theme(style="whitegrid")
-
-# Scaling the plot
-fig_dims = (20, 20)
-fig, ax = plt.subplots(figsize=fig_dims)
-
-# Plotting
-sns.boxplot(x=df_lag_outlier_free["price"],
-            y=df_lag_outlier_free["town"],  palette="Set2",)
-sns.stripplot(x=df_lag_outlier_free["price"],
-              y=df_lag_outlier_free["town"], color=".25",
-              jitter=True,
-              marker='o',
-              alpha=0.8)
+fig = plots.price_boxplot(df_lag_outlier_free, by="town")
 
 
 # #### Re-plotting the box plot indicates the absence of the outliers initially spotted. However, this chart reveals that certain towns such as "IKoyi", "Lekki", "Victoria Island", "Magodo", "Apapa", "Ikeja" and "Lagos Island" have properties with significantly higher prices than other towns within Lagos.
@@ -2206,9 +2065,7 @@ sns.stripplot(x=df_lag_outlier_free["price"],
 
 # Plotting histogram
 
-df_lag_outlier_free.hist(figsize=(16, 16), xrot=90)
-
-plt.show()
+fig = state_histograms.plot("Lagos", title="Lagos")
 
 
 # ### Average property price in Lagos
@@ -2216,7 +2073,7 @@ plt.show()
 # In[192]:
 
 
-average_price_lag = st.mean(df_lag_outlier_free["price"])
+average_price_lag = stats.mean(df_lag_outlier_free["price"])
 
 print("The average property price in Lagos is " +
       str(round(average_price_lag, 2)) + " Naira")
@@ -2249,7 +2106,7 @@ fig.show()
 # In[194]:
 
 
-lag_most_common = st.mode(df_lag_outlier_free["title"])
+lag_most_common = stats.mode(df_lag_outlier_free["title"])
 
 print("The most common property type in Lagos State is " +
       str(lag_most_common))
@@ -2264,7 +2121,7 @@ print("The most common property type in Lagos State is " +
 
 # Selecting data on only Ogun
 
-df_ogu = df[df["state"] == "Ogun"].reset_index(drop=True)
+df_ogu = states["Ogun"]
 df_ogu.head(5)
 
 
@@ -2289,7 +2146,7 @@ df_ogu.describe()
 
 # Summarize the categorical features
 
-df_ogu.describe(include=["object"])
+df_ogu.describe(include=["category"])
 
 
 # ### Towns in Ogun State
@@ -2314,20 +2171,7 @@ df_ogu["title"].unique()
 
 
 # Plotting a boxplot to visualise the outliers in price column
-
-# Styling the plot
-sns.set_theme(style="whitegrid")
-
-# Scaling the plot
-fig_dims = (20, 20)
-fig, ax = plt.subplots(figsize=fig_dims)
-
-# Plotting
-sns.boxplot(x=df_ogu["price"], y=df_ogu["town"],  palette="Set2",)
-sns.stripplot(x=df_ogu["price"], y=df_ogu["town"], color=".25",
-              jitter=True,
-              marker='o',
-              alpha=0.8)
+fig = plots.price_boxplot(df_ogu, by="town")
 
 
 # ### InterQuantileRange (IQR)
@@ -2336,8 +2180,7 @@ sns.stripplot(x=df_ogu["price"], y=df_ogu["town"], color=".25",
 
 
 # Calculating q1 and q3 for price
-ogu_Q1 = df_ogu.price.quantile(0.25)
-ogu_Q3 = df_ogu.price.quantile(0.75)
+ogu_Q1, ogu_Q3 = state_limits.loc["Ogun", ["q1", "q3"]]
 ogu_Q1, ogu_Q3
 
 
@@ -2356,8 +2199,8 @@ print("The Interquartile Range for the price is", ogu_IQR)
 
 # Lower and Upper Limit
 
-ogu_lower_limit = Q1 - 1.5*ogu_IQR
-ogu_upper_limit = Q3 + 1.5*ogu_IQR
+ogu_lower_limit, ogu_upper_limit = state_limits.loc[
+    "Ogun", ["lower_limit", "upper_limit"]]
 ogu_lower_limit, ogu_upper_limit
 
 
@@ -2388,8 +2231,7 @@ Ogun
 
 # Remove the outliers using the IQR
 
-df_ogu_outlier_free = df_ogu[(df_ogu.price > ogu_lower_limit)
-                             & (df_ogu.price < ogu_upper_limit)]
+df_ogu_outlier_free = outlier_free_states["Ogun"]
 df_ogu_outlier_free.shape
 
 
@@ -2397,22 +2239,7 @@ df_ogu_outlier_free.shape
 
 
 # Plotting a boxplot to validate changes
-
-# Styling the plot
-sns.set_theme(style="whitegrid")
-
-# Scaling the plot
-fig_dims = (20, 20)
-fig, ax = plt.subplots(figsize=fig_dims)
-
-# Plotting
-sns.boxplot(x=df_ogu_outlier_free["price"],
-            y=df_ogu_outlier_free["town"],  palette="Set2",)
-sns.stripplot(x=df_ogu_outlier_free["price"],
-              y=df_ogu_outlier_free["town"], color=".25",
-              jitter=True,
-              marker='o',
-              alpha=0.8)
+fig = plots.price_boxplot(df_ogu_outlier_free, by="town")
 
 
 # ### OGUN REAL ESTATE MARKET TREND (Data Analysis)
@@ -2424,9 +2251,7 @@ sns.stripplot(x=df_ogu_outlier_free["price"],
 
 # Plotting histogram
 
-df_ogu_outlier_free.hist(figsize=(16, 16), xrot=90)
-
-plt.show()
+fig = state_histograms.plot("Ogun", title="Ogun")
 
 
 # ### Average property price in Ogun
@@ -2434,7 +2259,7 @@ plt.show()
 # In[210]:
 
 
-ogu_average_price = st.mean(df_ogu_outlier_free["price"])
+ogu_average_price = stats.mean(df_ogu_outlier_free["price"])
 
 print("The average property price in Ogun is " +
       str(round(ogu_average_price, 2)) + " Naira")
@@ -2467,7 +2292,7 @@ fig.show()
 # In[212]:
 
 
-ogu_most_common = st.mode(df_ogu_outlier_free["title"])
+ogu_most_common = stats.mode(df_ogu_outlier_free["title"])
 
 print("The most common property type in Ogun State is " +
       str(ogu_most_common))
@@ -2480,7 +2305,7 @@ print("The most common property type in Ogun State is " +
 
 # Selecting data on only Oyo
 
-df_oyo = df[df["state"] == "Oyo"].reset_index(drop=True)
+df_oyo = states["Oyo"]
 df_oyo.head(5)
 
 
@@ -2505,7 +2330,7 @@ df_oyo.describe()
 
 # Summarize the categorical features
 
-df_oyo.describe(include=["object"])
+df_oyo.describe(include=["category"])
 
 
 # ### Towns in Oyo
@@ -2530,20 +2355,7 @@ df_oyo["title"].unique()
 
 
 # Plotting a boxplot to visualise the outliers in price column
-
-# Styling the plot
-sns.set_theme(style="whitegrid")
-
-# Scaling the plot
-fig_dims = (20, 20)
-fig, ax = plt.subplots(figsize=fig_dims)
-
-# Plotting
-sns.boxplot(x=df_oyo["price"], y=df_oyo["town"],  palette="Set2",)
-sns.stripplot(x=df_oyo["price"], y=df_oyo["town"], color=".25",
-              jitter=True,
-              marker='o',
-              alpha=0.8)
+fig = plots.price_boxplot(df_oyo, by="town")
 
 
 # ### InterQuantileRange (IQR)
@@ -2552,8 +2364,7 @@ sns.stripplot(x=df_oyo["price"], y=df_oyo["town"], color=".25",
 
 
 # Calculating q1 and q3 for price
-oyo_Q1 = df_oyo.price.quantile(0.25)
-oyo_Q3 = df_oyo.price.quantile(0.75)
+oyo_Q1, oyo_Q3 = state_limits.loc["Oyo", ["q1", "q3"]]
 oyo_Q1, oyo_Q3
 
 
@@ -2572,8 +2383,8 @@ print("The Interquartile Range for the price is", oyo_IQR)
 
 # Lower and Upper Limit
 
-oyo_lower_limit = Q1 - 1.5*oyo_IQR
-oyo_upper_limit = Q3 + 1.5*oyo_IQR
+oyo_lower_limit, oyo_upper_limit = state_limits.loc[
+    "Oyo", ["lower_limit", "upper_limit"]]
 oyo_lower_limit, oyo_upper_limit
 
 
@@ -2603,8 +2414,7 @@ Oyo
 
 # Remove the outliers using the IQR
 
-df_oyo_outlier_free = df_oyo[(df_oyo.price > oyo_lower_limit)
-                             & (df_oyo.price < oyo_upper_limit)]
+df_oyo_outlier_free = outlier_free_states["Oyo"]
 df_oyo_outlier_free.shape
 
 
@@ -2612,22 +2422,7 @@ df_oyo_outlier_free.shape
 
 
 # Plotting a boxplot to validate the changes
-
-# Styling the plot
-sns.set_theme(style="whitegrid")
-
-# Scaling the plot
-fig_dims = (20, 20)
-fig, ax = plt.subplots(figsize=fig_dims)
-
-# Plotting
-sns.boxplot(x=df_oyo_outlier_free["price"],
-            y=df_oyo_outlier_free["town"],  palette="Set2",)
-sns.stripplot(x=df_oyo_outlier_free["price"],
-              y=df_oyo_outlier_free["town"], color=".25",
-              jitter=True,
-              marker='o',
-              alpha=0.8)
+fig = plots.price_boxplot(df_oyo_outlier_free, by="town")
 
 
 # ### OYO RESIDENTIAL REAL ESTATE MARKET TREND (Data Analysis)
@@ -2639,9 +2434,7 @@ sns.stripplot(x=df_oyo_outlier_free["price"],
 
 # Plotting histogram
 
-df_oyo_outlier_free.hist(figsize=(16, 16), xrot=90)
-
-plt.show()
+fig = state_histograms.plot("Oyo", title="Oyo")
 
 
 # #### Comment here 
@@ -2651,7 +2444,7 @@ plt.show()
 # In[228]:
 
 
-oyo_average_price = st.mean(df_oyo_outlier_free["price"])
+oyo_average_price = stats.mean(df_oyo_outlier_free["price"])
 
 print("The average property price in Oyo is " +
       str(round(oyo_average_price, 2)) + " Naira")
@@ -2684,7 +2477,7 @@ fig.show()
 # In[230]:
 
 
-oyo_most_common = st.mode(df_oyo_outlier_free["title"])
+oyo_most_common = stats.mode(df_oyo_outlier_free["title"])
 
 print("The most common property type in Oyo State is " +
       str(oyo_most_common))
@@ -2697,7 +2490,7 @@ print("The most common property type in Oyo State is " +
 
 # Selecting data on only Rivers
 
-df_riv = df[df["state"] == "Rivers"].reset_index(drop=True)
+df_riv = states["Rivers"]
 df_riv.head(5)
 
 
@@ -2722,7 +2515,7 @@ df_riv.describe()
 
 # Summarize the categorical features
 
-df_riv.describe(include=["object"])
+df_riv.describe(include=["category"])
 
 
 # ### Towns in Rivers
@@ -2747,20 +2540,7 @@ df_riv["title"].unique()
 
 
 # Plotting a boxplot to visualise the outliers in price column
-
-# Styling the plot
-sns.set_theme(style="whitegrid")
-
-# Scaling the plot
-fig_dims = (20, 20)
-fig, ax = plt.subplots(figsize=fig_dims)
-
-# Plotting
-sns.boxplot(x=df_riv["price"], y=df_riv["town"],  palette="Set2",)
-sns.stripplot(x=df_riv["price"], y=df_riv["town"], color=".25",
-              jitter=True,
-              marker='o',
-              alpha=0.8)
+fig = plots.price_boxplot(df_riv, by="town")
 
 
 # ### InterQuantileRange (IQR)
@@ -2770,8 +2550,7 @@ sns.stripplot(x=df_riv["price"], y=df_riv["town"], color=".25",
 
 # Calculating q1 and q3 for price
 
-riv_Q1 = df_riv.price.quantile(0.25)
-riv_Q3 = df_riv.price.quantile(0.75)
+riv_Q1, riv_Q3 = state_limits.loc["Rivers", ["q1", "q3"]]
 riv_Q1, riv_Q3
 
 
@@ -2790,8 +2569,8 @@ print("The Interquartile Range for the price is", riv_IQR)
 
 # Lower and Upper Limit
 
-riv_lower_limit = Q1 - 1.5*riv_IQR
-riv_upper_limit = Q3 + 1.5*riv_IQR
+riv_lower_limit, riv_upper_limit = state_limits.loc[
+    "Rivers", ["lower_limit", "upper_limit"]]
 riv_lower_limit, riv_upper_limit
 
 
@@ -2822,8 +2601,7 @@ Rivers
 
 # Remove the outliers using the IQR
 
-df_riv_outlier_free = df_riv[(df_riv.price > riv_lower_limit)
-                             & (df_riv.price < riv_upper_limit)]
+df_riv_outlier_free = outlier_free_states["Rivers"]
 df_riv_outlier_free.shape
 
 
@@ -2831,22 +2609,7 @@ df_riv_outlier_free.shape
 
 
 # Plotting a boxplot to validate the changes
-
-# Styling the plot
-sns.set_theme(style="whitegrid")
-
-# Scaling the plot
-fig_dims = (20, 20)
-fig, ax = plt.subplots(figsize=fig_dims)
-
-# Plotting
-sns.boxplot(x=df_riv_outlier_free["price"],
-            y=df_riv_outlier_free["town"],  palette="Set2",)
-sns.stripplot(x=df_riv_outlier_free["price"],
-              y=df_riv_outlier_free["town"], color=".25",
-              jitter=True,
-              marker='o',
-              alpha=0.8)
+fig = plots.price_boxplot(df_riv_outlier_free, by="town")
 
 
 # ### RIVERS STATE REAL ESTATE MARKET TREND (Data Analysis)
@@ -2858,9 +2621,7 @@ sns.stripplot(x=df_riv_outlier_free["price"],
 
 # Plotting histogram
 
-df_riv_outlier_free.hist(figsize=(16, 16), xrot=90)
-
-plt.show()
+fig = state_histograms.plot("Rivers", title="Rivers")
 
 
 # ### Average property price in Rivers
@@ -2868,7 +2629,7 @@ plt.show()
 # In[246]:
 
 
-riv_average_price = st.mean(df_riv_outlier_free["price"])
+riv_average_price = stats.mean(df_riv_outlier_free["price"])
 
 print("The average property price in Rivers State is " +
       str(round(riv_average_price, 2)) + " Naira")
@@ -2901,7 +2662,7 @@ fig.show()
 # In[248]:
 
 
-riv_most_common = st.mode(df_riv_outlier_free["title"])
+riv_most_common = stats.mode(df_riv_outlier_free["title"])
 
 print("The most common property type in Rivers State is " +
       str(riv_most_common))
@@ -0,0 +1,189 @@
+"""Time and memory-profile every pipeline stage on synthetic listings.
+
+Each size in ``--sizes`` gets a synthetic CSV (see ``benchmarks.synthetic``),
+and the stages below run on it in order, each on the previous stage's
+output.  Wall time is the best of ``--repeat`` runs; peak memory is the
+largest allocation high-water mark tracemalloc sees during one extra run
+(numpy and pandas report their buffers to it).
+
+    python -m benchmarks.bench_pipeline --sizes 10k 1M --output before.json
+    python -m benchmarks.bench_pipeline --sizes 10k 1M --compare before.json
+
+With ``--compare`` the run exits with status 1 if any stage got slower by
+more than ``--threshold`` (default 20%).  At 100M rows the in-memory
+stages need roughly 15 GB (about 80 MB of peak allocations per million
+rows, plus the frames kept between stages).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.synthetic import parse_size, write_csv
+from nigeria_real_estate import (
+    PriceModel,
+    drop_duplicates,
+    iqr_filter,
+    plots,
+    read_csv,
+    stats,
+)
+from nigeria_real_estate.ingest import file_source, ingest
+from nigeria_real_estate.schema import COUNT_COLUMNS, PRICE_COLUMN
+
+
+def peak_memory(func: Callable) -> int:
+    """Bytes allocated at the peak of one call of ``func``."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(func: Callable, repeat: int) -> tuple[float, int]:
+    seconds = min(timeit.repeat(func, number=1, repeat=repeat))
+    return seconds, peak_memory(func)
+
+
+def run_stages(csv: Path, figures: Path, repeat: int, plot: bool) -> list[dict]:
+    state: dict = {}
+
+    def load():
+        state["raw"] = read_csv(csv)
+
+    def dedup():
+        state["df"], _ = drop_duplicates(state["raw"])
+
+    def iqr():
+        mask, _ = iqr_filter(state["df"], by="state")
+        state["clean"] = state["df"][mask]
+
+    def mean():
+        stats.grouped(state["clean"], "state", stats=("mean",))
+
+    def mode():
+        stats.grouped_mode(state["clean"], "state")
+
+    def corr():
+        state["clean"][[*COUNT_COLUMNS, PRICE_COLUMN]].corr()
+
+    def fit():
+        state["model"] = PriceModel.fit(state["clean"])
+
+    def predict():
+        state["model"].predict(state["clean"])
+
+    def ingest_csv():
+        # The whole file through the async ingestion pipeline, from scratch.
+        asyncio.run(ingest([file_source(csv)]))
+
+    def plotting():
+        plots.save(plots.price_boxplot(state["clean"], by="state"), figures / "box.png")
+        plots.save(plots.histograms(state["clean"]), figures / "hist.png")
+
+    stages = {
+        "load": load,
+        "dedup": dedup,
+        "iqr_filter": iqr,
+        "groupby_mean": mean,
+        "mode": mode,
+        "corr": corr,
+        "fit_model": fit,
+        "predict": predict,
+        "ingest": ingest_csv,
+    }
+    if plot:
+        stages["plotting"] = plotting
+
+    results = []
+    for name, func in stages.items():
+        seconds, peak = measure(func, repeat)
+        results.append({"stage": name, "seconds": seconds, "peak_bytes": peak})
+        print(f"  {name:<14} {seconds:>10.4f}s {peak / 2**20:>10.1f} MiB")
+    return results
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> bool:
+    """Print the time ratio of every stage; ``False`` if any regressed."""
+    before = {(r["rows"], r["stage"]): r["seconds"] for r in baseline["results"]}
+    ok = True
+    print(f"\nvs {baseline.get('commit') or 'baseline'}:")
+    for r in current["results"]:
+        old = before.get((r["rows"], r["stage"]))
+        if old is None:
+            continue
+        ratio = r["seconds"] / old
+        flag = ""
+        if ratio > 1 + threshold:
+            flag, ok = "  REGRESSION", False
+        print(f"  {r['rows']:>11} {r['stage']:<14} {ratio:>6.2f}x{flag}")
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=["10k", "1M"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-plots", action="store_true")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="results JSON of an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    plots.use_agg()
+    report = {
+        "commit": git_commit(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": [],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for size in args.sizes:
+            rows = parse_size(size)
+            csv = tmp / f"listings-{rows}.csv"
+            start = time.perf_counter()
+            write_csv(csv, rows)
+            print(f"{rows:,} rows (generated in {time.perf_counter() - start:.1f}s)")
+            for result in run_stages(csv, tmp, args.repeat, not args.no_plots):
+                report["results"].append({"rows": rows, **result})
+            csv.unlink()
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        if not compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
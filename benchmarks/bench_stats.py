@@ -0,0 +1,72 @@
+"""Compare the statistics module with nigeria_real_estate.stats.
+
+Times mean and mode of the price and title columns, overall and per state,
+on the real listings and on the same rows repeated to larger sizes:
+
+    python -m benchmarks.bench_stats --repeat 1 10 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics as st
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from nigeria_real_estate import drop_duplicates, load_listings, stats
+
+
+def best_of(func, number: int = 3) -> float:
+    return min(timeit.repeat(func, number=1, repeat=number))
+
+
+def python_per_state(df: pd.DataFrame) -> None:
+    for state in df["state"].unique():
+        rows = df[df["state"] == state]
+        st.mean(rows["price"])
+        st.mode(rows["title"])
+
+
+def numpy_per_state(df: pd.DataFrame) -> None:
+    index = stats.GroupIndex(df, "state")
+    stats.grouped(df, index, stats=("mean",))
+    stats.grouped_mode(df, index)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, nargs="+", default=[1, 10])
+    args = parser.parse_args()
+
+    base, _ = drop_duplicates(load_listings())
+    print(f"{'rows':>10} {'case':<16} {'statistics':>12} {'numpy':>12} {'speedup':>8}")
+    for repeat in args.repeat:
+        df = pd.concat([base] * repeat, ignore_index=True)
+        cases = {
+            "mean(price)": (
+                lambda: st.mean(df["price"]),
+                lambda: stats.mean(df["price"]),
+            ),
+            "mode(title)": (
+                lambda: st.mode(df["title"]),
+                lambda: stats.mode(df["title"]),
+            ),
+            "per-state": (
+                lambda: python_per_state(df),
+                lambda: numpy_per_state(df),
+            ),
+        }
+        assert np.isclose(st.mean(df["price"]), stats.mean(df["price"]))
+        assert st.mode(df["title"]) == stats.mode(df["title"])
+        for name, (slow, fast) in cases.items():
+            slow_time, fast_time = best_of(slow), best_of(fast)
+            print(
+                f"{len(df):>10} {name:<16} {slow_time:>11.4f}s {fast_time:>11.4f}s "
+                f"{slow_time / fast_time:>7.0f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
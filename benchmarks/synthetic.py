@@ -0,0 +1,102 @@
+"""Synthetic listings shaped like ``nigeria_houses_data.csv``, at any size.
+
+Rows are drawn from the real deduplicated listings, so the joint
+distribution of state, town, title and room counts is the real one (62%
+Lagos and 23% Abuja among distinct listings, seven titles led by Detached
+Duplex, mostly 4-5 bedrooms).  Each drawn
+price is scaled by lognormal noise so that drawn rows are distinct, and a
+``duplicate_rate`` share of the rows repeats an earlier row, as 43% of the
+real file does.
+
+    python -m benchmarks.synthetic 1M listings-1m.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from collections.abc import Iterator
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from nigeria_real_estate import drop_duplicates, load_listings
+from nigeria_real_estate.schema import COLUMNS, PRICE_COLUMN
+
+# Share of the rows in the real file that repeat an earlier row.
+DUPLICATE_RATE = 0.43
+SUFFIXES = {"k": 10**3, "m": 10**6, "b": 10**9}
+
+
+def parse_size(text: str) -> int:
+    """``"10k"`` -> 10000, ``"1M"`` -> 1000000, ``"250"`` -> 250."""
+    text = text.strip().lower().replace("_", "")
+    if text[-1:] in SUFFIXES:
+        return int(float(text[:-1]) * SUFFIXES[text[-1]])
+    return int(text)
+
+
+@lru_cache(maxsize=1)
+def _template() -> pd.DataFrame:
+    df, _ = drop_duplicates(load_listings())
+    return df.reset_index(drop=True)
+
+
+def generate(
+    rows: int,
+    seed: int = 0,
+    duplicate_rate: float = DUPLICATE_RATE,
+    price_noise: float = 0.1,
+) -> pd.DataFrame:
+    """``rows`` synthetic listings with the schema dtypes."""
+    template = _template()
+    rng = np.random.default_rng(seed)
+    draws = rng.integers(0, len(template), rows)
+    noise = rng.lognormal(0.0, price_noise, rows)
+    # Round to the nearest thousand naira, as the real prices are.
+    prices = np.round(template[PRICE_COLUMN].to_numpy()[draws] * noise, -3)
+
+    # Each repeated row copies a uniformly chosen earlier original row.
+    rows_used = np.arange(rows)
+    repeated = rng.random(rows) < duplicate_rate
+    originals, repeats = np.flatnonzero(~repeated), np.flatnonzero(repeated)
+    earlier = np.searchsorted(originals, repeats)
+    repeats, earlier = repeats[earlier > 0], earlier[earlier > 0]
+    rows_used[repeats] = originals[(rng.random(len(repeats)) * earlier).astype(np.intp)]
+
+    df = template.take(draws[rows_used]).reset_index(drop=True)
+    df[PRICE_COLUMN] = prices[rows_used].astype(np.int64)
+    return df[COLUMNS]
+
+
+def generate_chunks(
+    rows: int, chunksize: int = 1_000_000, seed: int = 0, **kwargs
+) -> Iterator[pd.DataFrame]:
+    """``generate(rows)`` in chunks, for sizes that do not fit in memory.
+
+    Duplicates only repeat rows of the same chunk.
+    """
+    for number, start in enumerate(range(0, rows, chunksize)):
+        yield generate(min(chunksize, rows - start), seed=seed + number, **kwargs)
+
+
+def write_csv(
+    path: str | os.PathLike, rows: int, chunksize: int = 1_000_000, seed: int = 0
+) -> None:
+    """Write ``rows`` synthetic listings to a CSV in the real file's layout."""
+    for number, chunk in enumerate(generate_chunks(rows, chunksize, seed)):
+        chunk.to_csv(path, mode="a" if number else "w", header=not number, index=False)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("rows", type=parse_size, help="e.g. 10k, 1M or 100M")
+    parser.add_argument("output", help="CSV file to write")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write_csv(args.output, args.rows, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
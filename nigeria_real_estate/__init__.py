@@ -0,0 +1,56 @@
+"""Reusable analysis building blocks for the Nigerian real estate EDA.
+
+The names below are imported from their submodules on first access, so
+``import nigeria_real_estate.stats`` does not pay for the asyncio server of
+``ingest``, the process pool of ``parallel`` or any other module it does
+not use.
+"""
+
+from importlib import import_module
+
+# Submodule of each re-exported name.
+_EXPORTS = {
+    "aggregates": ["IncrementalAggregates"],
+    "columnar": ["open_columns", "write_columns"],
+    "correlation": ["Correlations", "correlations", "correlations_by"],
+    "cube": ["CellStats", "PriceCube"],
+    "dedup": [
+        "DedupReport",
+        "SeenSet",
+        "SeenStore",
+        "dedup_batch",
+        "drop_duplicates",
+        "row_hashes",
+    ],
+    "gazetteer": ["Gazetteer", "canonicalise"],
+    "histograms": ["Histograms"],
+    "ingest": ["Ingestor"],
+    "loader": ["load_listings", "read_csv"],
+    "memo": ["ResultCache", "fingerprint"],
+    "moments": ["GroupMoments", "distribution_profile", "group_moments"],
+    "outliers": ["iqr_filter", "iqr_limits", "sketch_limits"],
+    "parallel": ["SharedFrame", "map_states"],
+    "partition": ["Partitions", "partition", "partition_by_state"],
+    "quality": ["QualityReport", "validate"],
+    "sketch": ["QuantileSketch", "merge_sketches", "sketch_groups"],
+    "streaming": ["ListingSummary", "summarise_csv"],
+    "valuation": ["PriceModel", "holdout_split"],
+}
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted([*_MODULES, "stats"])
+
+
+def __getattr__(name: str):
+    if name == "stats":
+        return import_module(f"{__name__}.stats")
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
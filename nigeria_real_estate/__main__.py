@@ -0,0 +1,5 @@
+import sys
+
+from nigeria_real_estate.cli import main
+
+sys.exit(main())
@@ -0,0 +1,191 @@
+"""Per-state and per-town aggregates that absorb appended or retracted rows.
+
+``IncrementalAggregates`` keeps, for every state and every (state, town),
+the listing count, the exact integer price sum, the count of every title
+and the bucket counts of a ``QuantileSketch`` of the price.  All of these
+are plain counts and sums, so a batch of new listings is folded in with
+``add`` and a batch of withdrawn listings taken out again with ``retract``,
+both in time proportional to the batch rather than to everything seen so
+far.
+
+Typical use next to a ``SeenStore``::
+
+    batch, report = dedup_batch(read_csv(new_rows), store)
+    aggregates.add(batch)
+    aggregates.means("state")
+
+Quantiles are read from the bucket counts through
+``QuantileSketch.from_buckets`` and are within the sketch's 1% of the exact
+value; prices below 1 naira are counted as 1.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Hashable, Sequence
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from nigeria_real_estate.schema import PRICE_COLUMN
+from nigeria_real_estate.sketch import QuantileSketch, bucket_keys
+
+LEVELS = {"state": ("state",), "town": ("state", "town")}
+
+
+@dataclass
+class GroupTotals:
+    """Counts and sums of the listings of one state or town."""
+
+    count: int = 0
+    price_sum: int = 0
+    titles: Counter = field(default_factory=Counter)
+    bins: Counter = field(default_factory=Counter)
+
+    @property
+    def mean(self) -> float:
+        return self.price_sum / self.count if self.count else np.nan
+
+    @property
+    def mode(self) -> Hashable:
+        """Most common title; ties go to the alphabetically first title.
+
+        The tie-break depends only on the counts, not on the order in which
+        titles were added or retracted.
+        """
+        if not self.titles:
+            return None
+        return min(self.titles, key=lambda title: (-self.titles[title], str(title)))
+
+    def quantile(self, q: float) -> float:
+        sketch = QuantileSketch.from_buckets(list(self.bins), list(self.bins.values()))
+        return sketch.quantile(q)
+
+
+def _level(by: str | Sequence[str]) -> str:
+    keys = (by,) if isinstance(by, str) else tuple(by)
+    for level, level_keys in LEVELS.items():
+        if keys == level_keys:
+            return level
+    raise ValueError(f"by must be 'state' or ['state', 'town'], not {by!r}")
+
+
+def _batch_totals(batch: pd.DataFrame, keys: tuple[str, ...]) -> dict:
+    """``{key: (count, price_sum, title counts, bin counts)}`` of one batch."""
+    frame = batch.groupby(list(keys), observed=True, sort=False)
+    counts = frame.size()
+    sums = frame[PRICE_COLUMN].sum()
+    titles = batch.groupby([*keys, "title"], observed=True, sort=False).size()
+    bins = batch.groupby([*keys, "bin"], observed=True, sort=False).size()
+
+    def split(table: pd.Series) -> dict:
+        nested: dict = {}
+        for key, n in table.items():
+            nested.setdefault(key[:-1], {})[key[-1]] = int(n)
+        return nested
+
+    titles, bins = split(titles), split(bins)
+    totals = {}
+    for key, n, price_sum in zip(counts.index, counts, sums):
+        key = key if isinstance(key, tuple) else (key,)
+        totals[key] = (int(n), int(price_sum), titles.get(key, {}), bins[key])
+    return totals
+
+
+class IncrementalAggregates:
+    """State and town aggregates maintained under appends and retractions."""
+
+    def __init__(self):
+        self.groups: dict[str, dict[tuple, GroupTotals]] = {
+            level: {} for level in LEVELS
+        }
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> IncrementalAggregates:
+        aggregates = cls()
+        aggregates.add(df)
+        return aggregates
+
+    def add(self, batch: pd.DataFrame) -> None:
+        """Fold the listings of ``batch`` in."""
+        self._apply(batch, 1)
+
+    def retract(self, batch: pd.DataFrame) -> None:
+        """Take out listings that were added before.
+
+        Raises ``ValueError`` and leaves the aggregates unchanged if the
+        batch holds rows that were never added.
+        """
+        self._apply(batch, -1)
+
+    def _apply(self, batch: pd.DataFrame, sign: int) -> None:
+        batch = batch.dropna(subset=["state", "town", PRICE_COLUMN])
+        if not len(batch):
+            return
+        # Exact integer sums, so retracting rows restores the previous totals.
+        prices = batch[PRICE_COLUMN].to_numpy(dtype=np.float64).round()
+        batch = batch.assign(
+            **{
+                PRICE_COLUMN: prices.astype(np.int64),
+                "bin": bucket_keys(np.maximum(prices, 1)),
+            }
+        )
+        deltas = {level: _batch_totals(batch, keys) for level, keys in LEVELS.items()}
+        if sign < 0:
+            self._check_retraction(deltas)
+
+        for level, totals in deltas.items():
+            groups = self.groups[level]
+            for key, (count, price_sum, titles, bins) in totals.items():
+                group = groups.setdefault(key, GroupTotals())
+                group.count += sign * count
+                group.price_sum += sign * price_sum
+                for counter, delta in ((group.titles, titles), (group.bins, bins)):
+                    for value, n in delta.items():
+                        counter[value] += sign * n
+                        if not counter[value]:
+                            del counter[value]
+                if not group.count:
+                    del groups[key]
+
+    def _check_retraction(self, deltas: dict) -> None:
+        for level, totals in deltas.items():
+            for key, (count, _, titles, bins) in totals.items():
+                group = self.groups[level].get(key, GroupTotals())
+                if (
+                    count > group.count
+                    or any(n > group.titles[t] for t, n in titles.items())
+                    or any(n > group.bins[b] for b, n in bins.items())
+                ):
+                    raise ValueError(f"cannot retract rows never added for {key}")
+
+    def _series(self, by, value, name: str) -> pd.Series:
+        level = _level(by)
+        groups = sorted(self.groups[level].items())
+        index = pd.MultiIndex.from_tuples(
+            [key for key, _ in groups], names=LEVELS[level]
+        )
+        if level == "state":
+            index = index.get_level_values(0)
+        return pd.Series([value(group) for _, group in groups], index=index, name=name)
+
+    def counts(self, by: str | Sequence[str] = "state") -> pd.Series:
+        """Number of listings per state or per (state, town)."""
+        return self._series(by, lambda group: group.count, "count")
+
+    def means(self, by: str | Sequence[str] = "state") -> pd.Series:
+        """Mean price per state or per (state, town)."""
+        return self._series(by, lambda group: group.mean, "mean")
+
+    def modes(self, by: str | Sequence[str] = "state") -> pd.Series:
+        """Most common title per state or per (state, town)."""
+        return self._series(by, lambda group: group.mode, "title")
+
+    def quantiles(
+        self, q: Sequence[float], by: str | Sequence[str] = "state"
+    ) -> pd.DataFrame:
+        """Approximate price quantiles per group, one column per ``q``."""
+        return pd.DataFrame(
+            {p: self._series(by, lambda group: group.quantile(p), p) for p in q}
+        )
@@ -0,0 +1,172 @@
+"""Command-line entry point: ``python -m nigeria_real_estate [ingest]``."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import sys
+from collections.abc import Sequence
+
+from nigeria_real_estate import instrument, plots
+from nigeria_real_estate.ingest import run_feeds
+from nigeria_real_estate.loader import DEFAULT_PATH
+from nigeria_real_estate.pipeline import (
+    MIN_STATE_ROWS,
+    run,
+    write_figures,
+    write_report,
+)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m nigeria_real_estate",
+        description="Run the Nigerian real estate EDA and write its report.",
+    )
+    parser.add_argument(
+        "--input",
+        default=str(DEFAULT_PATH),
+        help="listings CSV (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--states",
+        nargs="+",
+        metavar="STATE",
+        help=f"states to report on (default: those with {MIN_STATE_ROWS}+ listings)",
+    )
+    parser.add_argument(
+        "--outdir", default="report", help="output directory (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--no-plots", action="store_true", help="skip rendering the figures"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="processes for the state deep-dives; 0 for one per core "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="write the time and memory of each stage as a Chrome trace to FILE",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="log the time and memory of each stage to stderr",
+    )
+    parser.add_argument(
+        "--raw-labels",
+        action="store_true",
+        help="keep the state and town labels as written instead of canonicalising",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always parse the CSV instead of using its cached snapshot",
+    )
+    return parser
+
+
+def build_ingest_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m nigeria_real_estate ingest",
+        description="Ingest listing feeds into running aggregates until Ctrl-C.",
+    )
+    parser.add_argument("files", nargs="*", help="listings CSVs to ingest")
+    parser.add_argument(
+        "--watch", metavar="DIR", help="also ingest every CSV renamed into DIR"
+    )
+    parser.add_argument(
+        "--port", type=int, help="also accept CSV streams on this TCP port"
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="(default: %(default)s)")
+    parser.add_argument(
+        "--parsers",
+        type=int,
+        default=2,
+        help="threads parsing batches (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=5.0,
+        help="seconds between progress lines (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--raw-labels",
+        action="store_true",
+        help="keep the state and town labels as written instead of canonicalising",
+    )
+    return parser
+
+
+def ingest_main(argv: Sequence[str] | None = None) -> int:
+    args = build_ingest_parser().parse_args(argv)
+    feeds = run_feeds(
+        args.files,
+        watch=args.watch,
+        port=args.port,
+        host=args.host,
+        interval=args.interval,
+        parsers=args.parsers,
+        canonical_labels=not args.raw_labels,
+    )
+    try:
+        ingestor = asyncio.run(feeds)
+    except KeyboardInterrupt:
+        return 130
+    except (FileNotFoundError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    print(ingestor.stats)
+    print(ingestor.aggregates.means("state").to_string())
+    return 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv[:1] == ["ingest"]:
+        return ingest_main(argv[1:])
+    args = build_parser().parse_args(argv)
+    workers = args.workers or None
+    if args.verbose:
+        logging.basicConfig(format="%(name)s: %(message)s")
+        instrument.log_json()
+    tracer = instrument.enable() if args.trace or args.verbose else None
+
+    try:
+        result = run(
+            args.input,
+            states=args.states,
+            use_cache=not args.no_cache,
+            workers=workers,
+            canonical_labels=not args.raw_labels,
+        )
+    except (FileNotFoundError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    written = write_report(result, args.outdir)
+    if not args.no_plots:
+        plots.use_agg()
+        written += write_figures(result, args.outdir, workers=workers)
+
+    print(result.dedup)
+    print(
+        f"The average property price in Nigeria is {result.mean_price:,.2f} Naira; "
+        f"the most common property type is {result.most_common_title}."
+    )
+    for report in result.states.values():
+        print(
+            f"{report.state}: {report.outlier_free_rows} of {report.rows} listings "
+            f"within the IQR limits, average price {report.mean_price:,.2f} Naira, "
+            f"mostly {report.most_common_title}."
+        )
+    print(f"Wrote {len(written)} files to {args.outdir}")
+    if args.trace:
+        print(f"Wrote the stage trace to {tracer.write_chrome_trace(args.trace)}")
+    return 0
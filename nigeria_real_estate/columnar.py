@@ -0,0 +1,83 @@
+"""Listings stored one ``.npy`` file per column and opened with ``mmap``.
+
+``write_columns`` saves each column as a ``.npy`` array, with categorical
+and text columns saved as their integer codes and their categories listed
+in ``columns.json``.  ``open_columns`` maps the arrays read-only with
+``np.load(mmap_mode="r")`` and wraps them in a DataFrame without copying,
+so any number of processes opening the same store share one page-cache
+copy of the data instead of each parsing the CSV into private memory.
+Text columns that were not categorical are rebuilt from their codes, in
+memory, with their original dtype.
+
+The mapped arrays are read-only: pandas operations return new arrays as
+usual, but writing into the frame (``df.loc[i, "price"] = ...``) raises
+``ValueError``; take a ``df.copy()`` first.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+MANIFEST = "columns.json"
+
+
+def _file_name(position: int) -> str:
+    # Column names may not be valid file names, so files are numbered.
+    return f"{position:03d}.npy"
+
+
+def write_columns(df: pd.DataFrame, directory: str | os.PathLike) -> Path:
+    """Save ``df`` (without its index) as a column store at ``directory``.
+
+    The store is written next to ``directory`` and renamed into place, so
+    readers never see half of it; an existing store there is replaced.
+    """
+    directory = Path(directory)
+    partial = directory.with_name(directory.name + ".partial")
+    shutil.rmtree(partial, ignore_errors=True)
+    partial.mkdir(parents=True)
+
+    columns = []
+    for position, (name, series) in enumerate(df.items()):
+        entry = {"name": name, "file": _file_name(position)}
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            entry["categories"] = series.cat.categories.tolist()
+            values = series.array.codes
+        else:
+            values = series.to_numpy()
+            if values.dtype.hasobject:
+                # Object arrays are pickled by np.save and cannot be mapped.
+                values, uniques = pd.factorize(series)
+                entry["categories"] = uniques.tolist()
+                entry["dtype"] = str(series.dtype)
+        np.save(partial / entry["file"], np.ascontiguousarray(values))
+        columns.append(entry)
+    manifest = {"rows": len(df), "columns": columns}
+    (partial / MANIFEST).write_text(json.dumps(manifest, indent=2) + "\n")
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(partial, directory)
+    return directory
+
+
+def open_columns(directory: str | os.PathLike) -> pd.DataFrame:
+    """Zero-copy DataFrame over the memory-mapped column store at ``directory``."""
+    directory = Path(directory)
+    manifest = json.loads((directory / MANIFEST).read_text())
+    data, restore = {}, {}
+    for entry in manifest["columns"]:
+        values = np.load(directory / entry["file"], mmap_mode="r")
+        if "categories" in entry:
+            dtype = pd.CategoricalDtype(entry["categories"])
+            values = pd.Categorical.from_codes(values, dtype=dtype, validate=False)
+        if "dtype" in entry:
+            restore[entry["name"]] = entry["dtype"]
+        data[entry["name"]] = values
+    df = pd.DataFrame(data, index=pd.RangeIndex(manifest["rows"]), copy=False)
+    return df.astype(restore) if restore else df
@@ -0,0 +1,135 @@
+"""Pearson, Spearman, correlation ratio and Cramér's V from one set of codes.
+
+``correlations`` factorizes each categorical column once and ranks each
+numeric column once, then derives every association from those:
+
+* Pearson and Spearman (Pearson of the average ranks) between numeric
+  columns, pairwise-complete: each pair uses the rows where both are
+  present, with every pair's sums taken in a few matrix products;
+* the correlation ratio eta between each categorical and numeric column,
+  from per-category sums (``np.bincount`` over the codes);
+* Cramér's V between categorical columns, from their contingency tables
+  (``np.bincount`` over pairs of codes).
+
+Spearman ranks each column over all of its present values, which equals
+pandas' pairwise ranking whenever the columns have no missing values (as
+the schema columns do not).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from nigeria_real_estate.partition import partition
+from nigeria_real_estate.schema import CATEGORY_COLUMNS, NUMERIC_COLUMNS
+
+
+@dataclass
+class Correlations:
+    """Associations between the columns of one frame."""
+
+    pearson: pd.DataFrame
+    spearman: pd.DataFrame
+    # Categorical columns down, numeric columns across.
+    eta: pd.DataFrame
+    cramers_v: pd.DataFrame
+
+
+def _pairwise_pearson(x: np.ndarray) -> np.ndarray:
+    present = ~np.isnan(x)
+    m = present.astype(np.float64)
+    # Centring first keeps the sums of squares of ~1e12 prices accurate.
+    x = np.where(present, x - np.nanmean(x, axis=0), 0.0)
+    n = m.T @ m
+    sums = x.T @ m  # [i, j]: sum of column i over rows where j is present
+    squares = (x**2).T @ m
+    products = x.T @ x
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = products - sums * sums.T / n
+        var = squares - sums**2 / n
+        r = cov / np.sqrt(var * var.T)
+    return np.clip(r, -1.0, 1.0)
+
+
+def _ranks(x: np.ndarray) -> np.ndarray:
+    """Average ranks of each column, NaN where the value is missing."""
+    return pd.DataFrame(x).rank(method="average").to_numpy()
+
+
+def _eta(codes: np.ndarray, n_codes: int, x: np.ndarray) -> np.ndarray:
+    """Correlation ratio of one categorical against each numeric column."""
+    result = np.full(x.shape[1], np.nan)
+    for column in range(x.shape[1]):
+        keep = (codes >= 0) & ~np.isnan(x[:, column])
+        if not keep.any():
+            continue
+        values = x[keep, column]
+        group = codes[keep]
+        counts = np.bincount(group, minlength=n_codes)
+        if np.count_nonzero(counts) < 2:
+            continue
+        means = np.bincount(group, weights=values, minlength=n_codes)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(counts > 0, means / counts, 0.0)
+        total = ((values - values.mean()) ** 2).sum()
+        between = (counts * (means - values.mean()) ** 2).sum()
+        result[column] = np.sqrt(between / total) if total else np.nan
+    return result
+
+
+def _cramers_v(a: np.ndarray, n_a: int, b: np.ndarray, n_b: int) -> float:
+    keep = (a >= 0) & (b >= 0)
+    table = np.bincount(a[keep] * n_b + b[keep], minlength=n_a * n_b)
+    table = table.reshape(n_a, n_b).astype(np.float64)
+    table = table[table.sum(axis=1) > 0][:, table.sum(axis=0) > 0]
+    n = table.sum()
+    k = min(table.shape) - 1
+    if not n or k < 1:
+        return np.nan
+    expected = np.outer(table.sum(axis=1), table.sum(axis=0)) / n
+    chi2 = ((table - expected) ** 2 / expected).sum()
+    return float(np.sqrt(chi2 / n / k))
+
+
+def correlations(
+    df: pd.DataFrame,
+    numeric: Sequence[str] = NUMERIC_COLUMNS,
+    categorical: Sequence[str] = CATEGORY_COLUMNS,
+) -> Correlations:
+    """Every association between the ``numeric`` and ``categorical`` columns."""
+    numeric, categorical = list(numeric), list(categorical)
+    x = df[numeric].to_numpy(dtype=np.float64)
+    factorized = [pd.factorize(df[column]) for column in categorical]
+    codes = [(c, len(uniques)) for c, uniques in factorized]
+
+    pearson = _pairwise_pearson(x)
+    spearman = _pairwise_pearson(_ranks(x))
+    eta = np.array([_eta(c, n, x) for c, n in codes]).reshape(-1, len(numeric))
+    cramers_v = np.empty((len(categorical), len(categorical)))
+    for i, (a, n_a) in enumerate(codes):
+        for j in range(i, len(codes)):
+            b, n_b = codes[j]
+            cramers_v[i, j] = cramers_v[j, i] = _cramers_v(a, n_a, b, n_b)
+
+    return Correlations(
+        pearson=pd.DataFrame(pearson, index=numeric, columns=numeric),
+        spearman=pd.DataFrame(spearman, index=numeric, columns=numeric),
+        eta=pd.DataFrame(eta, index=categorical, columns=numeric),
+        cramers_v=pd.DataFrame(cramers_v, index=categorical, columns=categorical),
+    )
+
+
+def correlations_by(
+    df: pd.DataFrame,
+    by: str = "state",
+    groups: Iterable | None = None,
+    **kwargs,
+) -> dict:
+    """``{group: correlations(rows of group)}`` for each ``by`` value."""
+    parts = partition(df, by)
+    groups = list(parts) if groups is None else list(groups)
+    return {group: correlations(parts[group], **kwargs) for group in groups}
@@ -0,0 +1,206 @@
+"""Precomputed price aggregates over (state, town, title, bedrooms).
+
+``PriceCube`` groups the listings once into cells, one per combination of
+the four dimensions, holding the count, sum, sum of squares, min and max of
+the price plus the bucket counts of a ``QuantileSketch`` of the price.
+Every roll-up (each of the 16 ways of leaving dimensions unspecified) is
+then materialised into a dictionary, so a query such as "mean price of
+4-bed Detached Duplex in Lekki" is a single dictionary lookup instead of a
+pandas groupby.
+
+Quantiles are read from the rolled-up bucket counts through
+``QuantileSketch.from_buckets`` (with each roll-up's exact min and max), so
+they share the sketch's bound: within 1% of the exact value.  Only positive
+prices are counted in the buckets.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Hashable
+from itertools import combinations
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from nigeria_real_estate.schema import PRICE_COLUMN
+from nigeria_real_estate.sketch import QuantileSketch, bucket_keys
+
+DIMENSIONS = ("state", "town", "title", "bedrooms")
+
+
+class CellStats(NamedTuple):
+    """Price statistics of one cube cell or roll-up."""
+
+    count: int
+    sum: float
+    sumsq: float
+    min: float
+    max: float
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else np.nan
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation, like ``Series.std()``."""
+        if self.count < 2:
+            return np.nan
+        variance = (self.sumsq - self.sum * self.mean) / (self.count - 1)
+        return float(np.sqrt(max(variance, 0.0)))
+
+
+EMPTY = CellStats(0, 0.0, 0.0, np.nan, np.nan)
+ROLLUP = {"count": "sum", "sum": "sum", "sumsq": "sum", "min": "min", "max": "max"}
+
+
+class PriceCube:
+    """Price aggregates over every roll-up of the four dimensions."""
+
+    def __init__(self, cells: pd.DataFrame, histograms: pd.DataFrame):
+        # ``cells``: one row per (state, town, title, bedrooms) with count, sum,
+        # sumsq, min and max; ``histograms``: the same index plus a ``bin``
+        # level (a ``bucket_keys`` bucket), holding the number of prices in it.
+        self.cells = cells
+        self.histograms = histograms
+        self._stats: dict[tuple[str, ...], dict[Hashable, CellStats]] = {}
+        self._sketches: dict[tuple[str, ...], dict[Hashable, QuantileSketch]] = {}
+        for size in range(len(DIMENSIONS) + 1):
+            for level in combinations(DIMENSIONS, size):
+                self._stats[level] = self._rollup(level)
+
+    @classmethod
+    def build(cls, df: pd.DataFrame) -> PriceCube:
+        """Aggregate the listings in ``df`` into a cube."""
+        prices = df[PRICE_COLUMN].to_numpy(dtype=np.float64)
+        positive = np.isfinite(prices) & (prices > 0)
+        bins = np.zeros(len(prices), dtype=np.int64)
+        bins[positive] = bucket_keys(prices[positive])
+        frame = df[list(DIMENSIONS)].assign(
+            price=prices,
+            sq=prices**2,
+            bin=pd.arrays.IntegerArray(bins, ~positive),
+        )
+        grouped = frame.groupby(list(DIMENSIONS), observed=True, sort=True)
+        cells = pd.DataFrame(
+            {
+                "count": grouped["price"].size(),
+                "sum": grouped["price"].sum(),
+                "sumsq": grouped["sq"].sum(),
+                "min": grouped["price"].min(),
+                "max": grouped["price"].max(),
+            }
+        )
+        histograms = (
+            frame.groupby([*DIMENSIONS, "bin"], observed=True, sort=True)
+            .size()
+            .rename("count")
+        )
+        return cls(cells, histograms.to_frame())
+
+    def _rollup(self, level: tuple[str, ...]) -> dict[Hashable, CellStats]:
+        if not level:
+            totals = self.cells.agg(ROLLUP)
+            return {(): CellStats(int(totals["count"]), *totals.iloc[1:].tolist())}
+        rolled = self.cells.groupby(level=list(level), observed=True).agg(ROLLUP)
+        keys = rolled.index.tolist()
+        if len(level) == 1:
+            keys = [(key,) for key in keys]
+        values = zip(
+            rolled["count"].astype(int).tolist(),
+            rolled["sum"].tolist(),
+            rolled["sumsq"].tolist(),
+            rolled["min"].tolist(),
+            rolled["max"].tolist(),
+        )
+        return {key: CellStats(*row) for key, row in zip(keys, values)}
+
+    @staticmethod
+    def _key(filters: dict) -> tuple[tuple[str, ...], tuple]:
+        unknown = set(filters) - set(DIMENSIONS)
+        if unknown:
+            raise TypeError(f"unknown cube dimension(s): {', '.join(sorted(unknown))}")
+        level = tuple(d for d in DIMENSIONS if filters.get(d) is not None)
+        return level, tuple(filters[d] for d in level)
+
+    def stats(self, **filters) -> CellStats:
+        """Price statistics of the listings matching ``filters``.
+
+        Filters are any of ``state``, ``town``, ``title`` and ``bedrooms``;
+        omitted ones are rolled up.  An empty selection gives count 0.
+        """
+        level, key = self._key(filters)
+        return self._stats[level].get(key, EMPTY)
+
+    def mean(self, **filters) -> float:
+        return self.stats(**filters).mean
+
+    def count(self, **filters) -> int:
+        return self.stats(**filters).count
+
+    def quantile(self, q: float, **filters) -> float:
+        """Approximate price quantile of the listings matching ``filters``."""
+        level, key = self._key(filters)
+        if level not in self._sketches:
+            self._sketches[level] = self._level_sketches(level)
+        found = self._sketches[level].get(key)
+        return np.nan if found is None else found.quantile(q)
+
+    def _level_sketches(self, level: tuple[str, ...]) -> dict:
+        counts = self.histograms["count"]
+        rolled = counts.groupby(level=[*level, "bin"], observed=True).sum()
+        stats = self._stats[level]
+        if not level:
+            return {(): self._sketch(rolled.index.to_numpy(), rolled, stats[()])}
+        table = {}
+        keys = rolled.index.droplevel("bin")
+        codes, uniques = pd.factorize(keys)
+        bins = rolled.index.get_level_values("bin").to_numpy()
+        values = rolled.to_numpy()
+        # The roll-up is sorted by key then bin, so each key is one run.
+        starts = np.flatnonzero(np.diff(codes, prepend=-1))
+        ends = np.append(starts[1:], len(codes))
+        for code, start, end in zip(codes[starts], starts, ends):
+            key = uniques[code]
+            key = key if isinstance(key, tuple) else (key,)
+            table[key] = self._sketch(bins[start:end], values[start:end], stats[key])
+        return table
+
+    @staticmethod
+    def _sketch(bins, counts, stats: CellStats) -> QuantileSketch:
+        # The cell extremes are exact unless prices were left out of the buckets.
+        exact = stats.min > 0 and np.isfinite(stats.max)
+        return QuantileSketch.from_buckets(
+            bins,
+            counts,
+            low=stats.min if exact else None,
+            high=stats.max if exact else None,
+        )
+
+    def breakdown(self, by: str, **filters) -> pd.DataFrame:
+        """Count, mean, min and max price per value of ``by`` within ``filters``.
+
+        For example ``breakdown("town", state="Lagos")`` gives the town-level
+        averages, and its ``count`` column's ``idxmax()`` the mode.
+        """
+        if by not in DIMENSIONS:
+            raise TypeError(f"unknown cube dimension: {by}")
+        level, key = self._key({**filters, by: None})
+        level_with_by = tuple(d for d in DIMENSIONS if d in level or d == by)
+        position = level_with_by.index(by)
+        rows = {
+            k[position]: stats
+            for k, stats in self._stats[level_with_by].items()
+            if k[:position] + k[position + 1:] == key
+        }
+        table = pd.DataFrame.from_dict(
+            {
+                k: {"count": s.count, "mean": s.mean, "min": s.min, "max": s.max}
+                for k, s in rows.items()
+            },
+            orient="index",
+            columns=["count", "mean", "min", "max"],
+        )
+        table.index.name = by
+        return table.sort_index()
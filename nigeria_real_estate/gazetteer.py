@@ -0,0 +1,476 @@
+"""Canonical state and town names, looked up exactly or by trigram similarity.
+
+``Gazetteer`` indexes the 36 states and the Federal Capital Territory (by
+their ISO 3166-2 codes, ``NG-LA`` for Lagos) and the towns of the listings
+under the states they lie in.  A raw name is normalised (case, punctuation
+and spacing) and matched exactly against the names and aliases; failing
+that, the trigram index proposes the names sharing the most trigrams and
+the closest of them (by ``difflib`` similarity, which forgives the swapped
+letters of "Kastina") is taken if it reaches ``min_similarity``.
+Lookups are memoised, so ``canonicalise`` resolves each distinct
+(state, town) label pair once however many rows carry it.
+
+A town whose gazetteer states do not include the listing's state is moved
+to its state when it has only one and the listing's state label was not an
+exact match: the "Anambara" listings in Lekki or Ikoyi become Lagos
+listings, the one in Akure an Ondo listing.  Under an exactly matched state
+such a town is a ``"conflict"`` and keeps the listing's state, because the
+town list only holds the towns of the listings seen so far and a new feed's
+town may share its name with one elsewhere (Kaura in Kaduna, Egbe in Kogi).
+Towns that exist in several states (Karu, Egbeda, Isheri North) keep the
+listing's state too.  Unknown names are kept as they are.
+"""
+
+from __future__ import annotations
+
+import difflib
+import re
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# ISO 3166-2:NG codes.  The capital territory keeps the name the listings use.
+STATES = {
+    "AB": "Abia",
+    "AD": "Adamawa",
+    "AK": "Akwa Ibom",
+    "AN": "Anambra",
+    "BA": "Bauchi",
+    "BE": "Benue",
+    "BO": "Borno",
+    "BY": "Bayelsa",
+    "CR": "Cross River",
+    "DE": "Delta",
+    "EB": "Ebonyi",
+    "ED": "Edo",
+    "EK": "Ekiti",
+    "EN": "Enugu",
+    "FC": "Abuja",
+    "GO": "Gombe",
+    "IM": "Imo",
+    "JI": "Jigawa",
+    "KD": "Kaduna",
+    "KE": "Kebbi",
+    "KN": "Kano",
+    "KO": "Kogi",
+    "KT": "Katsina",
+    "KW": "Kwara",
+    "LA": "Lagos",
+    "NA": "Nasarawa",
+    "NI": "Niger",
+    "OG": "Ogun",
+    "ON": "Ondo",
+    "OS": "Osun",
+    "OY": "Oyo",
+    "PL": "Plateau",
+    "RI": "Rivers",
+    "SO": "Sokoto",
+    "TA": "Taraba",
+    "YO": "Yobe",
+    "ZA": "Zamfara",
+}
+STATE_ALIASES = {
+    "FC": ["FCT", "Federal Capital Territory", "Abuja FCT"],
+    "NA": ["Nassarawa"],
+}
+
+# Towns (districts, LGAs and neighbourhoods) of the listings, by state.
+TOWNS = {
+    "AB": ["Aba", "Umuahia"],
+    "AK": ["Eket", "Ikot Ekpene", "Uyo"],
+    "BO": ["Guzamala"],
+    "BY": ["Yenagoa"],
+    "CR": ["Calabar"],
+    "DE": [
+        "Abraka",
+        "Aniocha South",
+        "Asaba",
+        "Ethiope West",
+        "Okpe",
+        "Udu",
+        "Ughelli North",
+        "Ughelli South",
+        "Uvwie",
+        "Warri",
+    ],
+    "ED": ["Egor", "Ikpoba Okha", "Oredo", "Ovia North-East", "Uhunmwonde"],
+    "EK": ["Ado-Ekiti"],
+    "EN": ["Enugu"],
+    "FC": [
+        "Apo",
+        "Asokoro District",
+        "Bwari",
+        "Central Business District",
+        "Dakibiyu",
+        "Dakwo",
+        "Dape",
+        "Dei-Dei",
+        "Diplomatic Zones",
+        "Duboyi",
+        "Durumi",
+        "Dutse",
+        "Gaduwa",
+        "Galadimawa",
+        "Garki",
+        "Gudu",
+        "Guzape District",
+        "Gwagwalada",
+        "Gwarinpa",
+        "Idu Industrial",
+        "Jabi",
+        "Jahi",
+        "Jikwoyi",
+        "Kabusa",
+        "Kado",
+        "Kafe",
+        "Kagini",
+        "Karmo",
+        "Karsana",
+        "Karshi",
+        "Karu",
+        "Katampe",
+        "Kaura",
+        "Kubwa",
+        "Kuje",
+        "Kukwaba",
+        "Kurudu",
+        "Kyami",
+        "Life Camp",
+        "Lokogoma District",
+        "Lugbe District",
+        "Mabushi",
+        "Maitama District",
+        "Mararaba",
+        "Mbora (Nbora)",
+        "Mpape",
+        "Nyanya",
+        "Orozo",
+        "Utako",
+        "Wumba",
+        "Wuse",
+        "Wuse 2",
+        "Wuye",
+    ],
+    "IM": ["Ohaji/Egbema", "Owerri Municipal", "Owerri North", "Owerri West"],
+    "KD": ["Chikun", "Kaduna North", "Kaduna South"],
+    "KN": ["Kano", "Nassarawa"],
+    "KO": ["Dekina", "Lokoja", "Okene"],
+    "KT": ["Danja", "Kusada"],
+    "KW": ["Ilorin East", "Ilorin South", "Ilorin West"],
+    "LA": [
+        "Agbara-Igbesa",
+        "Agege",
+        "Ajah",
+        "Alimosho",
+        "Amuwo Odofin",
+        "Apapa",
+        "Ayobo",
+        "Badagry",
+        "Egbe",
+        "Egbeda",
+        "Ejigbo",
+        "Eko Atlantic City",
+        "Epe",
+        "Gbagada",
+        "Ibeju",
+        "Ibeju Lekki",
+        "Idimu",
+        "Ifako-Ijaiye",
+        "Ijaiye",
+        "Ijede",
+        "Ijesha",
+        "Ikeja",
+        "Ikorodu",
+        "Ikotun",
+        "Ikoyi",
+        "Ilupeju",
+        "Imota",
+        "Ipaja",
+        "Isheri",
+        "Isheri North",
+        "Isolo",
+        "Ketu",
+        "Kosofe",
+        "Lagos Island",
+        "Lekki",
+        "Magodo",
+        "Maryland",
+        "Mushin",
+        "Ogudu",
+        "Ojo",
+        "Ojodu",
+        "Ojota",
+        "Oke-Odo",
+        "Orile",
+        "Oshodi",
+        "Shomolu",
+        "Surulere",
+        "Victoria Island (VI)",
+        "Yaba",
+    ],
+    "NA": ["Karu", "Keffi", "Mararaba", "Nasarawa"],
+    "NI": ["Paikoro"],
+    "OG": [
+        "Abeokuta North",
+        "Abeokuta South",
+        "Ado-Odo/Ota",
+        "Agbara",
+        "Arepo",
+        "Ewekoro",
+        "Ibafo",
+        "Ifo",
+        "Ijebu Ode",
+        "Ijoko",
+        "Isheri North",
+        "KM 46",
+        "Magboro",
+        "Mowe Ofada",
+        "Mowe Town",
+        "Obafemi Owode",
+        "Ogijo",
+        "Oke-Aro",
+        "Sagamu",
+        "Sango Ota",
+        "Simawa",
+        "Yewa South",
+    ],
+    "ON": ["Akure"],
+    "OS": ["Ede South", "Osogbo"],
+    "OY": [
+        "Afijio",
+        "Akinyele",
+        "Egbeda",
+        "Ibadan",
+        "Ibadan North",
+        "Ibadan North-East",
+        "Ibadan North-West",
+        "Ibadan South-West",
+        "Ibarapa North",
+        "Ido",
+        "Oluyole",
+        "Oyo West",
+    ],
+    "PL": ["Jos North", "Jos South"],
+    "RI": ["Eleme", "Ikwerre", "Obio-Akpor", "Oyigbo", "Port Harcourt"],
+}
+TOWN_ALIASES = {
+    "Lekki": ["Lekki Phase 1", "Lekki Phase I"],
+    "Victoria Island (VI)": ["VI"],
+    "Wuse 2": ["Wuse II", "Wuse Zone 2"],
+}
+
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+_STATE_SUFFIX = re.compile(r" state$")
+# Names sharing the most trigrams that are compared in full.
+CANDIDATES = 10
+
+
+def normalise(name: str) -> str:
+    """Lower case, ``&`` as ``and``, punctuation and runs of spaces as one space."""
+    return _NON_WORD.sub(" ", str(name).casefold().replace("&", " and ")).strip()
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _slug(name: str) -> str:
+    return normalise(name).replace(" ", "-")
+
+
+class NameIndex:
+    """Exact and trigram lookup of names that resolve to keys."""
+
+    def __init__(self, names: Iterable[tuple[str, object]], min_similarity: float):
+        self.min_similarity = min_similarity
+        self.exact: dict[str, set] = defaultdict(set)
+        self.names: set[str] = set()
+        self.postings: dict[str, set[str]] = defaultdict(set)
+        for name, key in names:
+            text = normalise(name)
+            self.exact[text].add(key)
+            if text not in self.names:
+                self.names.add(text)
+                for gram in _trigrams(text):
+                    self.postings[gram].add(text)
+        self._cache: dict[str, tuple[frozenset, str]] = {}
+
+    def lookup(self, name: str) -> tuple[frozenset, str]:
+        """``(keys, how)``; ``how`` is ``"exact"``, ``"fuzzy"`` or ``"unknown"``."""
+        text = normalise(name)
+        found = self._cache.get(text)
+        if found is None:
+            found = self._cache[text] = self._lookup(text)
+        return found
+
+    def _lookup(self, text: str) -> tuple[frozenset, str]:
+        if text in self.exact:
+            return frozenset(self.exact[text]), "exact"
+        shared = Counter(
+            candidate
+            for gram in _trigrams(text)
+            for candidate in self.postings.get(gram, ())
+        )
+        best, score = None, 0.0
+        for candidate, _ in shared.most_common(CANDIDATES):
+            ratio = difflib.SequenceMatcher(None, text, candidate).ratio()
+            if ratio > score:
+                best, score = candidate, ratio
+        if best is None or score < self.min_similarity:
+            return frozenset(), "unknown"
+        return frozenset(self.exact[best]), "fuzzy"
+
+
+@dataclass(frozen=True)
+class Town:
+    id: str
+    name: str
+    state: str  # state code
+
+
+class Gazetteer:
+    """Index of canonical states and towns.
+
+    ``states`` maps state codes to names and ``towns`` state codes to town
+    names; aliases map a canonical name to other spellings of it.
+    """
+
+    def __init__(
+        self,
+        states: Mapping[str, str] = STATES,
+        towns: Mapping[str, Iterable[str]] = TOWNS,
+        state_aliases: Mapping[str, Iterable[str]] = STATE_ALIASES,
+        town_aliases: Mapping[str, Iterable[str]] = TOWN_ALIASES,
+        min_similarity: float = 0.85,
+    ):
+        self.states = dict(states)
+        self.towns = {
+            f"NG-{code}/{_slug(name)}": Town(f"NG-{code}/{_slug(name)}", name, code)
+            for code, names in towns.items()
+            for name in names
+        }
+        state_names = [(name, code) for code, name in self.states.items()]
+        state_names += [(code, code) for code in self.states]
+        state_names += [
+            (alias, code)
+            for code, aliases in state_aliases.items()
+            for alias in aliases
+        ]
+        self.state_index = NameIndex(state_names, min_similarity)
+
+        town_names = [(town.name, town.id) for town in self.towns.values()]
+        by_name = defaultdict(list)
+        for town in self.towns.values():
+            by_name[town.name].append(town.id)
+        for name, aliases in town_aliases.items():
+            town_names += [(alias, i) for alias in aliases for i in by_name[name]]
+        # "Mbora (Nbora)" is also written "Mbora" or "Nbora".
+        for town in self.towns.values():
+            for part in re.findall(r"[^()]+", town.name):
+                if part.strip() != town.name:
+                    town_names.append((part.strip(), town.id))
+        self.town_index = NameIndex(town_names, min_similarity)
+
+    def state(self, name: str) -> tuple[str | None, str]:
+        """``(state code, how)`` of a raw state label; code None if unknown."""
+        codes, how = self.state_index.lookup(_STATE_SUFFIX.sub("", normalise(name)))
+        if len(codes) != 1:
+            return None, "unknown"
+        return next(iter(codes)), how
+
+    def town(
+        self, name: str, state: str | None = None, move: bool = True
+    ) -> tuple[Town | None, str]:
+        """The town a raw town label (listed under state code ``state``) names.
+
+        ``how`` is ``"exact"`` or ``"fuzzy"`` for a town in ``state``,
+        ``"moved"`` for the only town of that name, which lies elsewhere,
+        ``"conflict"`` for such a town when ``move`` is false,
+        ``"ambiguous"`` when several states have it and ``"unknown"``.
+        """
+        ids, how = self.town_index.lookup(name)
+        if not ids:
+            return None, "unknown"
+        towns = [self.towns[i] for i in sorted(ids)]
+        for town in towns:
+            if town.state == state:
+                return town, how
+        if len({town.state for town in towns}) > 1:
+            return None, "ambiguous"
+        return (towns[0], "moved") if move else (None, "conflict")
+
+    def resolve(self, state: str, town: str) -> dict:
+        """Canonical names and ids of one raw (state, town) label pair.
+
+        Only a listing whose state label is not an exact match can be moved
+        to the state of its town.
+        """
+        code, state_how = self.state(state)
+        found, town_how = self.town(town, code, move=state_how != "exact")
+        if found is not None:
+            code = found.state
+        return {
+            "state_id": f"NG-{code}" if code else None,
+            "state": self.states[code] if code else state,
+            "town_id": found.id if found else None,
+            "town": found.name if found else town,
+            "state_match": state_how,
+            "town_match": town_how,
+        }
+
+
+_DEFAULT: Gazetteer | None = None
+
+
+def default_gazetteer() -> Gazetteer:
+    global _DEFAULT
+    if _DEFAULT is None:
+        _DEFAULT = Gazetteer()
+    return _DEFAULT
+
+
+def canonicalise(
+    df: pd.DataFrame, gazetteer: Gazetteer | None = None
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """``df`` with canonical ``state`` and ``town`` labels, and the mapping used.
+
+    The mapping has one row per distinct raw (state, town) pair with its
+    canonical names, ids, how each was matched and how many rows carry it.
+    Only the distinct pairs are looked up; the rows are relabelled through
+    their codes.
+    """
+    gazetteer = default_gazetteer() if gazetteer is None else gazetteer
+    states, towns = df["state"], df["town"]
+    state_codes, state_labels = pd.factorize(states)
+    town_codes, town_labels = pd.factorize(towns)
+    # Shifted by one so that missing labels (-1) get pair codes too.
+    width = len(town_labels) + 1
+    pairs = (state_codes.astype(np.int64) + 1) * width + town_codes + 1
+    # Dense codes of the pairs that occur: tables indexed by every possible
+    # pair would grow with distinct states times distinct towns.
+    pair_codes, present = pd.factorize(pairs, sort=True)
+    counts = np.bincount(pair_codes, minlength=len(present))
+
+    rows = []
+    for pair, count in zip(present, counts):
+        s, t = divmod(int(pair), width)
+        raw_state = state_labels[s - 1] if s else None
+        raw_town = town_labels[t - 1] if t else None
+        if raw_state is None or raw_town is None:
+            resolved = {"state": raw_state, "town": raw_town}
+        else:
+            resolved = gazetteer.resolve(raw_state, raw_town)
+        rows.append({"raw_state": raw_state, "raw_town": raw_town, **resolved})
+        rows[-1]["rows"] = int(count)
+    mapping = pd.DataFrame(rows)
+
+    relabelled = {}
+    for column in ("state", "town"):
+        codes, names = pd.factorize(mapping[column], sort=True)
+        dtype = pd.CategoricalDtype(names)
+        relabelled[column] = pd.Categorical.from_codes(codes[pair_codes], dtype=dtype)
+    return df.assign(**relabelled), mapping
@@ -0,0 +1,202 @@
+"""Histograms of the numeric columns, binned once and drawn from the counts.
+
+``Histograms.from_frame`` bins every numeric column of every group in one
+``np.searchsorted`` and one ``np.bincount`` per column, against bin edges
+fixed in advance: unit-width bins for the room counts and the log-spaced
+price bins of ``nigeria_real_estate.streaming`` (100 per decade from 1e3 to
+1e14 naira).  Because the edges do not depend on the data, histograms of
+different chunks or states add up with ``merge``, and ``plot`` can redraw
+any group, several groups side by side, or a zoomed range from the stored
+counts without the rows.  Values outside the edges are counted in the end
+bins.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Hashable, Sequence
+from typing import TYPE_CHECKING, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from nigeria_real_estate.schema import COUNT_COLUMNS, NUMERIC_COLUMNS, PRICE_COLUMN
+from nigeria_real_estate.stats import group_codes
+from nigeria_real_estate.streaming import BINS_PER_DECADE, PRICE_EDGES
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+
+
+class Binning(NamedTuple):
+    """Bin edges of one column and how ``plot`` draws them."""
+
+    edges: np.ndarray
+    log: bool = False
+    # Adjacent bins merged into one bar when drawing.
+    display_factor: int = 1
+
+    @property
+    def n_bins(self) -> int:
+        return len(self.edges) - 1
+
+    def bins(self, values: np.ndarray) -> np.ndarray:
+        """Bin number of each value, clamped into the first and last bins."""
+        bins = np.searchsorted(self.edges, values, side="right") - 1
+        return np.clip(bins, 0, self.n_bins - 1)
+
+
+def linear_binning(low: float, high: float, bins: int) -> Binning:
+    return Binning(np.linspace(low, high, bins + 1))
+
+
+def log_binning(low: float, high: float, per_decade: int = 10) -> Binning:
+    """Bins of equal width in ``log10`` between the powers of ten given."""
+    decades = np.log10(high) - np.log10(low)
+    edges = np.logspace(np.log10(low), np.log10(high), round(decades * per_decade) + 1)
+    return Binning(edges, log=True)
+
+
+# One bin per room count from 0 to 49; price drawn at 10 bins per decade.
+COUNT_BINNING = Binning(np.arange(51) - 0.5)
+PRICE_BINNING = Binning(PRICE_EDGES, log=True, display_factor=BINS_PER_DECADE // 10)
+DEFAULT_BINNINGS = {
+    **{column: COUNT_BINNING for column in COUNT_COLUMNS},
+    PRICE_COLUMN: PRICE_BINNING,
+}
+
+
+class Histograms:
+    """Counts per group and bin of each column.
+
+    ``counts[column]`` has one row per group and one column per bin number;
+    ``binnings[column]`` holds the edges those numbers refer to.
+    """
+
+    def __init__(self, counts: dict[str, pd.DataFrame], binnings: dict[str, Binning]):
+        self.counts = counts
+        self.binnings = binnings
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        by: str | Sequence[str] | None = None,
+        columns: Sequence[str] = NUMERIC_COLUMNS,
+        binnings: dict[str, Binning] | None = None,
+    ) -> Histograms:
+        """Bin ``columns`` of ``df`` per ``by`` group (one ``"all"`` group if None)."""
+        binnings = {**DEFAULT_BINNINGS, **(binnings or {})}
+        if by is None:
+            codes, index = np.zeros(len(df), dtype=np.intp), pd.Index(["all"])
+        else:
+            codes, index = group_codes(df, by)
+
+        counts = {}
+        for column in columns:
+            binning = binnings[column]
+            values = df[column].to_numpy(dtype=np.float64)
+            keep = (codes >= 0) & ~np.isnan(values)
+            flat = np.bincount(
+                codes[keep] * binning.n_bins + binning.bins(values[keep]),
+                minlength=len(index) * binning.n_bins,
+            )
+            counts[column] = pd.DataFrame(
+                flat.reshape(len(index), binning.n_bins), index=index
+            )
+        return cls(counts, {column: binnings[column] for column in columns})
+
+    def merge(self, other: Histograms) -> Histograms:
+        """Histograms of the rows of both ``self`` and ``other``."""
+        counts = dict(self.counts)
+        binnings = dict(self.binnings)
+        for column, table in other.counts.items():
+            if column not in counts:
+                counts[column] = table
+                binnings[column] = other.binnings[column]
+                continue
+            if not np.array_equal(binnings[column].edges, other.binnings[column].edges):
+                raise ValueError(f"histograms of {column!r} have different bins")
+            counts[column] = counts[column].add(table, fill_value=0).astype(np.int64)
+        return Histograms(counts, binnings)
+
+    def histogram(
+        self, column: str, group: Hashable | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """``(counts, edges)`` of ``column`` in ``group`` (all groups if None).
+
+        The result has the layout ``np.histogram`` returns.
+        """
+        table = self.counts[column]
+        if group is None:
+            counts = table.to_numpy().sum(axis=0)
+        else:
+            counts = table.loc[group].to_numpy()
+        return counts, self.binnings[column].edges
+
+    def plot(
+        self,
+        groups: Hashable | list[Hashable] | None = None,
+        title: str | None = None,
+        columns: Sequence[str] | None = None,
+        limits: dict[str, tuple[float, float]] | None = None,
+    ) -> plt.Figure:
+        """One panel per column, laid out like ``df.hist(figsize=(16, 16))``.
+
+        ``groups`` is one group or ``None`` for all rows; a list of groups
+        overlays their outlines for comparison.  ``limits`` zooms columns to
+        ``(low, high)``; otherwise each panel spans its non-empty bins.
+        """
+        import matplotlib.pyplot as plt
+
+        columns = list(self.counts) if columns is None else list(columns)
+        limits = limits or {}
+        rows = int(np.ceil(np.sqrt(len(columns))))
+        cols = int(np.ceil(len(columns) / rows))
+        fig, axes = plt.subplots(rows, cols, figsize=(16, 16), squeeze=False)
+        compared = groups if isinstance(groups, list) else [groups]
+
+        for ax, column in zip(axes.flat, columns):
+            binning = self.binnings[column]
+            series = [self.histogram(column, group)[0] for group in compared]
+            factor = binning.display_factor
+            edges = binning.edges[::factor]
+            if (len(binning.edges) - 1) % factor:
+                edges = np.append(edges, binning.edges[-1])
+            series = [
+                np.add.reduceat(counts, np.arange(0, len(counts), factor))
+                for counts in series
+            ]
+            low, high = _extent(edges, np.sum(series, axis=0), limits.get(column))
+            for group, counts in zip(compared, series):
+                ax.stairs(
+                    counts[low:high],
+                    edges[low:high + 1],
+                    fill=len(compared) == 1,
+                    label=None if group is None else str(group),
+                )
+            if binning.log:
+                ax.set_xscale("log")
+            ax.set_title(column)
+            ax.grid(True)
+            ax.tick_params(axis="x", labelrotation=90)
+            if len(compared) > 1:
+                ax.legend()
+        for ax in axes.flat[len(columns):]:
+            ax.set_visible(False)
+        if title:
+            fig.suptitle(title)
+        return fig
+
+
+def _extent(
+    edges: np.ndarray, counts: np.ndarray, limits: tuple[float, float] | None
+) -> tuple[int, int]:
+    """First and one-past-last bin to draw."""
+    if limits is not None:
+        low = int(np.searchsorted(edges, limits[0], side="right")) - 1
+        high = int(np.searchsorted(edges, limits[1], side="left"))
+        return max(low, 0), min(high, len(counts))
+    filled = np.flatnonzero(counts)
+    if not len(filled):
+        return 0, 0
+    return int(filled[0]), int(filled[-1]) + 1
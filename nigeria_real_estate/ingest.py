@@ -0,0 +1,392 @@
+"""Asynchronous ingestion of listing batches from several feeds at once.
+
+Sources (CSV files, TCP connections, a watched directory) produce
+``RawBatch``es of CSV text.  ``Ingestor`` passes them through two bounded
+``asyncio.Queue``s:
+
+    sources -> raw queue -> parsers (threads) -> parsed queue -> sink
+
+The parsers check each batch against the schema, drop the rows that do not
+fit it and canonicalise the state and town labels; the single sink drops
+duplicates against a ``SeenSet`` (or ``SeenStore``) and adds the new rows
+to an ``IncrementalAggregates``.  When the parsers or the sink fall behind,
+the queues fill and ``submit`` waits, so a fast source is slowed to the
+pace of the pipeline instead of buffering without bound; a TCP peer is
+then held back by TCP flow control.
+
+Parsing, deduplication and aggregation run in worker threads, leaving the
+event loop free.  The sink holds the aggregates' lock only while adding
+one batch, and ``query`` runs analysis functions under the same lock, so
+queries see whole batches and wait for at most one.
+
+    python -m nigeria_real_estate ingest feed-a.csv feed-b.csv --watch incoming/
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+import os
+import threading
+from collections import Counter
+from collections.abc import AsyncIterator, Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import numpy as np
+import pandas as pd
+
+from nigeria_real_estate.aggregates import IncrementalAggregates
+from nigeria_real_estate.dedup import SeenSet, SeenStore, dedup_batch
+from nigeria_real_estate.gazetteer import canonicalise
+from nigeria_real_estate.loader import coerce_dtypes
+from nigeria_real_estate.schema import (
+    CATEGORY_COLUMNS,
+    COLUMNS,
+    COUNT_COLUMNS,
+    NUMERIC_COLUMNS,
+    PRICE_COLUMN,
+)
+
+logger = logging.getLogger(__name__)
+
+ROWS_PER_BATCH = 50_000
+_STOP = object()
+
+
+@dataclass
+class RawBatch:
+    """CSV text (header line included) from one source."""
+
+    source: str
+    data: bytes
+
+
+@dataclass
+class IngestStats:
+    """Running totals of an ``Ingestor``."""
+
+    batches: int = 0
+    rows_in: int = 0
+    rejected: int = 0
+    duplicates: int = 0
+    rows_added: int = 0
+    failed_batches: int = 0
+    rows_by_source: Counter = field(default_factory=Counter)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.batches} batches, {self.rows_in} rows: {self.rejected} rejected, "
+            f"{self.duplicates} duplicates, {self.rows_added} added"
+        )
+
+
+def parse_batch(data: bytes) -> tuple[pd.DataFrame, int]:
+    """Parse CSV text into the schema dtypes; returns ``(rows, rejected)``.
+
+    Rows with a missing or non-numeric value, a negative count, a count
+    that does not fit in int8 or a non-positive price are rejected.  A
+    batch without the schema's columns raises ``ValueError``.
+    """
+    raw = pd.read_csv(
+        io.BytesIO(data),
+        usecols=lambda column: column in COLUMNS,
+        dtype={column: "category" for column in CATEGORY_COLUMNS},
+    )
+    missing = [column for column in COLUMNS if column not in raw.columns]
+    if missing:
+        raise ValueError(f"batch lacks column(s): {', '.join(missing)}")
+    # The parser types clean numeric columns itself; only a column holding
+    # some text needs converting, with the text becoming NaN.
+    numbers = {
+        column: (
+            raw[column]
+            if pd.api.types.is_numeric_dtype(raw[column])
+            else pd.to_numeric(raw[column], errors="coerce")
+        )
+        for column in NUMERIC_COLUMNS
+    }
+    counts = pd.DataFrame({column: numbers[column] for column in COUNT_COLUMNS})
+    keep = (
+        ((counts >= 0) & (counts <= np.iinfo(np.int8).max) & (counts % 1 == 0)).all(
+            axis=1
+        )
+        & (numbers[PRICE_COLUMN] > 0)
+        & raw[CATEGORY_COLUMNS].notna().all(axis=1)
+    ).to_numpy()
+    frame = raw[CATEGORY_COLUMNS].assign(**numbers)[keep]
+    return coerce_dtypes(frame.reset_index(drop=True)), int(len(raw) - keep.sum())
+
+
+def _read_lines(handle: BinaryIO, rows: int) -> list[bytes]:
+    return list(islice(handle, rows))
+
+
+async def file_source(
+    path: str | os.PathLike, rows_per_batch: int = ROWS_PER_BATCH
+) -> AsyncIterator[RawBatch]:
+    """Batches of ``rows_per_batch`` rows of the CSV at ``path``.
+
+    The file is opened, read and closed in worker threads, one batch at a
+    time, so a slow disk never stalls the event loop and a large file is
+    never read ahead of what the pipeline has accepted.
+    """
+    path = Path(path)
+    handle = await asyncio.to_thread(open, path, "rb")
+    try:
+        header = await asyncio.to_thread(handle.readline)
+        while lines := await asyncio.to_thread(_read_lines, handle, rows_per_batch):
+            yield RawBatch(str(path), header + b"".join(lines))
+    finally:
+        await asyncio.to_thread(handle.close)
+
+
+async def stream_source(
+    reader: asyncio.StreamReader, name: str, rows_per_batch: int = ROWS_PER_BATCH
+) -> AsyncIterator[RawBatch]:
+    """Batches of the CSV text read from ``reader`` (header line first)."""
+    header = await reader.readline()
+    lines: list[bytes] = []
+    while line := await reader.readline():
+        lines.append(line if line.endswith(b"\n") else line + b"\n")
+        if len(lines) == rows_per_batch:
+            yield RawBatch(name, header + b"".join(lines))
+            lines = []
+    if lines:
+        yield RawBatch(name, header + b"".join(lines))
+
+
+async def watch_directory(
+    directory: str | os.PathLike,
+    pattern: str = "*.csv",
+    interval: float = 1.0,
+    stop: asyncio.Event | None = None,
+    rows_per_batch: int = ROWS_PER_BATCH,
+) -> AsyncIterator[RawBatch]:
+    """Batches of every file matching ``pattern`` that appears in ``directory``.
+
+    The directory is polled every ``interval`` seconds until ``stop`` is
+    set; files present at the start are read too.  Writers should create
+    each file elsewhere and rename it into the directory, so that no file
+    is read half-written.
+    """
+    directory = Path(directory)
+    stop = stop or asyncio.Event()
+    seen: set[Path] = set()
+    while not stop.is_set():
+        for path in await asyncio.to_thread(sorted, directory.glob(pattern)):
+            if path not in seen:
+                seen.add(path)
+                async for batch in file_source(path, rows_per_batch):
+                    yield batch
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except TimeoutError:
+            pass
+
+
+class Ingestor:
+    """Bounded, backpressured pipeline from raw batches to the aggregates.
+
+    Use it as an async context manager: entering starts the parser and sink
+    tasks; leaving waits until every submitted batch has been added.  If a
+    parser or the sink fails, the other tasks are cancelled and the error is
+    raised from ``submit`` and from leaving the context, so a broken
+    pipeline never leaves a source waiting on a full queue.
+    """
+
+    def __init__(
+        self,
+        aggregates: IncrementalAggregates | None = None,
+        seen: SeenSet | SeenStore | None = None,
+        queue_size: int = 8,
+        parsers: int = 2,
+        canonical_labels: bool = True,
+    ):
+        self.aggregates = IncrementalAggregates() if aggregates is None else aggregates
+        self.seen = SeenSet() if seen is None else seen
+        self.stats = IngestStats()
+        self.canonical_labels = canonical_labels
+        self.lock = threading.Lock()
+        self._raw: asyncio.Queue = asyncio.Queue(queue_size)
+        self._parsed: asyncio.Queue = asyncio.Queue(queue_size)
+        self._parsers = parsers
+        self._tasks: list[asyncio.Task] = []
+
+    async def __aenter__(self) -> Ingestor:
+        # Resolved with the first worker's exception.
+        self._failure = asyncio.get_running_loop().create_future()
+        self._tasks = [
+            asyncio.create_task(self._parse_worker()) for _ in range(self._parsers)
+        ]
+        self._sink_task = asyncio.create_task(self._sink())
+        for task in [*self._tasks, self._sink_task]:
+            task.add_done_callback(self._on_done)
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback) -> None:
+        try:
+            if exc_type is None:
+                for _ in self._tasks:
+                    await self._guard(self._raw.put(_STOP))
+                await self._guard(asyncio.gather(*self._tasks))
+                await self._guard(self._parsed.put(_STOP))
+                await self._guard(self._sink_task)
+        finally:
+            workers = [*self._tasks, self._sink_task]
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            if self._failure.done() and exc_type is not None:
+                self._failure.exception()  # reported by the caller's error
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        if task.cancelled() or task.exception() is None:
+            return
+        if not self._failure.done():
+            self._failure.set_exception(task.exception())
+        for other in [*self._tasks, self._sink_task]:
+            other.cancel()
+
+    async def _guard(self, awaitable) -> Any:
+        """Await ``awaitable``, or raise a worker's error as soon as one fails."""
+        waiter = asyncio.ensure_future(awaitable)
+        await asyncio.wait([waiter, self._failure], return_when=asyncio.FIRST_COMPLETED)
+        if self._failure.done():
+            if waiter.done() and not waiter.cancelled():
+                waiter.exception()  # superseded by the worker's error
+            waiter.cancel()
+            raise self._failure.exception()
+        return waiter.result()
+
+    async def submit(self, batch: RawBatch) -> None:
+        """Queue a batch; waits while the pipeline is full."""
+        await self._guard(self._raw.put(batch))
+
+    async def feed(self, source: AsyncIterator[RawBatch]) -> None:
+        """Submit every batch of ``source``."""
+        async for batch in source:
+            await self.submit(batch)
+
+    async def feed_all(self, sources: Iterable[AsyncIterator[RawBatch]]) -> None:
+        """Feed ``sources`` concurrently; the first error cancels the rest."""
+        feeds = [asyncio.ensure_future(self.feed(source)) for source in sources]
+        try:
+            await asyncio.gather(*feeds)
+        finally:
+            for feed in feeds:
+                feed.cancel()
+            await asyncio.gather(*feeds, return_exceptions=True)
+
+    async def serve(
+        self, host: str = "127.0.0.1", port: int = 0, **kwargs
+    ) -> asyncio.Server:
+        """Accept CSV streams over TCP, one ``stream_source`` per connection."""
+
+        async def handle(reader, writer):
+            peer = writer.get_extra_info("peername")
+            try:
+                await self.feed(stream_source(reader, f"tcp:{peer}", **kwargs))
+            finally:
+                writer.close()
+
+        return await asyncio.start_server(handle, host, port)
+
+    def _parse(self, batch: RawBatch) -> tuple[pd.DataFrame, int]:
+        rows, rejected = parse_batch(batch.data)
+        if self.canonical_labels and len(rows):
+            rows, _ = canonicalise(rows)
+        return rows, rejected
+
+    async def _parse_worker(self) -> None:
+        while (batch := await self._raw.get()) is not _STOP:
+            try:
+                rows, rejected = await asyncio.to_thread(self._parse, batch)
+            except (ValueError, pd.errors.ParserError) as exc:
+                logger.warning("dropped a batch from %s: %s", batch.source, exc)
+                self.stats.failed_batches += 1
+                continue
+            await self._parsed.put((batch.source, rows, rejected))
+
+    def _add(self, rows: pd.DataFrame) -> tuple[pd.DataFrame, int]:
+        with self.lock:
+            new, report = dedup_batch(rows, self.seen)
+            self.aggregates.add(new)
+        return new, report.duplicates
+
+    async def _sink(self) -> None:
+        while (item := await self._parsed.get()) is not _STOP:
+            source, rows, rejected = item
+            new, duplicates = await asyncio.to_thread(self._add, rows)
+            stats = self.stats
+            stats.batches += 1
+            stats.rows_in += len(rows) + rejected
+            stats.rejected += rejected
+            stats.duplicates += duplicates
+            stats.rows_added += len(new)
+            stats.rows_by_source[source] += len(rows) + rejected
+
+    async def query(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """``func(aggregates, *args, **kwargs)`` between batches, off the loop."""
+
+        def locked():
+            with self.lock:
+                return func(self.aggregates, *args, **kwargs)
+
+        return await asyncio.to_thread(locked)
+
+
+async def ingest(
+    sources: Iterable[AsyncIterator[RawBatch]], **kwargs
+) -> tuple[IncrementalAggregates, IngestStats]:
+    """Run every source to its end through one ``Ingestor``."""
+    async with Ingestor(**kwargs) as ingestor:
+        await ingestor.feed_all(sources)
+    return ingestor.aggregates, ingestor.stats
+
+
+async def run_feeds(
+    files: Sequence[str | os.PathLike] = (),
+    watch: str | os.PathLike | None = None,
+    port: int | None = None,
+    host: str = "127.0.0.1",
+    interval: float = 5.0,
+    **kwargs,
+) -> Ingestor:
+    """Ingest ``files``, then keep watching ``watch`` and serving ``port``.
+
+    Returns once the files are read if there is nothing to watch or serve,
+    otherwise when cancelled (Ctrl-C); either way every accepted batch is
+    in the aggregates.  ``stats`` are printed every ``interval`` seconds.
+    """
+    stop = asyncio.Event()
+    async with Ingestor(**kwargs) as ingestor:
+        sources = [file_source(path) for path in files]
+        if watch is not None:
+            sources.append(watch_directory(watch, stop=stop))
+        server = None
+        if port is not None:
+            server = await ingestor.serve(host, port)
+            logger.warning("listening on %s:%s", host, port)
+
+        async def report():
+            while True:
+                await asyncio.sleep(interval)
+                print(ingestor.stats, flush=True)
+
+        reporter = asyncio.create_task(report())
+        try:
+            await ingestor.feed_all(sources)
+            if server is not None:
+                await ingestor._guard(server.serve_forever())
+        except asyncio.CancelledError:
+            pass
+        finally:
+            stop.set()
+            reporter.cancel()
+            if server is not None:
+                server.close()
+    return ingestor
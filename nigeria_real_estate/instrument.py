@@ -0,0 +1,179 @@
+"""Per-stage timing and memory records, as structured logs and Chrome traces.
+
+Pipeline stages run inside ``stage(name)`` blocks.  While tracing is off,
+``stage`` hands back one shared no-op context manager, so the
+instrumentation can stay in place.  After ``enable()``, every stage records
+its wall time, CPU time, the process's peak RSS so far and any fields the
+stage sets (e.g. ``rows_in`` and ``rows_out``).  ``max_rss`` is
+``ru_maxrss``, the peak over the life of the process, not the stage's own
+peak: it only shows which stage first pushed the peak up.  Each record is logged as
+one JSON line on the ``nigeria_real_estate.instrument`` logger
+(``log_json`` prints them bare, so the stream parses as JSON lines) and
+kept on the ``Tracer``, which can write them as a Chrome trace for
+``chrome://tracing`` or Perfetto.
+
+Only stages of the process that called ``enable()`` are recorded: the
+``parallel`` pool workers call ``disable()`` when they start, even if they
+were forked with tracing on, so work done in them shows up as the parent's
+stage that waits for it.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+def log_json(stream=None) -> logging.Handler:
+    """Write each stage record to ``stream`` (stderr) as a bare JSON line.
+
+    The records stop propagating to the root logger, whose format would
+    prefix them.
+    """
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return handler
+
+
+def max_rss() -> int | None:
+    """Peak resident set size of this process in bytes, if known."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Span:
+    """One running stage; ``set`` attaches fields such as ``rows_out``."""
+
+    __slots__ = ("tracer", "name", "fields", "start", "cpu_start")
+
+    def __init__(self, tracer: Tracer, name: str, fields: dict):
+        self.tracer = tracer
+        self.name = name
+        self.fields = fields
+
+    def set(self, **fields) -> None:
+        self.fields.update(fields)
+
+    def __enter__(self) -> Span:
+        self.start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.tracer.record(
+            self, time.perf_counter(), time.process_time(), failed=exc[0] is not None
+        )
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def set(self, **fields) -> None:
+        pass
+
+    def __enter__(self) -> _NullSpan:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Collects the stage records of one run."""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.records: list[dict] = []
+        self._lock = threading.Lock()
+
+    def record(self, span: Span, end: float, cpu_end: float, failed: bool) -> None:
+        record = {
+            "stage": span.name,
+            "start": span.start - self.origin,
+            "wall": end - span.start,
+            "cpu": cpu_end - span.cpu_start,
+            # Lifetime peak of the process, not of this stage.
+            "max_rss": max_rss(),
+            **span.fields,
+        }
+        if failed:
+            record["failed"] = True
+        with self._lock:
+            self.records.append(record)
+        logger.info(json.dumps(record, default=str))
+
+    def chrome_trace(self) -> dict:
+        """The records as Chrome trace-event JSON (complete ``X`` events)."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": record["stage"],
+                "ph": "X",
+                "ts": record["start"] * 1e6,
+                "dur": record["wall"] * 1e6,
+                "pid": pid,
+                "tid": 0,
+                "args": {
+                    key: value
+                    for key, value in record.items()
+                    if key not in ("stage", "start", "wall")
+                },
+            }
+            for record in self.records
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: str | os.PathLike) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.chrome_trace(), default=str) + "\n")
+        return path
+
+
+_tracer: Tracer | None = None
+
+
+def enable() -> Tracer:
+    """Start recording stages; returns the tracer that collects them."""
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def disable() -> Tracer | None:
+    """Stop recording; returns the tracer that was active, if any."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def stage(name: str, **fields) -> Span | _NullSpan:
+    """Context manager timing the block as stage ``name``.
+
+    ``fields`` (e.g. ``rows_in=len(df)``) are added to the record; more can
+    be added inside the block with ``span.set(...)``.
+    """
+    if _tracer is None:
+        return _NULL_SPAN
+    return Span(_tracer, name, fields)
@@ -0,0 +1,144 @@
+"""Typed loading of the listings CSV with a cached columnar snapshot.
+
+``load_listings`` parses the CSV with the dtypes declared in
+``nigeria_real_estate.schema`` (int8 counts, categorical text, int64 price)
+and writes a snapshot named after the CSV's content hash.  Later loads of
+the same file read the snapshot and skip CSV parsing.
+
+The default ``"columns"`` snapshot is a ``nigeria_real_estate.columnar``
+store that is memory-mapped rather than read, so processes loading the
+same file share one page-cache copy of it.  ``"feather"`` and
+``"parquet"`` snapshots need ``pyarrow``; without it the CSV is parsed
+every time.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from nigeria_real_estate.columnar import open_columns, write_columns
+from nigeria_real_estate.schema import (
+    CATEGORY_COLUMNS,
+    COLUMNS,
+    DTYPES,
+    NUMERIC_COLUMNS,
+    PRICE_COLUMN,
+)
+
+DEFAULT_PATH = Path(__file__).resolve().parent.parent / "nigeria_houses_data.csv"
+SNAPSHOT_FORMATS = ("columns", "feather", "parquet")
+
+
+def file_hash(path: str | os.PathLike, block_size: int = 1 << 20) -> str:
+    """SHA-256 hex digest of the file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        while block := handle.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def snapshot_path(
+    path: str | os.PathLike,
+    cache_dir: str | os.PathLike | None = None,
+    fmt: str = "columns",
+) -> Path:
+    """Where the snapshot of the CSV at ``path`` lives."""
+    path = Path(path)
+    cache_dir = Path(cache_dir) if cache_dir is not None else path.parent / ".cache"
+    return cache_dir / f"{path.stem}-{file_hash(path)[:16]}.{fmt}"
+
+
+def _have_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def coerce_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast a raw listings frame to the schema dtypes."""
+    df = df[COLUMNS]
+    # Some prices are written in scientific notation ("1.8E+12"), so they are
+    # parsed as floats first; every value is a whole number below 2**53.
+    price = df[PRICE_COLUMN]
+    if price.dtype.kind == "f":
+        price = price.round()
+    return df.assign(**{PRICE_COLUMN: price}).astype(DTYPES)
+
+
+def read_csv(path: str | os.PathLike = DEFAULT_PATH, **kwargs) -> pd.DataFrame:
+    """Parse the listings CSV straight into the schema dtypes."""
+    dtypes = {**DTYPES, PRICE_COLUMN: np.float64}
+    df = pd.read_csv(path, usecols=COLUMNS, dtype=dtypes, **kwargs)
+    return coerce_dtypes(df)
+
+
+def read_csv_chunks(
+    path: str | os.PathLike = DEFAULT_PATH, chunksize: int = 1_000_000
+) -> Iterator[pd.DataFrame]:
+    """Parse the listings CSV ``chunksize`` rows at a time.
+
+    Chunks may hold missing values, so the numeric columns stay float64
+    rather than the schema's integer dtypes; the text columns are
+    categorical.
+    """
+    dtypes = {column: np.float64 for column in NUMERIC_COLUMNS}
+    dtypes.update({column: "category" for column in CATEGORY_COLUMNS})
+    with pd.read_csv(
+        path, usecols=COLUMNS, dtype=dtypes, chunksize=chunksize
+    ) as reader:
+        yield from reader
+
+
+def _read_snapshot(path: Path, fmt: str) -> pd.DataFrame:
+    if fmt == "columns":
+        return open_columns(path)
+    if fmt == "feather":
+        return pd.read_feather(path)
+    return pd.read_parquet(path)
+
+
+def _write_snapshot(df: pd.DataFrame, path: Path, fmt: str) -> None:
+    if fmt == "columns":
+        write_columns(df, path)
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write next to the target and rename, so readers never see half a file.
+    partial = path.with_name(path.name + ".partial")
+    if fmt == "feather":
+        df.to_feather(partial)
+    else:
+        df.to_parquet(partial, index=False)
+    os.replace(partial, path)
+
+
+def load_listings(
+    path: str | os.PathLike = DEFAULT_PATH,
+    cache_dir: str | os.PathLike | None = None,
+    fmt: str = "columns",
+    use_cache: bool = True,
+) -> pd.DataFrame:
+    """Load the listings table with schema dtypes, via the snapshot if present.
+
+    ``cache_dir`` defaults to a ``.cache`` directory beside the CSV.  Pass
+    ``use_cache=False`` to always parse the CSV and leave snapshots alone.
+    A ``"columns"`` snapshot comes back memory-mapped and read-only.
+    """
+    if fmt not in SNAPSHOT_FORMATS:
+        raise ValueError(f"fmt must be one of {SNAPSHOT_FORMATS}, not {fmt!r}")
+
+    if not use_cache or (fmt != "columns" and not _have_pyarrow()):
+        return read_csv(path)
+
+    snapshot = snapshot_path(path, cache_dir, fmt)
+    if not snapshot.exists():
+        _write_snapshot(read_csv(path), snapshot, fmt)
+    return _read_snapshot(snapshot, fmt)
@@ -0,0 +1,211 @@
+"""Disk cache of analysis results, keyed on what their inputs contain.
+
+``ResultCache.call(func, *args, **kwargs)`` fingerprints every DataFrame
+or Series argument column by column, combines that with the function's
+name, its code (bytecode, constants and nested functions), the sources of
+this package and the other arguments, and looks the result up under the
+resulting key.  Editing the data, the function or any module of the package
+it calls therefore gives a new key, while re-running a step on unchanged
+inputs reads the pickled result back instead of recomputing it.
+
+Entries are evicted least recently used first once the cache grows past
+``max_bytes``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import types
+from collections.abc import Callable, Sequence
+from functools import cache, partial
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+# 256 MB
+DEFAULT_MAX_BYTES = 256 << 20
+
+
+def _digest() -> hashlib.blake2b:
+    return hashlib.blake2b(digest_size=16)
+
+
+def _update_values(digest: hashlib.blake2b, values: pd.Series | pd.Index) -> None:
+    digest.update(pd.util.hash_pandas_object(values, index=False).to_numpy().data)
+
+
+def column_fingerprint(values: pd.Series | pd.Index) -> str:
+    """Hex digest of a column's name, dtype and values.
+
+    A categorical's categories are part of its dtype: unused ones still show
+    up in ``observed=False`` groupbys.
+    """
+    digest = _digest()
+    digest.update(repr((values.name, str(values.dtype))).encode())
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        categories = values.dtype.categories
+        digest.update(repr((values.dtype.ordered, str(categories.dtype))).encode())
+        _update_values(digest, categories)
+    _update_values(digest, values)
+    return digest.hexdigest()
+
+
+def fingerprint(
+    data: pd.DataFrame | pd.Series, columns: Sequence[str] | None = None
+) -> str:
+    """Hex digest of a frame's index and ``columns`` (default: all of them)."""
+    digest = _digest()
+    digest.update(column_fingerprint(data.index).encode())
+    if isinstance(data, pd.Series):
+        digest.update(column_fingerprint(data).encode())
+        return digest.hexdigest()
+    for column in data.columns if columns is None else columns:
+        digest.update(column_fingerprint(data[column]).encode())
+    return digest.hexdigest()
+
+
+@cache
+def package_digest() -> str:
+    """Hex digest of this package's sources, read once per process.
+
+    Cached results depend on the helpers a function calls as well as on the
+    function itself, so editing any module of the package invalidates them.
+    """
+    digest = _digest()
+    for path in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _update_code(digest: hashlib.blake2b, code: types.CodeType) -> None:
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _update_code(digest, const)
+        elif isinstance(const, frozenset):
+            # Set order follows string hashing, which changes between runs.
+            digest.update(repr(sorted(map(repr, const))).encode())
+        else:
+            digest.update(repr(const).encode())
+
+
+def _function_key(func: Callable) -> str:
+    target = func.func if isinstance(func, partial) else func
+    name = f"{target.__module__}.{target.__qualname__}:{package_digest()}"
+    code = getattr(target, "__code__", None)
+    if code is None:
+        return name
+    digest = hashlib.blake2b(digest_size=8)
+    _update_code(digest, code)
+    return name + ":" + digest.hexdigest()
+
+
+def _argument_key(value: Any) -> str:
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return "data:" + fingerprint(value)
+    return repr(value)
+
+
+class ResultCache:
+    """Pickled results under ``directory``, evicted LRU past ``max_bytes``.
+
+    Safe to share between the processes of a worker pool: entries are
+    written under a temporary name and renamed into place.
+    """
+
+    def __init__(
+        self, directory: str | os.PathLike, max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def key(self, func: Callable, *args, **kwargs) -> str:
+        """Cache key of ``func(*args, **kwargs)``."""
+        digest = _digest()
+        digest.update(_function_key(func).encode())
+        if isinstance(func, partial):
+            args = (*func.args, *args)
+            kwargs = {**func.keywords, **kwargs}
+        for value in args:
+            digest.update(_argument_key(value).encode())
+        for name in sorted(kwargs):
+            digest.update(f"{name}={_argument_key(kwargs[name])}".encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.pkl"
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """``func(*args, **kwargs)``, from the cache when the inputs match."""
+        key = self.key(func, *args, **kwargs)
+        path = self._path(key)
+        try:
+            with open(path, "rb") as handle:
+                result = pickle.load(handle)
+        except FileNotFoundError:
+            pass
+        except (
+            EOFError,
+            pickle.UnpicklingError,
+            AttributeError,
+            ImportError,
+            ValueError,
+        ):
+            # Truncated, or pickled against code that has since changed.
+            path.unlink(missing_ok=True)
+        else:
+            # Reads refresh the modification time that eviction orders by.
+            try:
+                os.utime(path)
+            except FileNotFoundError:  # evicted by another process meanwhile
+                pass
+            return result
+
+        result = func(*args, **kwargs)
+        self._write(path, result)
+        return result
+
+    def __contains__(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def _write(self, path: Path, value: Any) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.partial")
+        with open(temporary, "wb") as handle:
+            pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+        self.evict()
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for path in self.directory.glob("*.pkl"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # evicted by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    def size(self) -> int:
+        """Total bytes of the cached results."""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> None:
+        """Drop the least recently used entries until under ``max_bytes``."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> None:
+        for _, _, path in self._entries():
+            path.unlink(missing_ok=True)
+
@@ -0,0 +1,208 @@
+"""Per-group mean, variance, skewness and kurtosis from mergeable moments.
+
+``GroupMoments`` holds, for every group and numeric column, the count, the
+mean and the sums of the 2nd to 4th powers of the deviations from that mean
+(``m2``..``m4``).  Within one frame these come from the group means and one
+``np.bincount`` per power over the centred values, which keeps them accurate
+for naira prices near 1e12.  Moments of disjoint sets of rows combine with
+``merge`` using Pébay's pairwise update (the higher-order form of Chan et
+al.'s variance update in ``streaming``), so chunks of a large file, or the
+per-state results of pool workers, are each read once and merged.
+
+``profile`` turns the moments into the numbers pandas reports: sample
+variance, ``Series.skew()`` and ``Series.kurt()`` (excess kurtosis).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from nigeria_real_estate.schema import NUMERIC_COLUMNS
+from nigeria_real_estate.stats import group_codes
+
+MOMENTS = ("count", "mean", "m2", "m3", "m4")
+# Levels of the distribution profile: towns are only unique within a state.
+PROFILE_LEVELS = {"state": ["state"], "town": ["state", "town"], "title": ["title"]}
+
+
+@dataclass
+class GroupMoments:
+    """Mergeable moments of ``columns`` per group.
+
+    Each field is a frame with one row per group and one column per numeric
+    column; groups with no values in a column have count 0.
+    """
+
+    count: pd.DataFrame
+    mean: pd.DataFrame
+    m2: pd.DataFrame
+    m3: pd.DataFrame
+    m4: pd.DataFrame
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        by: str | Sequence[str] | None = "state",
+        columns: Sequence[str] = NUMERIC_COLUMNS,
+    ) -> GroupMoments:
+        """Moments of ``columns`` per ``by`` group (one group if ``None``).
+
+        Rows with a missing key are left out, as are missing values.
+        """
+        columns = list(columns)
+        if by is None:
+            codes, index = np.zeros(len(df), dtype=np.intp), pd.Index(["all"])
+        else:
+            codes, index = group_codes(df, by)
+
+        shape = (len(index), len(columns))
+        fields = {name: np.zeros(shape) for name in MOMENTS}
+        for position, column in enumerate(columns):
+            x = df[column].to_numpy(dtype=np.float64)
+            keep = (codes >= 0) & ~np.isnan(x)
+            group, x = codes[keep], x[keep]
+            n = np.bincount(group, minlength=len(index)).astype(np.float64)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                means = np.bincount(group, weights=x, minlength=len(index)) / n
+            means[n == 0] = 0.0
+            centred = x - means[group]
+            fields["count"][:, position] = n
+            fields["mean"][:, position] = means
+            power = centred
+            for order in (2, 3, 4):
+                power = power * centred
+                fields[f"m{order}"][:, position] = np.bincount(
+                    group, weights=power, minlength=len(index)
+                )
+        return cls(
+            **{
+                name: pd.DataFrame(values, index=index, columns=columns)
+                for name, values in fields.items()
+            }
+        )
+
+    def merge(self, other: GroupMoments) -> GroupMoments:
+        """Moments of the rows of both ``self`` and ``other``.
+
+        The two must cover disjoint rows; groups present in only one of them
+        are carried over unchanged.
+        """
+        index = self.count.index.union(other.count.index)
+        columns = self.count.columns.union(other.count.columns, sort=False)
+
+        def aligned(moments: GroupMoments) -> dict[str, np.ndarray]:
+            return {
+                name: getattr(moments, name)
+                .reindex(index=index, columns=columns, fill_value=0.0)
+                .to_numpy()
+                for name in MOMENTS
+            }
+
+        a, b = aligned(self), aligned(other)
+        na, nb = a["count"], b["count"]
+        n = na + nb
+        delta = b["mean"] - a["mean"]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            wa = np.where(n > 0, na / n, 0.0)
+            wb = np.where(n > 0, nb / n, 0.0)
+        mean = a["mean"] + delta * wb
+        # Pébay (2008), eqs. 2.1-2.3, written with the weights na/n and nb/n.
+        m2 = a["m2"] + b["m2"] + delta**2 * na * wb
+        m3 = (
+            a["m3"]
+            + b["m3"]
+            + delta**3 * na * wb * (wa - wb)
+            + 3 * delta * (wa * b["m2"] - wb * a["m2"])
+        )
+        m4 = (
+            a["m4"]
+            + b["m4"]
+            + delta**4 * na * wb * (wa**2 - wa * wb + wb**2)
+            + 6 * delta**2 * (wa**2 * b["m2"] + wb**2 * a["m2"])
+            + 4 * delta * (wa * b["m3"] - wb * a["m3"])
+        )
+        fields = {"count": n, "mean": mean, "m2": m2, "m3": m3, "m4": m4}
+        return GroupMoments(
+            **{
+                name: pd.DataFrame(values, index=index, columns=columns)
+                for name, values in fields.items()
+            }
+        )
+
+    def profile(self) -> pd.DataFrame:
+        """Count, mean, sample variance, skewness and excess kurtosis.
+
+        One row per (group, column).  Skewness and kurtosis use the same
+        bias corrections as ``Series.skew()`` and ``Series.kurt()``: NaN
+        below 3 and 4 values, 0 for constant columns.
+        """
+        n, m2 = self.count.to_numpy(), self.m2.to_numpy()
+        m3, m4 = self.m3.to_numpy(), self.m4.to_numpy()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            variance = m2 / (n - 1)
+            g1 = np.sqrt(n) * m3 / m2**1.5
+            skew = np.sqrt(n * (n - 1)) / (n - 2) * g1
+            g2 = n * m4 / m2**2
+            kurt = ((n + 1) * g2 - 3 * (n - 1)) * (n - 1) / ((n - 2) * (n - 3))
+        constant = m2 == 0
+        mean = np.where(n > 0, self.mean.to_numpy(), np.nan)
+        variance[n < 2] = np.nan
+        skew = np.where(constant, 0.0, skew)
+        skew[n < 3] = np.nan
+        kurt = np.where(constant, 0.0, kurt)
+        kurt[n < 4] = np.nan
+
+        def stacked(values: np.ndarray) -> pd.Series:
+            frame = pd.DataFrame(
+                values, index=self.count.index, columns=self.count.columns
+            )
+            return frame.stack(future_stack=True)
+
+        table = pd.DataFrame(
+            {
+                "count": stacked(n).astype(np.int64),
+                "mean": stacked(mean),
+                "variance": stacked(variance),
+                "skew": stacked(skew),
+                "kurtosis": stacked(kurt),
+            }
+        )
+        table.index = table.index.set_names("column", level=-1)
+        return table
+
+
+def group_moments(
+    chunks: Iterable[pd.DataFrame],
+    by: str | Sequence[str] | None = "state",
+    columns: Sequence[str] = NUMERIC_COLUMNS,
+) -> GroupMoments:
+    """Moments per group of a stream of frames, reading each frame once."""
+    total = None
+    for chunk in chunks:
+        moments = GroupMoments.from_frame(chunk, by, columns)
+        total = moments if total is None else total.merge(moments)
+    if total is None:
+        return GroupMoments.from_frame(
+            pd.DataFrame(columns=list(columns)), None, columns
+        )
+    return total
+
+
+def distribution_profile(
+    df: pd.DataFrame,
+    levels: dict[str, Sequence[str]] = PROFILE_LEVELS,
+    columns: Sequence[str] = NUMERIC_COLUMNS,
+) -> dict[str, pd.DataFrame]:
+    """``GroupMoments(...).profile()`` of ``df`` for every level in ``levels``.
+
+    The national profile is under ``"all"``.
+    """
+    profiles = {"all": GroupMoments.from_frame(df, None, columns)}
+    for name, by in levels.items():
+        profiles[name] = GroupMoments.from_frame(df, by, columns)
+    return {name: moments.profile() for name, moments in profiles.items()}
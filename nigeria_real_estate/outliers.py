@@ -0,0 +1,129 @@
+"""Interquartile-range outlier fences computed for every group at once.
+
+Each deep-dive in the notebook used to recompute its own quartiles and
+filter by hand.  ``iqr_filter`` gets the quartiles of every group from a
+single ``groupby().quantile`` call and broadcasts the fences back onto the
+rows, so national, per-state and per-town filtering are all one pass.
+
+With ``relative_error`` the quartiles come from ``QuantileSketch``es
+instead, and ``sketch_limits`` turns sketches merged over chunks or worker
+processes into the same limits table, which ``iqr_filter`` can then apply
+chunk by chunk.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+
+from nigeria_real_estate.sketch import sketch_groups
+
+
+def _limits_table(quartiles: pd.DataFrame, rows: pd.Series, k: float) -> pd.DataFrame:
+    limits = pd.DataFrame(
+        {
+            "rows": rows.to_numpy(),
+            "q1": quartiles.iloc[:, 0].to_numpy(),
+            "q3": quartiles.iloc[:, 1].to_numpy(),
+        },
+        index=quartiles.index,
+    )
+    limits["iqr"] = limits["q3"] - limits["q1"]
+    limits["lower_limit"] = limits["q1"] - k * limits["iqr"]
+    limits["upper_limit"] = limits["q3"] + k * limits["iqr"]
+    return limits
+
+
+def sketch_limits(sketches: pd.Series, k: float = 1.5) -> pd.DataFrame:
+    """``iqr_limits`` table from per-group ``QuantileSketch``es.
+
+    ``sketches`` is indexed by group, as returned by ``sketch_groups`` or
+    ``merge_sketches``.  q1 and q3 are within the sketches' relative error
+    of the exact quartiles.
+    """
+    quartiles = pd.DataFrame(
+        [sketch.quantiles([0.25, 0.75]) for sketch in sketches],
+        index=sketches.index,
+    )
+    rows = pd.Series([sketch.count for sketch in sketches], index=sketches.index)
+    return _limits_table(quartiles, rows, k)
+
+
+def iqr_limits(
+    df: pd.DataFrame,
+    by: str | Sequence[str] | None = None,
+    k: float = 1.5,
+    column: str = "price",
+    relative_error: float | None = None,
+) -> pd.DataFrame:
+    """Quartiles, IQR and lower/upper fences of ``column`` for each group.
+
+    With ``by=None`` the whole frame is treated as one group, labelled
+    ``"all"``.  Pass ``relative_error`` to estimate the quartiles with
+    quantile sketches instead of sorting every group.
+    """
+    if relative_error is not None:
+        return sketch_limits(sketch_groups(df, by, column, relative_error), k)
+
+    if by is None:
+        q = df[column].quantile([0.25, 0.75])
+        quartiles = pd.DataFrame([q.to_numpy()], index=pd.Index(["all"]))
+        rows = pd.Series([len(df)], index=quartiles.index)
+    else:
+        grouped = df.groupby(by, observed=True, sort=True)[column]
+        quartiles = grouped.quantile([0.25, 0.75]).unstack()
+        rows = grouped.size()
+    return _limits_table(quartiles, rows, k)
+
+
+def _group_codes(
+    df: pd.DataFrame, by: str | Sequence[str] | None, groups: pd.Index
+) -> np.ndarray:
+    # Position of each row's group in ``groups``, -1 if it has none.
+    if by is None:
+        return np.zeros(len(df), dtype=np.intp)
+    keys = [by] if isinstance(by, str) else list(by)
+    if len(keys) == 1:
+        return groups.get_indexer(df[keys[0]])
+    return groups.get_indexer(pd.MultiIndex.from_frame(df[keys]))
+
+
+def iqr_filter(
+    df: pd.DataFrame,
+    by: str | Sequence[str] | None = None,
+    k: float = 1.5,
+    column: str = "price",
+    relative_error: float | None = None,
+    limits: pd.DataFrame | None = None,
+) -> tuple[pd.Series, pd.DataFrame]:
+    """Flag the rows of ``df`` that lie strictly inside their group's fences.
+
+    Returns a boolean mask aligned with ``df`` (``True`` = keep) and the
+    per-group limits table from ``iqr_limits`` with an ``outliers`` count
+    of the rows of ``df`` outside the fences.  Rows whose group key is
+    missing, or not in ``limits``, are never kept.
+
+    ``limits`` applies fences computed elsewhere, e.g. by ``sketch_limits``
+    over the whole file, instead of the quartiles of ``df`` itself.
+    """
+    if limits is None:
+        limits = iqr_limits(
+            df, by=by, k=k, column=column, relative_error=relative_error
+        )
+    else:
+        limits = limits.copy()
+    codes = _group_codes(df, by, limits.index)
+
+    # Rows with a missing key point at a NaN fence, which fails both tests.
+    values = df[column].to_numpy()
+    lower = np.append(limits["lower_limit"].to_numpy(), np.nan)[codes]
+    upper = np.append(limits["upper_limit"].to_numpy(), np.nan)[codes]
+    keep = (values > lower) & (values < upper)
+
+    grouped = codes[codes >= 0]
+    limits["outliers"] = np.bincount(grouped, minlength=len(limits)) - np.bincount(
+        codes[keep], minlength=len(limits)
+    )
+    return pd.Series(keep, index=df.index, name=column), limits
@@ -0,0 +1,183 @@
+"""Fan per-state work out over a process pool without copying the frame.
+
+``map_states`` sorts the listings by state once, places each column in a
+``multiprocessing.shared_memory`` block (categorical and text columns as
+integer codes plus their categories) and starts a ``ProcessPoolExecutor``
+whose workers attach to those blocks when they start.  Each task only
+carries a state name and its row range, so workers rebuild a zero-copy view
+of their slice instead of unpickling a copy of the data.  Text columns that
+are not categorical are the exception: each worker rebuilds them once.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from collections.abc import Callable, Hashable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from nigeria_real_estate import instrument
+from nigeria_real_estate.partition import partition, trim_categories
+
+
+@dataclass
+class SharedColumn:
+    name: Hashable
+    memory: str
+    dtype: str
+    length: int
+    categories: list | None = None
+    # Original dtype of a text column shared as codes; None for categoricals.
+    restore: str | None = None
+
+
+@dataclass
+class SharedFrame:
+    """Picklable handle to a frame whose columns live in shared memory."""
+
+    columns: list[SharedColumn]
+    index: SharedColumn | None = None
+
+    @classmethod
+    def create(
+        cls, df: pd.DataFrame
+    ) -> tuple[SharedFrame, list[shared_memory.SharedMemory]]:
+        """Copy ``df`` into shared memory once.
+
+        Returns the handle and the blocks; the caller must ``close()`` and
+        ``unlink()`` the blocks when the workers are done.
+        """
+        columns, blocks = [], []
+        for name, series in df.items():
+            categories = restore = None
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                categories = series.cat.categories.tolist()
+                values = series.array.codes
+            else:
+                values = series.to_numpy()
+                if values.dtype.hasobject:
+                    # Object arrays hold pointers into this process's heap,
+                    # which mean nothing to a worker; share codes instead.
+                    values, uniques = pd.factorize(series)
+                    categories, restore = list(uniques), str(series.dtype)
+            columns.append(_share(name, values, blocks, categories, restore))
+        # Integer row labels travel too, so workers see the caller's labels.
+        index = None
+        if pd.api.types.is_integer_dtype(df.index.dtype):
+            index = _share(None, df.index.to_numpy(), blocks)
+        return cls(columns, index), blocks
+
+    def attach(self) -> tuple[pd.DataFrame, list[shared_memory.SharedMemory]]:
+        """Zero-copy frame over the shared blocks, plus the blocks to keep open."""
+        data, restore, blocks = {}, {}, []
+        for column in self.columns:
+            values = _view(column, blocks)
+            if column.categories is not None:
+                dtype = pd.CategoricalDtype(column.categories)
+                values = pd.Categorical.from_codes(values, dtype=dtype, validate=False)
+            if column.restore is not None:
+                restore[column.name] = column.restore
+            data[column.name] = values
+        index = None if self.index is None else pd.Index(_view(self.index, blocks))
+        frame = pd.DataFrame(data, index=index, copy=False)
+        # Text columns are rebuilt once per worker, as a copy.
+        return (frame.astype(restore) if restore else frame), blocks
+
+
+def _share(
+    name: Hashable,
+    values: np.ndarray,
+    blocks: list[shared_memory.SharedMemory],
+    categories: list | None = None,
+    restore: str | None = None,
+) -> SharedColumn:
+    block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+    np.ndarray(values.shape, values.dtype, buffer=block.buf)[:] = values
+    blocks.append(block)
+    return SharedColumn(
+        name, block.name, values.dtype.str, len(values), categories, restore
+    )
+
+
+def _view(column: SharedColumn, blocks: list[shared_memory.SharedMemory]) -> np.ndarray:
+    block = _attach(column.memory)
+    blocks.append(block)
+    return np.ndarray(column.length, np.dtype(column.dtype), buffer=block.buf)
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    # Workers share the parent's resource tracker, which already knows the
+    # block; the parent unlinks it once every task has finished.
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+# Set in each worker process by ``_init_worker``.
+_worker_frame: pd.DataFrame | None = None
+_worker_blocks: list[shared_memory.SharedMemory] = []
+
+
+def _init_worker(handle: SharedFrame) -> None:
+    global _worker_frame, _worker_blocks
+    # A forked worker inherits the parent's tracer; its records would be
+    # logged but never reach the parent's trace.
+    instrument.disable()
+    _worker_frame, _worker_blocks = handle.attach()
+
+
+def _run_task(func: Callable, key: Hashable, start: int, stop: int) -> Any:
+    return func(key, trim_categories(_worker_frame.iloc[start:stop]))
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def map_states(
+    df: pd.DataFrame,
+    func: Callable[[Hashable, pd.DataFrame], Any],
+    states: Iterable[Hashable] | None = None,
+    workers: int | None = 1,
+    by: str = "state",
+) -> dict[Hashable, Any]:
+    """``{state: func(state, rows_of_state)}`` for each state, in parallel.
+
+    ``func`` must be picklable (a module-level function or a
+    ``functools.partial`` of one).  With ``workers=1`` everything runs in
+    this process on partition views; ``workers=None`` uses every core.
+    Results come back in the order of ``states``.
+    """
+    parts = partition(df, by)
+    states = list(parts) if states is None else list(states)
+    workers = default_workers() if workers is None else workers
+
+    if workers <= 1 or len(states) <= 1:
+        return {state: func(state, parts[state]) for state in states}
+
+    positions = {key: i for i, key in enumerate(parts)}
+    ranges = [
+        (parts.offsets[positions[s]], parts.offsets[positions[s] + 1]) for s in states
+    ]
+    handle, blocks = SharedFrame.create(parts.frame)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(states)),
+            initializer=_init_worker,
+            initargs=(handle,),
+        ) as pool:
+            futures = [
+                pool.submit(_run_task, func, state, int(start), int(stop))
+                for state, (start, stop) in zip(states, ranges)
+            ]
+            return {state: future.result() for state, future in zip(states, futures)}
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
@@ -0,0 +1,96 @@
+"""Single-pass partitioning of the listings frame by state (or any key).
+
+The notebook used to build each per-state frame with
+``df[df["state"] == X].reset_index(drop=True)``, which scans and copies the
+full frame once per state.  ``partition`` factorizes the key once, sorts the
+rows into contiguous runs with a single stable argsort and hands out each
+group as an ``iloc`` slice of that sorted frame, so every partition is a view
+rather than a fresh copy.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Hashable, Iterator, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def trim_categories(part: pd.DataFrame) -> pd.DataFrame:
+    """Drop the categories a slice of a frame does not use.
+
+    Partitions are trimmed so describe() and plots only list their own
+    towns.  Only the small code arrays are rebuilt; the other columns stay
+    views.
+    """
+    categoricals = [
+        column
+        for column, dtype in part.dtypes.items()
+        if isinstance(dtype, pd.CategoricalDtype)
+    ]
+    if not categoricals:
+        return part
+    part = part.copy(deep=False)
+    for column in categoricals:
+        part[column] = part[column].cat.remove_unused_categories()
+    return part
+
+
+class Partitions(Mapping):
+    """Read-only mapping of group key -> view of the rows in that group.
+
+    Partitions keep the row labels of the source frame, so a result computed
+    on a partition can be aligned back onto the original ``df``.
+    """
+
+    def __init__(self, frame: pd.DataFrame, by: str | Sequence[str]):
+        self.by = by
+        keys = [by] if isinstance(by, str) else list(by)
+
+        if len(keys) == 1:
+            codes, uniques = pd.factorize(frame[keys[0]], sort=True)
+            labels = list(uniques)
+        else:
+            index = pd.MultiIndex.from_frame(frame[keys])
+            codes, uniques = pd.factorize(index, sort=True)
+            labels = list(uniques)
+
+        # Rows with a missing key get code -1 and are left out, as groupby does.
+        valid = codes >= 0
+        order = np.argsort(codes, kind="stable")
+        order = order[np.count_nonzero(~valid):]
+
+        self.frame = frame.take(order)
+        self.codes = codes[order]
+        counts = np.bincount(self.codes, minlength=len(labels))
+        self.offsets = np.concatenate(([0], np.cumsum(counts)))
+        self._positions = {label: i for i, label in enumerate(labels)}
+
+    def __getitem__(self, key: Hashable) -> pd.DataFrame:
+        i = self._positions[key]
+        return trim_categories(self.frame.iloc[self.offsets[i]:self.offsets[i + 1]])
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._positions)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def sizes(self) -> pd.Series:
+        """Number of rows in each partition, indexed by group key."""
+        counts = np.diff(self.offsets)
+        return pd.Series(counts, index=list(self._positions), name="rows")
+
+    def filter(self, min_rows: int) -> dict[Hashable, pd.DataFrame]:
+        """Partitions with at least ``min_rows`` rows."""
+        return {key: self[key] for key, n in self.sizes().items() if n >= min_rows}
+
+
+def partition(df: pd.DataFrame, by: str | Sequence[str] = "state") -> Partitions:
+    """Split ``df`` into per-group views in one pass."""
+    return Partitions(df, by)
+
+
+def partition_by_state(df: pd.DataFrame) -> Partitions:
+    """Split ``df`` into one view per federal state."""
+    return partition(df, "state")
@@ -0,0 +1,350 @@
+"""The EDA as a headless pipeline: load, dedup, outliers, aggregate, report.
+
+``run`` reproduces the notebook's numbers without drawing anything;
+``write_report`` saves them as CSV/JSON and ``write_figures`` renders the
+charts to files.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pandas as pd
+
+from nigeria_real_estate import instrument, plots, stats
+from nigeria_real_estate.correlation import Correlations, correlations
+from nigeria_real_estate.dedup import DedupReport, SeenSet, dedup_batch
+from nigeria_real_estate.gazetteer import canonicalise
+from nigeria_real_estate.loader import DEFAULT_PATH, load_listings
+from nigeria_real_estate.memo import ResultCache
+from nigeria_real_estate.moments import distribution_profile
+from nigeria_real_estate.outliers import iqr_filter
+from nigeria_real_estate.parallel import map_states
+from nigeria_real_estate.quality import QualityReport, validate
+from nigeria_real_estate.schema import PRICE_COLUMN
+from nigeria_real_estate.valuation import PriceModel, holdout_split
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+
+# The notebook only analyses states with at least this many listings.
+MIN_STATE_ROWS = 50
+
+
+@dataclass
+class StateReport:
+    """Deep-dive results for one state."""
+
+    state: str
+    rows: int
+    outlier_free_rows: int
+    limits: pd.Series
+    mean_price: float
+    most_common_title: str
+    town_prices: pd.Series
+
+    def to_dict(self) -> dict:
+        return {
+            "state": self.state,
+            "rows": self.rows,
+            "outlier_free_rows": self.outlier_free_rows,
+            "q1": self.limits["q1"],
+            "q3": self.limits["q3"],
+            "lower_limit": self.limits["lower_limit"],
+            "upper_limit": self.limits["upper_limit"],
+            "mean_price": self.mean_price,
+            "most_common_title": self.most_common_title,
+        }
+
+
+@dataclass
+class AnalysisResult:
+    """Everything the pipeline computes, national and per state."""
+
+    df: pd.DataFrame
+    # Raw (state, town) label pairs and the canonical labels they became;
+    # empty when the raw labels were kept.
+    labels: pd.DataFrame
+    dedup: DedupReport
+    # Missing values per column of the raw load, before deduplication.
+    missing: pd.Series
+    quality: QualityReport
+    national_limits: pd.Series
+    outlier_free: pd.DataFrame
+    mean_price: float
+    most_common_title: str
+    state_prices: pd.Series
+    correlation: pd.DataFrame
+    associations: Correlations
+    # Moments of the numeric columns: national ("all"), per state, town, title.
+    profiles: dict[str, pd.DataFrame]
+    # Fitted on 80% of the outlier-free rows and scored on the other 20%.
+    price_model: PriceModel
+    model_metrics: dict
+    states: dict[str, StateReport] = field(default_factory=dict)
+
+    def summary(self) -> dict:
+        return {
+            "rows_loaded": self.dedup.rows_in,
+            "duplicates": self.dedup.duplicates,
+            "percent_duplicates": round(self.dedup.percent_removed, 2),
+            "rows": len(self.df),
+            "missing_values": int(self.missing.sum()),
+            "lower_limit": self.national_limits["lower_limit"],
+            "upper_limit": self.national_limits["upper_limit"],
+            "outlier_free_rows": len(self.outlier_free),
+            "mean_price": self.mean_price,
+            "most_common_title": self.most_common_title,
+            "states": sorted(self.states),
+        }
+
+
+def summarise_state(
+    state: str, raw: pd.DataFrame, clean: pd.DataFrame, limits: pd.Series
+) -> StateReport:
+    """Deep-dive numbers for one state from its raw and outlier-free rows."""
+    return StateReport(
+        state=state,
+        rows=len(raw),
+        outlier_free_rows=len(clean),
+        limits=limits,
+        mean_price=stats.mean(clean[PRICE_COLUMN]),
+        most_common_title=str(stats.mode(clean["title"])),
+        town_prices=clean.groupby("town", observed=True)[PRICE_COLUMN]
+        .mean()
+        .sort_index(),
+    )
+
+
+def _outlier_free(rows: pd.DataFrame) -> tuple[pd.DataFrame, pd.Series]:
+    mask, limits = iqr_filter(rows)
+    return rows[mask], limits.iloc[0]
+
+
+def state_report(state: str, rows: pd.DataFrame) -> StateReport:
+    """IQR filter one state's rows against its own fences and summarise them."""
+    clean, limits = _outlier_free(rows)
+    return summarise_state(state, rows, clean, limits.rename(state))
+
+
+def render(path: Path, draw: Callable[..., plt.Figure], *args, **kwargs) -> Path:
+    """Draw a figure with ``draw(*args, **kwargs)`` and save it to ``path``."""
+    with instrument.stage("figure", path=path.name):
+        return plots.save(draw(*args, **kwargs), path)
+
+
+def render_state(state: str, rows: pd.DataFrame, figures: Path) -> list[Path]:
+    """Draw one state's histogram, town box plot and town price bars."""
+    clean, limits = _outlier_free(rows)
+    report = summarise_state(state, rows, clean, limits)
+    slug = state.lower().replace(" ", "_")
+    return [
+        render(figures / f"{slug}_hist.png", plots.histograms, clean, state),
+        render(
+            figures / f"{slug}_price_by_town.png", plots.price_boxplot, clean, "town"
+        ),
+        render(
+            figures / f"{slug}_mean_price.png",
+            plots.mean_price_bar,
+            report.town_prices,
+            f"Average Property Price per town in {state} State",
+        ),
+    ]
+
+
+def _call(func: Callable, *args, **kwargs):
+    return func(*args, **kwargs)
+
+
+def run(
+    path: str | os.PathLike = DEFAULT_PATH,
+    states: Iterable[str] | None = None,
+    min_rows: int = MIN_STATE_ROWS,
+    use_cache: bool = True,
+    workers: int | None = 1,
+    canonical_labels: bool = True,
+) -> AnalysisResult:
+    """Run the analysis on the CSV at ``path``.
+
+    ``states`` defaults to every state with at least ``min_rows`` listings
+    after deduplication.  The state deep-dives are spread over ``workers``
+    processes (``None`` for one per core).  Unless ``canonical_labels`` is
+    false, state and town labels are replaced by their gazetteer names after
+    deduplication (see ``nigeria_real_estate.gazetteer``), so listings filed
+    under the wrong state are counted in the right one.
+    """
+    with instrument.stage("load") as span:
+        df = load_listings(path, use_cache=use_cache)
+        span.set(rows_out=len(df))
+    # Counted on the raw load and deduplicated on the raw labels, like the
+    # notebook; rows that only coincide once relabelled are kept.
+    missing = df.isna().sum()
+    with instrument.stage("dedup", rows_in=len(df)) as span:
+        df, dedup = dedup_batch(df, SeenSet())
+        span.set(rows_out=len(df))
+    labels = pd.DataFrame()
+    if canonical_labels:
+        with instrument.stage("canonicalise", rows_in=len(df)):
+            df, labels = canonicalise(df)
+    with instrument.stage("quality", rows_in=len(df)) as span:
+        quality = validate(df)
+        span.set(rows_out=int(quality.valid.sum()))
+    with instrument.stage("outliers", rows_in=len(df)) as span:
+        national_mask, national_limits = iqr_filter(df)
+        outlier_free = df[national_mask]
+        span.set(rows_out=len(outlier_free))
+
+    sizes = df["state"].value_counts()
+    if states is None:
+        states = sorted(sizes[sizes >= min_rows].index)
+    else:
+        states = list(states)
+        unknown = sorted(set(states) - set(sizes[sizes > 0].index))
+        if unknown:
+            raise ValueError(f"no listings for state(s): {', '.join(unknown)}")
+
+    # With the cache, the associations and state reports are only recomputed
+    # when their input rows change.
+    call = _call
+    if use_cache:
+        call = ResultCache(Path(path).parent / ".cache" / "results").call
+
+    with instrument.stage("aggregate", rows_in=len(outlier_free)):
+        mean_price = stats.mean(outlier_free[PRICE_COLUMN])
+        most_common_title = str(stats.mode(outlier_free["title"]))
+        state_prices = (
+            outlier_free.groupby("state", observed=True)[PRICE_COLUMN]
+            .mean()
+            .sort_index()
+        )
+        associations = call(correlations, outlier_free)
+    with instrument.stage("profile", rows_in=len(outlier_free)):
+        profiles = call(distribution_profile, outlier_free)
+    with instrument.stage("model", rows_in=len(outlier_free)):
+        train, test = holdout_split(outlier_free)
+        price_model = PriceModel.fit(train)
+        model_metrics = price_model.evaluate(test)
+    with instrument.stage("state_reports", rows_in=len(df), states=len(states)):
+        reports = map_states(df, partial(call, state_report), states, workers)
+
+    return AnalysisResult(
+        df=df,
+        labels=labels,
+        dedup=dedup,
+        missing=missing,
+        quality=quality,
+        national_limits=national_limits.iloc[0],
+        outlier_free=outlier_free,
+        mean_price=mean_price,
+        most_common_title=most_common_title,
+        state_prices=state_prices,
+        correlation=associations.pearson,
+        associations=associations,
+        profiles=profiles,
+        price_model=price_model,
+        model_metrics=model_metrics,
+        states=reports,
+    )
+
+
+def write_report(result: AnalysisResult, outdir: str | os.PathLike) -> list[Path]:
+    """Save the summary, state table and town prices under ``outdir``."""
+    outdir = Path(outdir)
+    outdir.mkdir(parents=True, exist_ok=True)
+
+    summary = outdir / "summary.json"
+    summary.write_text(json.dumps(result.summary(), indent=2, default=float) + "\n")
+
+    states = outdir / "states.csv"
+    pd.DataFrame([report.to_dict() for report in result.states.values()]).to_csv(
+        states, index=False
+    )
+
+    towns = outdir / "town_prices.csv"
+    town_prices = {state: r.town_prices for state, r in result.states.items()}
+    if town_prices:
+        pd.concat(town_prices, names=["state", "town"]).rename("mean_price").to_csv(
+            towns
+        )
+    else:
+        pd.DataFrame(columns=["state", "town", "mean_price"]).to_csv(towns, index=False)
+
+    state_prices = outdir / "state_prices.csv"
+    result.state_prices.rename("mean_price").to_csv(state_prices)
+
+    correlation = outdir / "correlation.csv"
+    result.correlation.to_csv(correlation)
+    associations = [correlation]
+    for name in ("spearman", "eta", "cramers_v"):
+        associations.append(outdir / f"{name}.csv")
+        getattr(result.associations, name).to_csv(associations[-1])
+
+    profiles = []
+    for level, profile in result.profiles.items():
+        profiles.append(outdir / f"profile_{level}.csv")
+        profile.to_csv(profiles[-1])
+    labels = outdir / "labels.csv"
+    result.labels.to_csv(labels, index=False)
+
+    quality = outdir / "quality.csv"
+    result.quality.violations().to_csv(quality)
+
+    model = result.price_model.save(outdir / "price_model.json")
+    metrics = outdir / "price_model_metrics.json"
+    metrics.write_text(json.dumps(result.model_metrics, indent=2) + "\n")
+    return [
+        summary,
+        states,
+        towns,
+        state_prices,
+        *associations,
+        *profiles,
+        labels,
+        quality,
+        model,
+        metrics,
+    ]
+
+
+def write_figures(
+    result: AnalysisResult, outdir: str | os.PathLike, workers: int | None = 1
+) -> list[Path]:
+    """Render the national and per-state charts to PNG files under ``outdir``.
+
+    The state charts are drawn in ``workers`` processes.  Every figure is
+    closed once saved; call ``plots.use_agg()`` first for unattended runs.
+    """
+    figures = Path(outdir) / "figures"
+    written = [
+        render(figures / "nigeria_hist.png", plots.histograms, result.df),
+        render(
+            figures / "nigeria_price_by_state.png",
+            plots.price_boxplot,
+            result.outlier_free,
+            by="state",
+        ),
+        render(
+            figures / "nigeria_mean_price.png",
+            plots.mean_price_bar,
+            result.state_prices,
+            "Average Property Price per state in Nigeria",
+        ),
+        render(
+            figures / "nigeria_correlation.png",
+            plots.correlation_heatmap,
+            result.correlation,
+        ),
+    ]
+    with instrument.stage("state_figures", states=len(result.states)):
+        rendered = map_states(
+            result.df, partial(render_state, figures=figures), result.states, workers
+        )
+    for paths in rendered.values():
+        written += paths
+    return written
@@ -0,0 +1,210 @@
+"""Figures of the EDA, built as matplotlib figures that can be shown or saved.
+
+Each function returns the figure instead of calling ``plt.show()``, so the
+same code serves the notebook and headless report runs.
+
+matplotlib and seaborn are imported inside the functions that use them, so
+importing this module (and the pipeline) costs nothing until a figure is
+actually drawn.  Batch exports call ``use_agg`` first so that no GUI
+backend is ever started.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from nigeria_real_estate import stats
+from nigeria_real_estate.histograms import Histograms
+from nigeria_real_estate.schema import PRICE_COLUMN
+from nigeria_real_estate.sketch import DEFAULT_RELATIVE_ERROR, sketch_groups
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+
+# Markers drawn per box by ``price_boxplot``.
+MAX_STRIP_POINTS = 300
+
+
+def use_agg() -> None:
+    """Render with the non-interactive Agg backend, here and in child processes.
+
+    ``MPLBACKEND`` is set too, so pool workers started with ``spawn`` pick
+    the same backend when they import matplotlib.
+    """
+    import matplotlib
+
+    os.environ["MPLBACKEND"] = "Agg"
+    matplotlib.use("Agg", force=True)
+
+
+def histograms(df: pd.DataFrame, title: str | None = None) -> plt.Figure:
+    """Histogram of every numeric column, like ``df.hist(figsize=(16, 16))``.
+
+    The columns are binned once by ``Histograms`` (price on a log scale);
+    keep a ``Histograms`` instead to redraw or compare without the rows.
+    """
+    return Histograms.from_frame(df).plot(title=title)
+
+
+def box_stats(
+    df: pd.DataFrame,
+    by: str,
+    column: str = PRICE_COLUMN,
+    whis: float = 1.5,
+    relative_error: float | None = DEFAULT_RELATIVE_ERROR,
+) -> pd.DataFrame:
+    """Quartiles, median and whisker ends of ``column`` per ``by`` value.
+
+    Whiskers reach the furthest values within ``whis`` IQRs of the box, as
+    in ``sns.boxplot``.  Everything is read from one quantile sketch per
+    group (see ``nigeria_real_estate.sketch``): the quartiles and median are
+    within ``relative_error`` of the exact ones, and so are the whisker ends
+    unless a value lies within that error of a fence, which may then fall on
+    the other side of it.  ``relative_error=None`` computes everything
+    exactly from the rows instead.
+    """
+    if relative_error is not None:
+        sketches = sketch_groups(df, by, column, relative_error)
+        rows = []
+        for sketch in sketches:
+            q1, med, q3 = sketch.quantiles([0.25, 0.5, 0.75])
+            reach = whis * (q3 - q1)
+            rows.append([q1, med, q3, *sketch.extremes_within(q1 - reach, q3 + reach)])
+        return pd.DataFrame(
+            rows,
+            index=sketches.index,
+            columns=["q1", "med", "q3", "whislo", "whishi"],
+            dtype=np.float64,
+        )
+
+    values = df[column].astype(np.float64)
+    keys = df[by]
+    grouped = values.groupby(keys, observed=True, sort=True)
+    table = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    table.columns = ["q1", "med", "q3"]
+    reach = whis * (table["q3"] - table["q1"])
+    lower = keys.map(table["q1"] - reach).astype(np.float64)
+    upper = keys.map(table["q3"] + reach).astype(np.float64)
+    inside = values.where((values >= lower) & (values <= upper))
+    whiskers = inside.groupby(keys, observed=True, sort=True).agg(["min", "max"])
+    table["whislo"] = whiskers["min"]
+    table["whishi"] = whiskers["max"]
+    return table
+
+
+def strip_sample(
+    df: pd.DataFrame,
+    by: str,
+    max_points: int | None = MAX_STRIP_POINTS,
+    column: str = PRICE_COLUMN,
+) -> pd.DataFrame:
+    """At most ``max_points`` rows per ``by`` value, spread over its range.
+
+    Larger groups are thinned to evenly spaced order statistics of
+    ``column``, so the sample follows the group's density and always keeps
+    its smallest and largest value.  ``None`` keeps every row.
+    """
+    if max_points is None:
+        return df
+    index = stats.GroupIndex(df, by)
+    if not len(index.sizes) or index.sizes.max() <= max_points:
+        return df
+    values = index.take(df[column])
+    # Sort by value within each group run.
+    order = index.order[np.lexsort((values, index.codes))]
+    picks = []
+    for start, size in zip(index.starts, index.sizes):
+        if size <= max_points:
+            picks.append(np.arange(start, start + size))
+        else:
+            ranks = np.linspace(0, size - 1, max_points).round().astype(np.intp)
+            picks.append(start + np.unique(ranks))
+    return df.iloc[order[np.concatenate(picks)]]
+
+
+def price_boxplot(
+    df: pd.DataFrame,
+    by: str = "state",
+    max_points: int | None = MAX_STRIP_POINTS,
+    seed: int = 0,
+    relative_error: float | None = DEFAULT_RELATIVE_ERROR,
+) -> plt.Figure:
+    """Box plot of price per ``by`` value with the listings overlaid.
+
+    The boxes come from per-group quantile sketches (``box_stats`` with
+    ``relative_error``), and at most ``max_points`` markers per box are
+    drawn (see ``strip_sample``), so the render time and file size stay flat
+    however many listings a state has.
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set_theme(style="whitegrid")
+    fig, ax = plt.subplots(figsize=(20, 20))
+    table = box_stats(df, by, relative_error=relative_error)
+    positions = np.arange(len(table))
+    boxes = ax.bxp(
+        [
+            {**row, "label": str(key), "fliers": []}
+            for key, row in table.to_dict("index").items()
+        ],
+        positions=positions,
+        orientation="horizontal",
+        widths=0.8,
+        patch_artist=True,
+        showfliers=False,
+        medianprops={"color": ".25"},
+    )
+    for patch, colour in zip(boxes["boxes"], sns.color_palette("Set2", len(table))):
+        patch.set_facecolor(colour)
+
+    sample = strip_sample(df, by, max_points)
+    rows = table.index.get_indexer(sample[by])
+    jitter = np.random.default_rng(seed).uniform(-0.2, 0.2, len(sample))
+    ax.scatter(sample[PRICE_COLUMN], rows + jitter, color=".25", alpha=0.8, s=25)
+
+    ax.set_yticks(positions, [str(key) for key in table.index])
+    ax.set_ylim(len(table) - 0.5, -0.5)
+    ax.set_xlabel(PRICE_COLUMN)
+    ax.set_ylabel(by)
+    return fig
+
+
+def mean_price_bar(means: pd.Series, title: str) -> plt.Figure:
+    """Bar chart of mean price per state or town."""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    fig, ax = plt.subplots(figsize=(16, 9))
+    means.sort_index().plot.bar(ax=ax, color=sns.color_palette("Set2", len(means)))
+    ax.set_xlabel(means.index.name or "")
+    ax.set_ylabel(title)
+    return fig
+
+
+def correlation_heatmap(corr: pd.DataFrame) -> plt.Figure:
+    """Heat map of a correlation matrix in percent."""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    fig, ax = plt.subplots(figsize=(15, 15))
+    sns.heatmap(corr * 100, annot=True, fmt=".0f", ax=ax)
+    return fig
+
+
+def save(fig: plt.Figure, path: str | os.PathLike) -> Path:
+    """Write ``fig`` to ``path`` and close it, even if saving fails."""
+    import matplotlib.pyplot as plt
+
+    path = Path(path)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fig.savefig(path, bbox_inches="tight")
+    finally:
+        plt.close(fig)
+    return path
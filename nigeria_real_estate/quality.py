@@ -0,0 +1,303 @@
+"""Declarative data-quality rules, checked over the whole frame at once.
+
+Each rule is a small dataclass that compiles to a boolean mask of the rows
+violating it.  Rules on categorical columns are decided once per category
+and looked up through the category codes, so no rule touches a string per
+row.  ``validate`` evaluates every rule into one (rows x rules) mask and
+returns a ``QualityReport`` that counts the violations and lists the
+offending rows with their reasons.
+
+``default_rules`` encodes the problems the EDA found by eye: towns filed
+under the wrong state (the Anambara listings in Lekki, Ajah or Akure),
+blocks of flats with too few bedrooms for several flats, fewer toilets
+than bathrooms, implausibly low prices and states with too few listings
+for their averages to mean anything (Borno's "highest prices" come from a
+single listing).
+"""
+
+from __future__ import annotations
+
+import operator
+from abc import ABC, abstractmethod
+from collections.abc import Hashable, Mapping, Sequence
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from nigeria_real_estate.schema import PRICE_COLUMN
+
+OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+def _category_mask(series: pd.Series, predicate) -> np.ndarray:
+    """``predicate`` applied to each distinct value, broadcast to the rows.
+
+    ``predicate`` maps an array of values to a boolean array; missing values
+    count as ``False``.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        per_category = np.append(
+            np.asarray(predicate(series.cat.categories.to_numpy()), dtype=bool), False
+        )
+        return per_category[series.array.codes]
+    codes, uniques = pd.factorize(series)
+    per_value = np.append(np.asarray(predicate(uniques), dtype=bool), False)
+    return per_value[codes]
+
+
+def _where(df: pd.DataFrame, where: Mapping[str, Hashable]) -> np.ndarray:
+    mask = np.ones(len(df), dtype=bool)
+    for column, value in where.items():
+        mask &= _category_mask(df[column], lambda values, v=value: values == v)
+    return mask
+
+
+class Rule(ABC):
+    """A named check; ``violations`` marks the rows that fail it.
+
+    Subclasses must implement ``violations``; one that does not cannot be
+    instantiated.
+    """
+
+    name: str
+    reason: str
+
+    @abstractmethod
+    def violations(self, df: pd.DataFrame) -> np.ndarray:
+        """Boolean mask of the rows of ``df`` that fail the rule."""
+
+    def reasons(self, rows: pd.DataFrame) -> pd.Series:
+        """Why each of the violating ``rows`` fails; the fixed reason by default."""
+        return pd.Series(self.reason, index=rows.index)
+
+
+@dataclass(frozen=True)
+class Compare(Rule):
+    """``left op right``, where ``right`` is a column name or a constant."""
+
+    name: str
+    left: str
+    op: str
+    right: str | float
+    reason: str = ""
+
+    def __post_init__(self):
+        if self.op not in OPERATORS:
+            raise ValueError(f"op must be one of {list(OPERATORS)}, not {self.op!r}")
+        if not self.reason:
+            object.__setattr__(
+                self, "reason", f"expected {self.left} {self.op} {self.right}"
+            )
+
+    def violations(self, df: pd.DataFrame) -> np.ndarray:
+        left = df[self.left].to_numpy(dtype=np.float64)
+        right = self.right
+        if isinstance(right, str):
+            right = df[right].to_numpy(dtype=np.float64)
+        with np.errstate(invalid="ignore"):
+            holds = OPERATORS[self.op](left, right)
+        # A missing operand is not a violation of this rule.
+        return ~holds & ~np.isnan(left + right)
+
+
+@dataclass(frozen=True)
+class Between(Rule):
+    """``low <= column <= high`` on the rows matching ``where``."""
+
+    name: str
+    column: str
+    low: float | None = None
+    high: float | None = None
+    where: Mapping[str, Hashable] = field(default_factory=dict)
+    reason: str = ""
+
+    def __post_init__(self):
+        if not self.reason:
+            scope = " and ".join(f"{c} == {v!r}" for c, v in self.where.items())
+            bounds = [f"{self.low} <= " if self.low is not None else ""]
+            bounds.append(self.column)
+            bounds.append(f" <= {self.high}" if self.high is not None else "")
+            reason = f"expected {''.join(bounds)}"
+            object.__setattr__(
+                self, "reason", f"{reason} when {scope}" if scope else reason
+            )
+
+    def violations(self, df: pd.DataFrame) -> np.ndarray:
+        values = df[self.column].to_numpy(dtype=np.float64)
+        outside = np.zeros(len(df), dtype=bool)
+        if self.low is not None:
+            outside |= values < self.low
+        if self.high is not None:
+            outside |= values > self.high
+        return outside & _where(df, self.where) if self.where else outside
+
+
+@dataclass(frozen=True)
+class ValueIn(Rule):
+    """``column`` only takes the ``allowed`` values (missing values fail)."""
+
+    name: str
+    column: str
+    allowed: Sequence[Hashable]
+    reason: str = ""
+
+    def __post_init__(self):
+        if not self.reason:
+            allowed = ", ".join(map(str, self.allowed))
+            object.__setattr__(self, "reason", f"{self.column} not in {{{allowed}}}")
+
+    def violations(self, df: pd.DataFrame) -> np.ndarray:
+        allowed = list(self.allowed)
+        return ~_category_mask(
+            df[self.column], lambda values: pd.Index(values).isin(allowed)
+        )
+
+
+@dataclass(frozen=True)
+class TownInState(Rule):
+    """Every town listed in ``towns`` lies in the state it maps to.
+
+    Towns missing from ``towns`` are not checked.
+    """
+
+    name: str
+    towns: Mapping[str, str]
+    town: str = "town"
+    state: str = "state"
+    reason: str = "town belongs to another state"
+
+    def violations(self, df: pd.DataFrame) -> np.ndarray:
+        expected = self._expected(df)
+        actual = df[self.state].astype(object).to_numpy()
+        return pd.notna(expected) & (expected != actual)
+
+    def _expected(self, df: pd.DataFrame) -> np.ndarray:
+        towns = df[self.town]
+        lookup = pd.Series(self.towns, dtype=object)
+        if isinstance(towns.dtype, pd.CategoricalDtype):
+            per_category = lookup.reindex(towns.cat.categories).to_numpy()
+            return np.append(per_category, None)[towns.array.codes]
+        return lookup.reindex(towns.astype(object)).to_numpy()
+
+    def reasons(self, rows: pd.DataFrame) -> pd.Series:
+        expected = self._expected(rows)
+        return pd.Series(
+            [
+                f"{town} is in {state}, not {actual}"
+                for town, state, actual in zip(
+                    rows[self.town], expected, rows[self.state]
+                )
+            ],
+            index=rows.index,
+            dtype=object,
+        )
+
+
+@dataclass(frozen=True)
+class MinGroupSize(Rule):
+    """Every ``column`` value has at least ``min_rows`` rows in the frame."""
+
+    name: str
+    column: str
+    min_rows: int
+    reason: str = ""
+
+    def __post_init__(self):
+        if not self.reason:
+            object.__setattr__(
+                self,
+                "reason",
+                f"fewer than {self.min_rows} listings share this {self.column}",
+            )
+
+    def violations(self, df: pd.DataFrame) -> np.ndarray:
+        codes, uniques = pd.factorize(df[self.column])
+        sizes = np.append(np.bincount(codes[codes >= 0], minlength=len(uniques)), 0)
+        return (sizes < self.min_rows)[codes] & (codes >= 0)
+
+
+def majority_states(
+    df: pd.DataFrame, min_share: float = 0.9, min_rows: int = 5
+) -> dict[str, str]:
+    """``{town: state}`` for towns listed mostly under one state.
+
+    A town qualifies when at least ``min_rows`` of its listings and a
+    ``min_share`` of them name the same state; the rest are filed wrongly.
+    """
+    pairs = df.groupby(["town", "state"], observed=True).size()
+    totals = pairs.groupby(level="town", observed=True).transform("sum")
+    top = pairs[pairs >= min_share * totals]
+    top = top[top >= min_rows]
+    return {town: state for town, state in top.index}
+
+
+def default_rules(df: pd.DataFrame) -> list[Rule]:
+    """The checks the EDA made by eye, with town-state pairs learnt from ``df``."""
+    return [
+        TownInState("town_in_state", majority_states(df)),
+        # A block holds several flats, so fewer than four bedrooms in total
+        # means the row describes one flat.
+        Between(
+            "block_of_flats_bedrooms",
+            "bedrooms",
+            low=4,
+            where={"title": "Block of Flats"},
+        ),
+        Compare("toilets_vs_bathrooms", "toilets", ">=", "bathrooms"),
+        Between("price_floor", PRICE_COLUMN, low=1_000_000),
+        MinGroupSize("state_sample_size", "state", 5),
+    ]
+
+
+@dataclass
+class QualityReport:
+    """Which rows violate which rules."""
+
+    df: pd.DataFrame
+    rules: list[Rule]
+    # One column per rule, named after it; True where the row violates it.
+    mask: pd.DataFrame
+
+    @property
+    def valid(self) -> pd.Series:
+        """True for the rows that pass every rule."""
+        return ~self.mask.any(axis=1)
+
+    def counts(self) -> pd.Series:
+        """Number of rows violating each rule."""
+        return self.mask.sum().rename("violations")
+
+    def violations(self) -> pd.DataFrame:
+        """One row per (listing, failed rule) with the rule name and reason."""
+        parts = []
+        for rule in self.rules:
+            rows = self.df[self.mask[rule.name].to_numpy()]
+            if len(rows):
+                parts.append(
+                    rows.assign(rule=rule.name, reason=rule.reasons(rows).to_numpy())
+                )
+        if not parts:
+            return self.df.iloc[:0].assign(rule=pd.Series(dtype=object), reason="")
+        return pd.concat(parts).sort_index(kind="stable")
+
+
+def validate(df: pd.DataFrame, rules: Sequence[Rule] | None = None) -> QualityReport:
+    """Check ``df`` against ``rules`` (``default_rules(df)`` if None)."""
+    rules = default_rules(df) if rules is None else list(rules)
+    names = [rule.name for rule in rules]
+    if len(set(names)) != len(names):
+        raise ValueError("rule names must be unique")
+    mask = np.empty((len(df), len(rules)), dtype=bool)
+    for position, rule in enumerate(rules):
+        mask[:, position] = rule.violations(df)
+    return QualityReport(
+        df=df, rules=rules, mask=pd.DataFrame(mask, index=df.index, columns=names)
+    )
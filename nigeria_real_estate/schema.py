@@ -0,0 +1,19 @@
+"""Column layout and dtypes of the listings table."""
+
+from __future__ import annotations
+
+import numpy as np
+
+COUNT_COLUMNS = ["bedrooms", "bathrooms", "toilets", "parking_space"]
+CATEGORY_COLUMNS = ["title", "town", "state"]
+PRICE_COLUMN = "price"
+
+COLUMNS = [*COUNT_COLUMNS, *CATEGORY_COLUMNS, PRICE_COLUMN]
+NUMERIC_COLUMNS = [*COUNT_COLUMNS, PRICE_COLUMN]
+
+# Room and parking counts are single digits; prices are whole naira.
+DTYPES = {
+    **{column: np.int8 for column in COUNT_COLUMNS},
+    **{column: "category" for column in CATEGORY_COLUMNS},
+    PRICE_COLUMN: np.int64,
+}
@@ -0,0 +1,201 @@
+"""Vectorized mean, median, mode and skew, for one column or every group.
+
+These replace ``statistics.mean`` and ``statistics.mode``, which walk the
+column one Python object at a time.  Integer prices are summed exactly in
+int64 before dividing, so means of naira amounts near 1e12 keep their
+precision; float columns use numpy's pairwise summation.
+
+The grouped versions sort the rows by group once and reduce each
+contiguous run with ``np.add.reduceat``, so all groups come from one call.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Hashable, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def _values(values) -> np.ndarray:
+    return values.to_numpy() if isinstance(values, pd.Series) else np.asarray(values)
+
+
+def _sum(values: np.ndarray) -> float:
+    if values.dtype.kind in "iub":
+        return float(values.sum(dtype=np.int64))
+    return float(values.sum(dtype=np.float64))
+
+
+def stable_order(codes: np.ndarray, n_codes: int) -> np.ndarray:
+    """Stable argsort of small non-negative integer ``codes``.
+
+    numpy radix-sorts 16-bit integers, so when the codes fit in 16 bits the
+    sort is linear in the number of rows.
+    """
+    if n_codes <= np.iinfo(np.uint16).max:
+        codes = codes.astype(np.uint16)
+    return np.argsort(codes, kind="stable")
+
+
+def mean(values) -> float:
+    """Arithmetic mean; like ``statistics.mean`` but vectorized."""
+    values = _values(values)
+    if not len(values):
+        raise ValueError("mean requires at least one data point")
+    return _sum(values) / len(values)
+
+
+def median(values) -> float:
+    """Median; the average of the middle two values for even lengths."""
+    values = _values(values)
+    if not len(values):
+        raise ValueError("median requires at least one data point")
+    return float(np.median(values))
+
+
+def mode(values) -> Hashable:
+    """Most common value; ties go to the value seen first, as in ``statistics``.
+
+    Works on numbers, strings and categoricals alike by counting the
+    factorized codes with ``np.bincount``.
+    """
+    codes, uniques = pd.factorize(values)
+    codes = codes[codes >= 0]
+    if not len(codes):
+        raise ValueError("mode requires at least one data point")
+    return uniques[int(np.argmax(np.bincount(codes)))]
+
+
+def skew(values) -> float:
+    """Sample skewness (adjusted Fisher-Pearson), as ``Series.skew()``."""
+    x = _values(values).astype(np.float64)
+    n = len(x)
+    if n < 3:
+        return np.nan
+    centred = x - x.mean()
+    m2 = np.mean(centred**2)
+    m3 = np.mean(centred**3)
+    if m2 == 0:
+        return 0.0
+    return float(np.sqrt(n * (n - 1)) / (n - 2) * m3 / m2**1.5)
+
+
+def group_codes(
+    df: pd.DataFrame, by: str | Sequence[str]
+) -> tuple[np.ndarray, pd.Index]:
+    """Group number of every row (-1 for a missing key) and the sorted keys."""
+    keys = [by] if isinstance(by, str) else list(by)
+    if len(keys) == 1:
+        codes, uniques = pd.factorize(df[keys[0]], sort=True)
+        return codes, pd.Index(uniques, name=keys[0])
+    codes, uniques = pd.factorize(pd.MultiIndex.from_frame(df[keys]), sort=True)
+    return codes, pd.MultiIndex.from_tuples(list(uniques), names=keys)
+
+
+class GroupIndex:
+    """Rows of a frame sorted into contiguous runs, one per group.
+
+    Build it once and pass it to ``grouped``/``grouped_mode`` to reuse the
+    sort across several columns.
+    """
+
+    def __init__(self, df: pd.DataFrame, by: str | Sequence[str]):
+        codes, self.keys = group_codes(df, by)
+        # Shifted by one so rows with a missing key (-1) sort first.
+        order = stable_order(codes + 1, len(self.keys) + 1)
+        self.order = order[np.count_nonzero(codes < 0):]
+        self.codes = codes[self.order]
+        self.sizes = np.bincount(self.codes, minlength=len(self.keys))
+        self.starts = np.concatenate(([0], np.cumsum(self.sizes)[:-1]))
+
+    def take(self, values) -> np.ndarray:
+        """``values`` reordered into the group runs."""
+        return _values(values)[self.order]
+
+
+def _reduce(index: GroupIndex, x: np.ndarray) -> np.ndarray:
+    if not len(x):
+        return np.zeros(len(index.keys), dtype=x.dtype)
+    return np.add.reduceat(x, index.starts)
+
+
+def grouped(
+    df: pd.DataFrame,
+    by: str | Sequence[str] | GroupIndex,
+    column: str = "price",
+    stats: Sequence[str] = ("count", "mean", "median", "skew"),
+) -> pd.DataFrame:
+    """``count``, ``mean``, ``median`` and/or ``skew`` of ``column`` per group."""
+    index = by if isinstance(by, GroupIndex) else GroupIndex(df, by)
+    x = index.take(df[column])
+    n = index.sizes.astype(np.float64)
+    result = {}
+
+    if "count" in stats:
+        result["count"] = index.sizes
+
+    exact = x.dtype.kind in "iub"
+    totals = _reduce(index, x.astype(np.int64 if exact else np.float64))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = totals / n
+    if "mean" in stats:
+        result["mean"] = means
+
+    if "median" in stats:
+        # Sort values within each run; the group codes keep the runs apart.
+        ordered = x[np.lexsort((x, index.codes))].astype(np.float64)
+        lower = index.starts + (index.sizes - 1) // 2
+        upper = index.starts + index.sizes // 2
+        valid = index.sizes > 0
+        medians = np.full(len(index.keys), np.nan)
+        medians[valid] = (ordered[lower[valid]] + ordered[upper[valid]]) / 2
+        result["median"] = medians
+
+    if "skew" in stats:
+        centred = x.astype(np.float64) - np.repeat(means, index.sizes)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            m2 = _reduce(index, centred**2) / n
+            m3 = _reduce(index, centred**3) / n
+            skews = np.sqrt(n * (n - 1)) / (n - 2) * m3 / m2**1.5
+        skews[n < 3] = np.nan
+        skews[(n >= 3) & (m2 == 0)] = 0.0
+        result["skew"] = skews
+
+    return pd.DataFrame(result, index=index.keys)[list(stats)]
+
+
+def grouped_mode(
+    df: pd.DataFrame, by: str | Sequence[str] | GroupIndex, column: str = "title"
+) -> pd.DataFrame:
+    """Most common value of ``column`` per group, with how often it occurs.
+
+    One ``np.bincount`` over (group, value) codes counts every pair at once.
+    Ties go to the value that appears first in the group, as
+    ``statistics.mode`` would pick on that group's rows.
+    """
+    index = by if isinstance(by, GroupIndex) else GroupIndex(df, by)
+    codes, uniques = pd.factorize(df[column])
+    codes = index.take(codes)
+    keep = codes >= 0
+    pairs = index.codes[keep] * len(uniques) + codes[keep]
+    shape = (len(index.keys), len(uniques))
+    counts = np.bincount(pairs, minlength=shape[0] * shape[1]).reshape(shape)
+
+    # Rows keep their original order within each run, so the first row of
+    # each pair after a stable sort is where that value first appears.
+    order = stable_order(pairs, shape[0] * shape[1])
+    ordered = pairs[order]
+    starts = np.flatnonzero(np.diff(ordered, prepend=-1))
+    firsts = np.full(shape[0] * shape[1], len(pairs))
+    firsts[ordered[starts]] = order[starts]
+    firsts = firsts.reshape(shape)
+    tied = counts == counts.max(axis=1, keepdims=True)
+    best = np.where(tied, firsts, len(pairs) + 1).argmin(axis=1)
+    return pd.DataFrame(
+        {
+            "mode": np.asarray(uniques)[best],
+            "count": counts[np.arange(shape[0]), best],
+        },
+        index=index.keys,
+    )
@@ -0,0 +1,92 @@
+"""Appending to and retracting from the incremental aggregates."""
+
+from __future__ import annotations
+
+import copy
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from nigeria_real_estate.aggregates import IncrementalAggregates
+from nigeria_real_estate.loader import read_csv
+
+QUANTILES = [0.1, 0.5, 0.9]
+
+
+@pytest.fixture(scope="module")
+def listings() -> pd.DataFrame:
+    return read_csv()
+
+
+def snapshot(aggregates: IncrementalAggregates) -> dict:
+    return {
+        by: (
+            aggregates.counts(by),
+            aggregates.means(by),
+            aggregates.modes(by),
+            aggregates.quantiles(QUANTILES, by),
+        )
+        for by in ("state", ("state", "town"))
+    }
+
+
+def assert_same(a: dict, b: dict) -> None:
+    for by in a:
+        for left, right in zip(a[by], b[by]):
+            if isinstance(left, pd.DataFrame):
+                pd.testing.assert_frame_equal(left, right)
+            else:
+                pd.testing.assert_series_equal(left, right)
+
+
+def test_matches_pandas(listings):
+    aggregates = IncrementalAggregates.from_frame(listings)
+    grouped = listings.groupby("state", observed=True)["price"]
+    assert aggregates.counts("state").to_dict() == grouped.size().to_dict()
+    np.testing.assert_allclose(aggregates.means("state"), grouped.mean())
+    exact = grouped.quantile(QUANTILES).unstack()
+    estimate = aggregates.quantiles(QUANTILES, "state")
+    np.testing.assert_allclose(estimate, exact, rtol=0.01)
+
+
+def test_retract_restores_previous_state(listings):
+    base, batch = listings.iloc[:15000], listings.iloc[15000:]
+    aggregates = IncrementalAggregates.from_frame(base)
+    before = snapshot(aggregates)
+    aggregates.add(batch)
+    aggregates.retract(batch)
+    assert_same(snapshot(aggregates), before)
+    assert_same(before, snapshot(IncrementalAggregates.from_frame(base)))
+
+
+def test_retracting_unknown_rows_raises_and_changes_nothing(listings):
+    aggregates = IncrementalAggregates.from_frame(listings.iloc[:1000])
+    groups = copy.deepcopy(aggregates.groups)
+    # One row that was added and one that was not: nothing may be taken out.
+    batch = pd.concat([listings.iloc[:1], listings.iloc[5000:5001]])
+    unknown = batch.assign(state=pd.Series(["Atlantis"] * 2, index=batch.index))
+    for rows in (listings.iloc[5000:], unknown, pd.concat([batch] * 1000)):
+        with pytest.raises(ValueError, match="never added"):
+            aggregates.retract(rows)
+        assert aggregates.groups == groups
+
+
+def test_mode_ties_do_not_depend_on_history():
+    rows = pd.DataFrame(
+        {
+            "state": ["Lagos"] * 2,
+            "town": ["Lekki"] * 2,
+            "title": ["Detached Duplex", "Terraced Duplexes"],
+            "price": [1e8, 2e8],
+        }
+    )
+    aggregates = IncrementalAggregates.from_frame(rows)
+    assert aggregates.modes("state")["Lagos"] == "Detached Duplex"
+    # Taking a title out completely and back in moves it to the end of the
+    # title counter; the tie must still go the same way.
+    detached = rows.iloc[[0]]
+    aggregates.retract(detached)
+    assert aggregates.modes("state")["Lagos"] == "Terraced Duplexes"
+    aggregates.add(detached)
+    assert aggregates.modes("state")["Lagos"] == "Detached Duplex"
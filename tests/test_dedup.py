@@ -0,0 +1,92 @@
+"""Row hashing and deduplication across batches and on-disk stores."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from nigeria_real_estate.dedup import (
+    SeenSet,
+    SeenStore,
+    dedup_batch,
+    drop_duplicates,
+    row_hashes,
+)
+from nigeria_real_estate.loader import DEFAULT_PATH, read_csv
+
+
+@pytest.fixture(scope="module")
+def listings() -> pd.DataFrame:
+    return read_csv()
+
+
+def batches(df: pd.DataFrame, n: int) -> list[pd.DataFrame]:
+    bounds = np.linspace(0, len(df), n + 1).astype(int)
+    return [df.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+
+def seen_before(batch: pd.DataFrame, history: pd.DataFrame) -> pd.Series:
+    rows = pd.MultiIndex.from_frame(batch)
+    return pd.Series(rows.isin(pd.MultiIndex.from_frame(history)), batch.index)
+
+
+def test_hashes_ignore_dtypes(listings):
+    raw = pd.read_csv(DEFAULT_PATH)
+    text = listings.astype({c: object for c in ("title", "town", "state")})
+    expected = row_hashes(listings)
+    np.testing.assert_array_equal(row_hashes(raw), expected)
+    np.testing.assert_array_equal(row_hashes(text), expected)
+
+
+def test_drop_duplicates_matches_pandas(listings):
+    deduplicated, dropped = drop_duplicates(listings)
+    assert dropped == listings.duplicated().sum()
+    pd.testing.assert_frame_equal(deduplicated, listings.drop_duplicates())
+
+
+@pytest.mark.parametrize("store", ["set", "disk"])
+def test_batches_match_pandas(listings, tmp_path, store):
+    # Twelve batches push a store with max_runs=8 through a compaction.
+    seen = SeenSet() if store == "set" else SeenStore(tmp_path)
+    kept, reports = [], []
+    for batch in batches(listings, 12):
+        survivors, report = dedup_batch(batch, seen)
+        kept.append(survivors)
+        reports.append(report)
+
+    duplicated = listings.duplicated()
+    assert sum(r.duplicates for r in reports) == duplicated.sum()
+    assert len(seen) == (~duplicated).sum()
+    pd.testing.assert_frame_equal(pd.concat(kept), listings[~duplicated])
+    for batch, report in zip(batches(listings, 12), reports):
+        known = seen_before(batch, listings.iloc[: batch.index[0]])
+        assert report.already_seen == known.sum()
+        assert report.within_batch == batch[~known].duplicated().sum()
+    if store == "disk":
+        assert len(seen.runs) <= seen.max_runs
+        assert len(list(tmp_path.glob("run-*.npy"))) == len(seen.runs)
+
+
+def test_store_survives_reopening_after_compaction(listings, tmp_path):
+    store = SeenStore(tmp_path, max_runs=2)
+    parts = batches(listings, 6)
+    for batch in parts[:5]:
+        dedup_batch(batch, store)
+    assert len(store.runs) <= 2
+
+    reopened = SeenStore(tmp_path, max_runs=2)
+    assert len(reopened) == len(store)
+    _, report = dedup_batch(parts[5], reopened)
+    assert report.already_seen == seen_before(parts[5], pd.concat(parts[:5])).sum()
+    assert report.duplicates == listings.duplicated().iloc[-len(parts[5]):].sum()
+
+
+def test_seen_set_runs_stay_few():
+    seen = SeenSet()
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        seen.add(rng.integers(0, 2**63, 50, dtype=np.uint64))
+    assert len(seen) == len(np.unique(seen.keys)) == 200 * 50
+    assert len(seen.runs) == 1
+    assert np.all(np.diff(seen.keys.astype(np.float64)) >= 0)
@@ -0,0 +1,92 @@
+"""State and town matching and relabelling by the gazetteer."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from nigeria_real_estate.gazetteer import Gazetteer, canonicalise
+
+
+@pytest.fixture(scope="module")
+def gazetteer() -> Gazetteer:
+    return Gazetteer()
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("Lagos", ("LA", "exact")),
+        ("lagos state", ("LA", "exact")),
+        ("FCT", ("FC", "exact")),
+        ("Kastina", ("KT", "fuzzy")),
+        ("Anambara", ("AN", "fuzzy")),
+        ("Atlantis", (None, "unknown")),
+    ],
+)
+def test_state_lookup(gazetteer, raw, expected):
+    assert gazetteer.state(raw) == expected
+
+
+def test_misspelt_state_moves_the_town(gazetteer):
+    resolved = gazetteer.resolve("Anambara", "Lekki")
+    assert (resolved["state"], resolved["town"]) == ("Lagos", "Lekki")
+    assert (resolved["state_match"], resolved["town_match"]) == ("fuzzy", "moved")
+
+
+def test_exact_state_keeps_the_town_where_it_is(gazetteer):
+    # Akure is only known in Ondo, but a feed's "Akure" under an exactly
+    # spelt state may be another place of that name.
+    resolved = gazetteer.resolve("Lagos", "Akure")
+    assert (resolved["state"], resolved["town"]) == ("Lagos", "Akure")
+    assert resolved["town_id"] is None
+    assert resolved["town_match"] == "conflict"
+
+
+@pytest.mark.parametrize("state", ["Kano", "Kanoo"])
+def test_town_in_several_states_is_ambiguous(gazetteer, state):
+    resolved = gazetteer.resolve(state, "Karu")
+    assert (resolved["state"], resolved["town"]) == ("Kano", "Karu")
+    assert resolved["town_match"] == "ambiguous"
+
+
+def test_fuzzy_town_and_aliases(gazetteer):
+    assert gazetteer.resolve("Lagoss", "Ikejaa")["town_id"] == "NG-LA/ikeja"
+    assert gazetteer.resolve("Lagos State", "Lekki Phase 1")["town"] == "Lekki"
+
+
+def test_canonicalise_relabels_rows_through_the_mapping(gazetteer):
+    df = pd.DataFrame(
+        {
+            "state": ["Anambara", "Lagos", "Lagos", None, "Anambara", "Lagos"],
+            "town": ["Lekki", "Lekki Phase 1", "Akure", "Ikeja", "Lekki", None],
+            "price": np.arange(6.0),
+        }
+    )
+    result, mapping = canonicalise(df, gazetteer)
+    relabelled = result[["state", "town"]].astype(object).where(result.notna(), None)
+    assert relabelled.values.tolist() == [
+        ["Lagos", "Lekki"],
+        ["Lagos", "Lekki"],
+        ["Lagos", "Akure"],
+        [None, "Ikeja"],
+        ["Lagos", "Lekki"],
+        ["Lagos", None],
+    ]
+    assert mapping["rows"].sum() == len(df)
+    assert len(mapping) == 5
+    pd.testing.assert_series_equal(result["price"], df["price"])
+
+
+def test_canonicalise_many_distinct_towns(gazetteer):
+    rng = np.random.default_rng(0)
+    towns = [f"Estate {i}" for i in rng.integers(0, 3000, 10_000)]
+    states = rng.choice(["Lagos", "Ogun", "Oyo", "Lagoss"], len(towns))
+    df = pd.DataFrame({"state": states, "town": towns})
+    result, mapping = canonicalise(df, gazetteer)
+    assert len(mapping) == len(df.drop_duplicates())
+    assert mapping["rows"].sum() == len(df)
+    expected = df["state"].replace({"Lagoss": "Lagos"})
+    assert result["state"].astype(str).tolist() == expected.tolist()
+    assert result["town"].astype(str).tolist() == towns
@@ -0,0 +1,171 @@
+"""Failure handling and backpressure of the async ingestion pipeline."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from nigeria_real_estate import ingest
+from nigeria_real_estate.aggregates import IncrementalAggregates
+
+HEADER = b"bedrooms,bathrooms,toilets,parking_space,title,town,state,price\n"
+ROWS = [
+    b"3,3,4,2,Detached Duplex,Lekki,Lagos,450000000\n",
+    b"2,2,3,1,Terraced Duplexes,Gwarinpa,Abuja,90000000\n",
+    b"4,4,5,3,Semi Detached Duplex,Ikeja,Lagos,120000000\n",
+]
+
+
+def batch(*rows: bytes, source: str = "test") -> ingest.RawBatch:
+    return ingest.RawBatch(source, HEADER + b"".join(rows))
+
+
+async def batches(*items: ingest.RawBatch):
+    for item in items:
+        yield item
+
+
+def run(coro, timeout: float = 10):
+    """Run ``coro``, failing the test instead of hanging."""
+    return asyncio.run(asyncio.wait_for(coro, timeout))
+
+
+class FailingAggregates(IncrementalAggregates):
+    def add(self, batch):
+        raise RuntimeError("aggregates unavailable")
+
+
+class BlockingAggregates(IncrementalAggregates):
+    """Holds every ``add`` until ``release`` is set."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def add(self, batch):
+        self.release.wait(10)
+        super().add(batch)
+
+
+def test_ingest_counts_rejects_and_duplicates():
+    bad = b"x,1,1,1,Flat,Lekki,Lagos,1000000\n"
+    aggregates, stats = run(
+        ingest.ingest([batches(batch(*ROWS, bad), batch(ROWS[0], ROWS[1]))])
+    )
+    assert (stats.rows_in, stats.rejected, stats.duplicates) == (6, 1, 2)
+    assert stats.rows_added == 3
+    assert aggregates.counts("state").to_dict() == {"Abuja": 1, "Lagos": 2}
+
+
+def test_parse_batch_rejects_rows_outside_the_schema():
+    rows, rejected = ingest.parse_batch(
+        HEADER
+        + ROWS[0]
+        + b"-1,1,1,1,Flat,Lekki,Lagos,1000000\n"
+        + b"300,1,1,1,Flat,Lekki,Lagos,1000000\n"
+        + b"1,1,1,1,Flat,Lekki,Lagos,0\n"
+        + b"1,1,1,1,Flat,,Lagos,1000000\n"
+    )
+    assert (len(rows), rejected) == (1, 4)
+    with pytest.raises(ValueError, match="lacks column"):
+        ingest.parse_batch(b"a,b\n1,2\n")
+
+
+def test_sink_failure_is_raised_not_hung():
+    sources = [batches(*(batch(*ROWS) for _ in range(50)))]
+    with pytest.raises(RuntimeError, match="aggregates unavailable"):
+        run(ingest.ingest(sources, aggregates=FailingAggregates(), queue_size=1))
+
+
+def test_parser_failure_is_raised_not_hung(monkeypatch):
+    def broken(data):
+        raise MemoryError("parser ran out of memory")
+
+    monkeypatch.setattr(ingest, "parse_batch", broken)
+    with pytest.raises(MemoryError):
+        run(ingest.ingest([batches(*(batch(*ROWS) for _ in range(50)))]))
+
+
+def test_submit_fails_once_a_worker_has_failed():
+    async def scenario():
+        async with ingest.Ingestor(
+            aggregates=FailingAggregates(), queue_size=1
+        ) as ingestor:
+            for _ in range(50):
+                await ingestor.submit(batch(*ROWS))
+
+    with pytest.raises(RuntimeError, match="aggregates unavailable"):
+        run(scenario())
+
+
+def test_full_queues_make_submit_wait():
+    aggregates = BlockingAggregates()
+
+    async def scenario():
+        async with ingest.Ingestor(
+            aggregates=aggregates, queue_size=1, parsers=1
+        ) as ingestor:
+            accepted = 0
+
+            async def produce():
+                nonlocal accepted
+                for i in range(20):
+                    await ingestor.submit(batch(ROWS[i % 3], source=str(i)))
+                    accepted += 1
+
+            producer = asyncio.create_task(produce())
+            await asyncio.sleep(0.5)
+            # One batch in the sink, one in each queue and one being parsed.
+            assert not producer.done()
+            assert accepted <= 4
+            assert ingestor._raw.qsize() <= 1 and ingestor._parsed.qsize() <= 1
+            aggregates.release.set()
+            await producer
+        return ingestor.stats
+
+    stats = run(scenario())
+    assert (stats.batches, stats.rows_added, stats.duplicates) == (20, 3, 17)
+
+
+def test_file_source_batches_rows(tmp_path):
+    path = tmp_path / "listings.csv"
+    path.write_bytes(HEADER + b"".join(ROWS * 3))
+
+    async def scenario():
+        return [item async for item in ingest.file_source(path, rows_per_batch=4)]
+
+    items = run(scenario())
+    assert [len(ingest.parse_batch(item.data)[0]) for item in items] == [4, 4, 1]
+    assert all(item.data.startswith(HEADER) for item in items)
+
+
+def test_slow_disk_does_not_block_the_loop(tmp_path, monkeypatch):
+    path = tmp_path / "listings.csv"
+    path.write_bytes(HEADER + b"".join(ROWS))
+
+    def slow_open(*args, **kwargs):
+        time.sleep(0.3)
+        return open(*args, **kwargs)
+
+    monkeypatch.setattr(ingest, "open", slow_open, raising=False)
+
+    async def scenario():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        items = [item async for item in ingest.file_source(path)]
+        ticker.cancel()
+        return items, ticks
+
+    items, ticks = run(scenario())
+    assert len(items) == 1
+    assert ticks >= 10
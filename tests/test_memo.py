@@ -0,0 +1,108 @@
+"""Cache keys of the result cache and what invalidates them."""
+
+from __future__ import annotations
+
+import pickle
+
+import pandas as pd
+import pytest
+
+from nigeria_real_estate import memo
+from nigeria_real_estate.memo import ResultCache, fingerprint
+
+
+def define(source: str):
+    """``summary`` as defined by ``source``, always under the same name."""
+    namespace = {"__name__": "tests.memo_case", "calls": []}
+    exec(source, namespace)
+    return namespace["summary"], namespace["calls"]
+
+
+MEAN = """
+def summary(df):
+    calls.append(1)
+    return df["price"].mean()
+"""
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {"state": ["Lagos", "Abuja", "Lagos"], "price": [1e8, 2e8, 3e8]}
+    )
+
+
+def test_hit_on_unchanged_inputs(tmp_path, frame):
+    cache = ResultCache(tmp_path)
+    summary, calls = define(MEAN)
+    assert cache.call(summary, frame) == cache.call(summary, frame.copy()) == 2e8
+    assert len(calls) == 1
+
+
+def test_miss_when_data_changes(tmp_path, frame):
+    cache = ResultCache(tmp_path)
+    summary, calls = define(MEAN)
+    cache.call(summary, frame)
+    changed = frame.assign(price=[1e8, 2e8, 6e8])
+    assert cache.call(summary, changed) == 3e8
+    assert len(calls) == 2
+
+
+def test_miss_when_code_changes(tmp_path, frame):
+    cache = ResultCache(tmp_path)
+    mean, _ = define(MEAN)
+    median, calls = define(MEAN.replace(".mean()", ".median()"))
+    constant, _ = define(MEAN.replace('"price"', '"state"').replace("mean", "max"))
+    assert mean.__qualname__ == median.__qualname__
+    cache.call(mean, frame)
+    assert cache.call(median, frame) == 2e8
+    assert len(calls) == 1
+    assert len({cache.key(f, frame) for f in (mean, median, constant)}) == 3
+
+
+def test_miss_when_package_source_changes(tmp_path, monkeypatch, frame):
+    package = tmp_path / "package"
+    package.mkdir()
+    (package / "helpers.py").write_text("SCALE = 1\n")
+    monkeypatch.setattr(memo, "__file__", str(package / "memo.py"))
+    memo.package_digest.cache_clear()
+    try:
+        cache = ResultCache(tmp_path / "cache")
+        summary, _ = define(MEAN)
+        before = cache.key(summary, frame)
+        (package / "helpers.py").write_text("SCALE = 2\n")
+        memo.package_digest.cache_clear()
+        assert cache.key(summary, frame) != before
+    finally:
+        memo.package_digest.cache_clear()
+
+
+def test_unused_categories_change_the_fingerprint(frame):
+    states = frame.astype({"state": "category"})
+    wider = states.astype(
+        {"state": pd.CategoricalDtype(["Abuja", "Kano", "Lagos"])}
+    )
+    assert states["state"].tolist() == wider["state"].tolist()
+    assert fingerprint(states) != fingerprint(wider)
+    assert fingerprint(states) == fingerprint(states.copy())
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"",
+        pickle.dumps(list(range(100)))[:20],
+        b"cnigeria_real_estate.memo\nNoSuchHelper\n.",
+        b"cno_such_module\nHelper\n.",
+    ],
+    ids=["empty", "truncated", "missing-attribute", "missing-module"],
+)
+def test_unreadable_entry_is_a_miss(tmp_path, frame, content):
+    cache = ResultCache(tmp_path)
+    summary, calls = define(MEAN)
+    path = tmp_path / f"{cache.key(summary, frame)}.pkl"
+    path.write_bytes(content)
+    assert cache.call(summary, frame) == 2e8
+    assert len(calls) == 1
+    with open(path, "rb") as handle:
+        assert pickle.load(handle) == 2e8
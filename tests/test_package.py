@@ -0,0 +1,25 @@
+"""The package's lazy top-level re-exports."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import nigeria_real_estate
+
+
+def test_submodule_import_skips_the_rest():
+    code = (
+        "import sys, nigeria_real_estate.stats; "
+        "print(sorted(m for m in sys.modules if m.startswith('nigeria_real_estate')))"
+    )
+    loaded = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert loaded.strip() == "['nigeria_real_estate', 'nigeria_real_estate.stats']"
+
+
+def test_every_export_resolves():
+    for name in nigeria_real_estate.__all__:
+        assert getattr(nigeria_real_estate, name) is not None
+    from nigeria_real_estate import Ingestor, map_states  # noqa: F401
@@ -0,0 +1,33 @@
+"""Figure statistics that do not need a plotting backend."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from nigeria_real_estate.loader import read_csv
+from nigeria_real_estate.plots import box_stats, strip_sample
+
+
+def test_box_stats_from_sketches_match_exact():
+    df = read_csv()
+    exact = box_stats(df, "state", relative_error=None)
+    sketched = box_stats(df, "state")
+    pd.testing.assert_index_equal(sketched.index, exact.index)
+    columns = ["q1", "med", "q3"]
+    np.testing.assert_allclose(sketched[columns], exact[columns], rtol=0.01)
+    # A whisker may move to the next value where one sits on a fence.
+    assert (sketched["whislo"] <= sketched["q1"] * 1.01).all()
+    assert (sketched["whishi"] >= sketched["q3"] * 0.99).all()
+    coarse = box_stats(df, "state", relative_error=0.05)
+    np.testing.assert_allclose(coarse[columns], exact[columns], rtol=0.05)
+
+
+def test_strip_sample_keeps_group_extremes():
+    df = read_csv()
+    sample = strip_sample(df, "state", max_points=20)
+    assert sample.groupby("state", observed=True).size().max() <= 20
+    grouped = df.groupby("state", observed=True)["price"]
+    sampled = sample.groupby("state", observed=True)["price"]
+    pd.testing.assert_series_equal(sampled.min(), grouped.min())
+    pd.testing.assert_series_equal(sampled.max(), grouped.max())
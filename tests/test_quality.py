@@ -0,0 +1,130 @@
+"""Data-quality rules and the report that collects their violations."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from nigeria_real_estate.loader import read_csv
+from nigeria_real_estate.quality import (
+    Between,
+    Compare,
+    MinGroupSize,
+    Rule,
+    TownInState,
+    ValueIn,
+    majority_states,
+    validate,
+)
+
+
+@pytest.fixture(params=["object", "category"])
+def listings(request) -> pd.DataFrame:
+    df = pd.DataFrame(
+        {
+            "title": ["Block of Flats", "Block of Flats", "Flat", "Flat", None],
+            "town": ["Lekki", "Lekki", "Lekki", "Akure", "Ikeja"],
+            "state": ["Lagos", "Anambara", "Lagos", "Ondo", "Lagos"],
+            "bedrooms": [2, 6, 1, 3, 2],
+            "bathrooms": [2, 6, 1, 3, np.nan],
+            "toilets": [3, 5, 1, 4, 2],
+            "price": [5e7, 4e8, 5e5, 3e7, 9e7],
+        },
+        index=[10, 11, 12, 13, 14],
+    )
+    text = ["title", "town", "state"]
+    return df.astype({column: request.param for column in text})
+
+
+def flagged(rule: Rule, df: pd.DataFrame) -> list:
+    return df.index[rule.violations(df)].tolist()
+
+
+def test_compare(listings):
+    rule = Compare("toilets_vs_bathrooms", "toilets", ">=", "bathrooms")
+    # The missing bathroom count of row 14 is not a violation.
+    assert flagged(rule, listings) == [11]
+    assert flagged(Compare("cheap", "price", "<", 1e8), listings) == [11]
+    with pytest.raises(ValueError, match="op must be one of"):
+        Compare("bad", "price", "=<", 0)
+
+
+def test_between_with_where(listings):
+    rule = Between("flats", "bedrooms", low=4, where={"title": "Block of Flats"})
+    assert flagged(rule, listings) == [10]
+    assert rule.reason == "expected 4 <= bedrooms when title == 'Block of Flats'"
+    assert flagged(Between("floor", "price", low=1e6), listings) == [12]
+
+
+def test_value_in_fails_missing_values(listings):
+    rule = ValueIn("titles", "title", ["Flat", "Block of Flats"])
+    assert flagged(rule, listings) == [14]
+
+
+def test_town_in_state(listings):
+    towns = majority_states(pd.concat([listings] * 5), min_share=0.6)
+    assert towns == {"Akure": "Ondo", "Ikeja": "Lagos", "Lekki": "Lagos"}
+    rule = TownInState("town_in_state", towns)
+    assert flagged(rule, listings) == [11]
+    reasons = rule.reasons(listings.loc[[11]])
+    assert reasons.tolist() == ["Lekki is in Lagos, not Anambara"]
+
+
+def test_min_group_size(listings):
+    assert flagged(MinGroupSize("sample", "state", 2), listings) == [11, 13]
+
+
+def test_report_counts_and_reasons(listings):
+    rules = [
+        Compare("toilets_vs_bathrooms", "toilets", ">=", "bathrooms"),
+        Between("floor", "price", low=1e6),
+        MinGroupSize("sample", "state", 2),
+    ]
+    report = validate(listings, rules)
+    assert report.counts().to_dict() == {
+        "toilets_vs_bathrooms": 1,
+        "floor": 1,
+        "sample": 2,
+    }
+    assert report.valid.tolist() == [True, False, False, False, True]
+    violations = report.violations()
+    assert list(zip(violations.index, violations["rule"])) == [
+        (11, "toilets_vs_bathrooms"),
+        (11, "sample"),
+        (12, "floor"),
+        (13, "sample"),
+    ]
+    assert violations.loc[12, "reason"] == "expected 1000000.0 <= price"
+    assert validate(listings, rules[1:2]).violations()["rule"].tolist() == ["floor"]
+    assert validate(listings, []).violations().empty
+
+
+def test_rule_names_must_be_unique(listings):
+    rule = Between("floor", "price", low=1e6)
+    with pytest.raises(ValueError, match="unique"):
+        validate(listings, [rule, rule])
+
+
+def test_rule_without_violations_cannot_be_built():
+    @dataclass(frozen=True)
+    class Incomplete(Rule):
+        name: str
+        reason: str = "never checked"
+
+    with pytest.raises(TypeError, match="abstract"):
+        Incomplete("incomplete")
+
+
+def test_default_rules_run_on_the_listings():
+    report = validate(read_csv())
+    assert set(report.counts().index) == {
+        "town_in_state",
+        "block_of_flats_bedrooms",
+        "toilets_vs_bathrooms",
+        "price_floor",
+        "state_sample_size",
+    }
+    assert report.counts()["town_in_state"] > 0
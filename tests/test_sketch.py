@@ -0,0 +1,125 @@
+"""Error bound, merging and serialisation of the quantile sketch."""
+
+from __future__ import annotations
+
+import json
+import pickle
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from nigeria_real_estate.loader import read_csv
+from nigeria_real_estate.sketch import (
+    QuantileSketch,
+    bucket_keys,
+    merge_sketches,
+    sketch_groups,
+)
+
+QUANTILES = [0, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 1]
+
+
+@pytest.fixture(scope="module")
+def listings() -> pd.DataFrame:
+    return read_csv()
+
+
+def assert_same_sketch(a: QuantileSketch, b: QuantileSketch) -> None:
+    assert (a.count, a.zeros, a.min, a.max) == (b.count, b.zeros, b.min, b.max)
+    for side in ("positive", "negative"):
+        for left, right in zip(getattr(a, side), getattr(b, side)):
+            np.testing.assert_array_equal(left, right)
+
+
+@pytest.mark.parametrize("relative_error", [0.01, 0.05])
+def test_quantiles_within_relative_error(listings, relative_error):
+    prices = listings["price"]
+    sketch = QuantileSketch.from_values(prices, relative_error)
+    exact = prices.quantile(QUANTILES).to_numpy()
+    np.testing.assert_allclose(sketch.quantiles(QUANTILES), exact, rtol=relative_error)
+
+
+def test_group_quantiles_within_one_percent(listings):
+    sketches = sketch_groups(listings, "state")
+    exact = listings.groupby("state", observed=True)["price"].quantile(QUANTILES)
+    for state, sketch in sketches.items():
+        np.testing.assert_allclose(
+            sketch.quantiles(QUANTILES), exact[state].to_numpy(), rtol=0.01
+        )
+
+
+def test_signed_values_within_relative_error():
+    values = pd.Series(np.random.default_rng(1).normal(0, 1e6, 10_000))
+    values.iloc[:100] = 0
+    sketch = QuantileSketch.from_values(values)
+    for q in (0.01, 0.3, 0.7, 0.99):
+        exact = values.quantile(q)
+        assert abs(sketch.quantile(q) - exact) <= 0.01 * abs(exact)
+
+
+def test_merged_chunks_equal_the_whole(listings):
+    prices = listings["price"].to_numpy()
+    whole = QuantileSketch.from_values(prices)
+    chunks = [QuantileSketch.from_values(c) for c in np.array_split(prices, 7)]
+    merged = QuantileSketch()
+    for chunk in chunks:
+        merged.merge_inplace(chunk)
+    assert_same_sketch(merged, whole)
+    rest = QuantileSketch.from_values(prices[len(chunks[0]):])
+    assert_same_sketch(chunks[0].merge(rest), whole)
+    assert merged.quantiles(QUANTILES) == whole.quantiles(QUANTILES)
+
+
+def test_merge_sketches_by_group(listings):
+    halves = listings.iloc[:12000], listings.iloc[12000:]
+    merged = merge_sketches(*(sketch_groups(half, "state") for half in halves))
+    whole = sketch_groups(listings, "state")
+    assert list(merged.index) == list(whole.index)
+    for state in whole.index:
+        assert_same_sketch(merged[state], whole[state])
+
+
+def test_merge_rejects_other_relative_error():
+    with pytest.raises(ValueError):
+        QuantileSketch(0.01).merge(QuantileSketch(0.02))
+
+
+def test_round_trips(listings):
+    sketch = QuantileSketch.from_values(np.append(listings["price"], [0, -5e6]))
+    assert_same_sketch(
+        QuantileSketch.from_dict(json.loads(json.dumps(sketch.to_dict()))), sketch
+    )
+    assert_same_sketch(pickle.loads(pickle.dumps(sketch)), sketch)
+
+
+def test_from_buckets_matches_from_values(listings):
+    prices = listings["price"].to_numpy(dtype=np.float64)
+    keys, counts = np.unique(bucket_keys(prices), return_counts=True)
+    order = np.random.default_rng(2).permutation(len(keys))
+    rebuilt = QuantileSketch.from_buckets(
+        keys[order], counts[order], low=prices.min(), high=prices.max()
+    )
+    assert_same_sketch(rebuilt, QuantileSketch.from_values(prices))
+    assert np.isnan(QuantileSketch.from_buckets([], []).quantile(0.5))
+
+
+def test_non_finite_values_are_skipped():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        sketch = QuantileSketch.from_values([np.inf, -np.inf, np.nan, 1.0, 2.0])
+    assert (sketch.count, sketch.min, sketch.max) == (2, 1.0, 2.0)
+
+
+def test_extremes_within(listings):
+    prices = listings["price"]
+    sketch = QuantileSketch.from_values(prices)
+    low, high = 1e7, 3e8
+    inside = prices[(prices >= low) & (prices <= high)]
+    estimate = sketch.extremes_within(low, high)
+    np.testing.assert_allclose(estimate, [inside.min(), inside.max()], rtol=0.01)
+    assert sketch.extremes_within(-np.inf, np.inf) == (prices.min(), prices.max())
+    assert np.isnan(sketch.extremes_within(-2, -1)).all()
+    single = QuantileSketch.from_values([100.0, 100.5])
+    assert single.extremes_within(0, 1e3) == (100.0, 100.5)